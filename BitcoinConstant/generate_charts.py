@@ -1,13 +1,28 @@
-import os
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-import yfinance as yf
-from datetime import datetime, timedelta
+from datetime import timedelta
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from macrokit.loader import load_prices
+from macrokit.realized import realized_price
+from macrokit.articles import build
+from macrokit.cache import now
+from macrokit.crossrates import CrossRates
+from macrokit.render import savefig, tight_layout
+
+# Market data read by the charts below (see macrokit.planner)
+DATA_NEEDS = [
+    {'tickers': ["BTC-USD", "GC=F", "SPY"], 'period': '10y'},
+    {'tickers': ["BTC-USD"], 'period': 'max'},
+]
 
 # Create assets directory
-if not os.path.exists('assets'):
-    os.makedirs('assets')
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+os.makedirs(ASSETS_DIR, exist_ok=True)
 
 # Set professional style (Light Theme)
 def set_style():
@@ -26,33 +41,28 @@ def set_style():
         "legend.fontsize": 10,
     })
 
-def generate_assets_in_btc():
-    print("Generating Assets priced in BTC chart...")
-    end_date = datetime.now()
+# 10 years of Bitcoin, Gold and S&P 500, shared by the market charts
+def load_data():
+    end_date = now()
     start_date = end_date - timedelta(days=10*365)
     
     tickers = ["BTC-USD", "GC=F", "SPY"] # Bitcoin, Gold, S&P 500
-    data_raw = yf.download(tickers, start=start_date, end=end_date)
-    
-    # Handle MultiIndex for Adj Close
-    try:
-        if isinstance(data_raw.columns, pd.MultiIndex):
-            if 'Adj Close' in data_raw.columns.levels[0]:
-                data = data_raw['Adj Close']
-            elif 'Adj Close' in data_raw.columns.levels[1]:
-                data = data_raw.xs('Adj Close', axis=1, level=1)
-            else:
-                data = data_raw['Close'] if 'Close' in data_raw.columns.levels[0] else data_raw.xs('Close', axis=1, level=1)
-        else:
-            data = data_raw['Adj Close'] if 'Adj Close' in data_raw.columns else data_raw['Close']
-    except Exception as e:
-        print(f"Error extracting data: {e}")
-        data = data_raw
+    data = load_prices(tickers, start=start_date, end=end_date)
+
+    # True realized price when a local UTXO dump is available (see macrokit.realized);
+    # coins are valued at their creation day's close, so it needs the whole price history
+    history = load_prices("BTC-USD", period='max')
+    realized = realized_price(prices=history['BTC-USD']) if 'BTC-USD' in history else None
+    if realized is not None:
+        data['Realized Price'] = realized.reindex(data.index.normalize()).to_numpy()
+    return data
+
+def generate_assets_in_btc(data):
+    print("Generating Assets priced in BTC chart...")
 
     # Calculate assets in BTC terms
-    data_btc_terms = pd.DataFrame(index=data.index)
-    data_btc_terms['Gold / BTC'] = data['GC=F'] / data['BTC-USD']
-    data_btc_terms['S&P 500 / BTC'] = data['SPY'] / data['BTC-USD']
+    data_btc_terms = CrossRates(data).priced_in('BTC-USD', ['GC=F', 'SPY'])
+    data_btc_terms.columns = ['Gold / BTC', 'S&P 500 / BTC']
     
     # Drop NaNs to ensure we have a clean start for normalization
     data_btc_terms = data_btc_terms.dropna()
@@ -81,8 +91,8 @@ def generate_assets_in_btc():
                      xytext=(normalized.index[-800], normalized['S&P 500 / BTC'].iloc[-300]/10),
                      arrowprops=dict(facecolor='black', shrink=0.05, width=1, headwidth=5))
     
-    plt.tight_layout()
-    plt.savefig('assets/assets_in_btc.png', dpi=300)
+    tight_layout()
+    savefig(os.path.join(ASSETS_DIR, 'assets_in_btc.png'), dpi=300)
     plt.close()
 
 def generate_supply_constant():
@@ -109,8 +119,8 @@ def generate_supply_constant():
     # Add highlighting for "The Constant"
     plt.fill_between(years, 100, btc_norm, color="#f57c00", alpha=0.1)
     
-    plt.tight_layout()
-    plt.savefig('assets/supply_constant.png', dpi=300)
+    tight_layout()
+    savefig(os.path.join(ASSETS_DIR, 'supply_constant.png'), dpi=300)
     plt.close()
 
 def generate_relatable_purchasing_power():
@@ -151,8 +161,8 @@ def generate_relatable_purchasing_power():
     for i, txt in enumerate(sats_per_coffee):
         ax2.annotate(f"{int(txt):,}", (years[i], sats_per_coffee[i]), xytext=(0, 10), textcoords='offset points', ha='center', fontweight='bold')
 
-    fig.tight_layout()
-    plt.savefig('assets/purchasing_power_concrete.png', dpi=300)
+    tight_layout(fig)
+    savefig(os.path.join(ASSETS_DIR, 'purchasing_power_concrete.png'), dpi=300)
     plt.close()
 
 def generate_car_test():
@@ -173,33 +183,27 @@ def generate_car_test():
         yval = bar.get_height()
         plt.text(bar.get_x() + bar.get_width()/2, yval + 0.5, f'{yval} BTC', ha='center', va='bottom', fontsize=11, fontweight='bold')
 
-    plt.tight_layout()
-    plt.savefig('assets/car_test.png', dpi=300)
+    tight_layout()
+    savefig(os.path.join(ASSETS_DIR, 'car_test.png'), dpi=300)
     plt.close()
 
-def generate_market_vs_realized():
+def generate_market_vs_realized(data):
     print("Generating Market vs Realized Price chart...")
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=10*365)
-    
     # Using yfinance for market price
-    btc_data = yf.download("BTC-USD", start=start_date, end=end_date)
-    if isinstance(btc_data.columns, pd.MultiIndex):
-        market_price = btc_data['Adj Close' if 'Adj Close' in btc_data.columns.levels[0] else 'Close']
-    else:
-        market_price = btc_data['Adj Close' if 'Adj Close' in btc_data.columns else 'Close']
-
-    # Mocking Realized Price trend (based on 2026 data points)
-    # Realized Price stays more stable and trends up as acquisition cost rises
+    market_price = data['BTC-USD'].dropna()
     dates = market_price.index
-    # Realized price starts lower (~$5k in 2018/2019) and reaches ~$55k by Feb 2026
-    realized_price = pd.Series(index=dates, data=0.0)
-    start_rp = 15000
-    end_rp = 55207
-    realized_price = pd.Series(
-        [start_rp + (end_rp - start_rp) * (i / len(dates)) for i in range(len(dates))],
-        index=dates
-    )
+
+    if 'Realized Price' in data and data['Realized Price'].notna().any():
+        realized_price = data['Realized Price'].reindex(dates).ffill().bfill()
+        floor = realized_price.iloc[-1]
+        floor_label = f"{dates[-1]:%b %Y}: ~${floor / 1000:,.0f}k Floor"
+    else:
+        # No UTXO dump: illustrative trend (based on 2026 data points)
+        # Realized price starts lower (~$5k in 2018/2019) and reaches ~$55k by Feb 2026
+        start_rp = 15000
+        end_rp = 55207
+        realized_price = pd.Series(start_rp + (end_rp - start_rp) * np.arange(len(dates)) / len(dates), index=dates)
+        floor, floor_label = end_rp, 'Feb 2026: ~$55k Floor'
     
     plt.figure(figsize=(12, 7))
     plt.plot(market_price.index, market_price, label="BTC Market Price", color="#212121", linewidth=2)
@@ -214,13 +218,13 @@ def generate_market_vs_realized():
     plt.yscale('log')
     plt.legend()
     
-    plt.annotate('Feb 2026: ~$55k Floor', 
-                 xy=(market_price.index[-1], 55207), 
+    plt.annotate(floor_label, 
+                 xy=(market_price.index[-1], floor), 
                  xytext=(market_price.index[-900], 100000),
                  arrowprops=dict(facecolor='red', shrink=0.05, width=1, headwidth=5))
     
-    plt.tight_layout()
-    plt.savefig('assets/market_vs_realized.png', dpi=300)
+    tight_layout()
+    savefig(os.path.join(ASSETS_DIR, 'market_vs_realized.png'), dpi=300)
     plt.close()
 
 def generate_ownership_handover():
@@ -243,16 +247,19 @@ def generate_ownership_handover():
     ax.set_xticklabels(labels)
     ax.legend()
     
-    plt.tight_layout()
-    plt.savefig('assets/ownership_handover.png', dpi=300)
+    tight_layout()
+    savefig(os.path.join(ASSETS_DIR, 'ownership_handover.png'), dpi=300)
     plt.close()
 
+CHARTS = {
+    'assets_in_btc': generate_assets_in_btc,
+    'supply_constant': generate_supply_constant,
+    'purchasing_power_concrete': generate_relatable_purchasing_power,
+    'car_test': generate_car_test,
+    'market_vs_realized': generate_market_vs_realized,
+    'ownership_handover': generate_ownership_handover,
+}
+
 if __name__ == "__main__":
-    set_style()
-    generate_assets_in_btc()
-    generate_supply_constant()
-    generate_relatable_purchasing_power()
-    generate_car_test()
-    generate_market_vs_realized()
-    generate_ownership_handover()
+    build(sys.modules[__name__])
     print("Done! Charts generated in assets/ directory.")
@@ -7,20 +7,37 @@ document.addEventListener('DOMContentLoaded', () => {
     const options = { year: 'numeric', month: 'long', day: 'numeric' };
     currentDate.textContent = new Date().toLocaleDateString(undefined, options);
 
+    // article.html was rendered at build time (macrokit/prerender.py)
+    if (content.hasAttribute('data-prerendered')) {
+        // Diagrams the build could not turn into SVG
+        if (window.mermaid && content.querySelector('pre.mermaid')) {
+            mermaid.initialize({ startOnLoad: false, theme: 'neutral', securityLevel: 'loose' });
+            mermaid.run();
+        }
+        window.addEventListener('scroll', updateProgress);
+        return;
+    }
+
     // Fetch and render the markdown
-    fetch('ARTICLE.md')
+    const article = fetch('ARTICLE.md')
         .then(response => {
             if (!response.ok) throw new Error('Article not found');
             return response.text();
-        })
-        .then(text => {
+        });
+
+    Promise.all([article, loadImageManifest()])
+        .then(([text, manifest]) => {
             // Clean up paths for images if necessary
             // Since our ARTICLE.md uses file:/// paths or assets/
             // We should ensure they work in a web environment.
             // If the user serves the root, assets/ will work.
             const cleanedText = text.replace(/file:\/\/\/.*?\/assets\//g, 'assets/');
 
-            content.innerHTML = marked.parse(cleanedText);
+            // Rewrite images while the markup is still inert, so the full-size PNGs are never requested
+            const template = document.createElement('template');
+            template.innerHTML = marked.parse(cleanedText);
+            responsiveImages(template.content, manifest);
+            content.replaceChildren(template.content);
 
             // Initialize Mermaid
             mermaid.initialize({ startOnLoad: true, theme: 'neutral', securityLevel: 'loose' });
@@ -37,6 +54,42 @@ document.addEventListener('DOMContentLoaded', () => {
             </div>`;
         });
 
+    // Chart widths and AVIF/WebP variants written by the build (macrokit/images.py)
+    function loadImageManifest() {
+        return fetch('assets/responsive/manifest.json')
+            .then(response => (response.ok ? response.json() : {}))
+            .catch(() => ({}));
+    }
+
+    function responsiveImages(fragment, manifest) {
+        fragment.querySelectorAll('img').forEach((img, index) => {
+            // Only the first image can be above the fold
+            img.loading = index === 0 ? 'eager' : 'lazy';
+            img.decoding = 'async';
+
+            const match = (img.getAttribute('src') || '').match(/^assets\/([^\/?#]+\.png)$/);
+            const entry = match && manifest[match[1]];
+            if (!entry) return;
+
+            // Explicit dimensions reserve the space before the image arrives
+            img.width = entry.width;
+            img.height = entry.height;
+
+            // Preferred format first; the browser takes the first <source> it supports
+            const sources = ['avif', 'webp'].filter(format => entry[format] && entry[format].length).map(format => {
+                const source = document.createElement('source');
+                source.type = `image/${format}`;
+                source.srcset = entry[format].map(([path, width]) => `assets/${path} ${width}w`).join(', ');
+                source.sizes = '(max-width: 900px) 100vw, 900px';
+                return source;
+            });
+
+            const picture = document.createElement('picture');
+            img.replaceWith(picture);
+            picture.append(...sources, img);
+        });
+    }
+
     function updateProgress() {
         const winScroll = document.body.scrollTop || document.documentElement.scrollTop;
         const height = document.documentElement.scrollHeight - document.documentElement.clientHeight;
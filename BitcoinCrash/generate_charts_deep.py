@@ -1,54 +1,76 @@
-import yfinance as yf
 import pandas as pd
 import matplotlib.pyplot as plt
-import os
 import numpy as np
 from datetime import datetime
 
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from macrokit.articles import build
+from macrokit.covariance import rolling_volatility
+from macrokit.futures import annualized_basis, continuous
+from macrokit.loader import load_prices
+from macrokit.render import savefig, tight_layout
+
 # Setup
-ASSETS_DIR = "assets"
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
 os.makedirs(ASSETS_DIR, exist_ok=True)
 
 # Tickers
 # BTC-USD: Spot
-# BTCG26.CME: Feb 2026 Futures
 # BTC=F: Continuous Futures
 # IBIT: ETF
 # VIX: Volatility Index
 # IGV: Software Stocks
-tickers = ["BTC-USD", "BTCG26.CME", "BTC=F", "IBIT", "^VIX", "IGV"]
+tickers = ["BTC-USD", "BTC=F", "IBIT", "^VIX", "IGV"]
 start_date = "2025-12-01"
 end_date = "2026-02-14" # Extended to capture Feb 13
 
-def fetch_data():
-    print(f"Fetching deep data for {tickers}...")
-    data = {}
-    for t in tickers:
-        df = yf.download(t, start=start_date, end=end_date)
-        if not df.empty:
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)
-            data[t] = df['Close']
-            if 'Volume' in df.columns:
-                data[f"{t}_Vol"] = df['Volume']
-    return pd.DataFrame(data)
+# CME dated contracts around the crash; expiries come from macrokit.futures
+curve = ["BTCF26.CME", "BTCG26.CME", "BTCH26.CME", "BTCJ26.CME"]
+front_contract = "BTCG26.CME"  # Feb 2026
+# Stands in for the front contract once it has no data (e.g. delisted upstream)
+front_continuous = "BTC CME continuous"
 
-def generate_deep_charts(df):
+# Market data read by the charts below (see macrokit.planner)
+DATA_NEEDS = [
+    {'tickers': tickers, 'start': start_date, 'end': end_date},
+    {'tickers': curve, 'start': start_date, 'end': end_date},
+]
+
+def set_style():
     plt.style.use('seaborn-v0_8-whitegrid')
-    
-    # 1. Annualized CME Basis (The "Unwind" Trigger)
-    # Annualized Basis (%) = ((Futures / Spot) - 1) * (365 / days_to_expiry)
-    # Assuming Feb 2026 contract expires Feb 27, 2026
-    expiry = datetime(2026, 2, 27)
-    df = df.dropna(subset=['BTC-USD', 'BTCG26.CME'])
-    
-    basis_df = df.copy()
-    basis_df['days_to_expiry'] = [(expiry - d).days for d in basis_df.index]
-    basis_df['days_to_expiry'] = basis_df['days_to_expiry'].replace(0, 1) # Avoid div by zero
-    basis_df['basis_annualized'] = ((basis_df['BTCG26.CME'] / basis_df['BTC-USD']) - 1) * (365 / basis_df['days_to_expiry']) * 100
+
+def load_data():
+    print(f"Fetching deep data for {tickers + curve}...")
+    close = load_prices(tickers + curve, start=start_date, end=end_date, field='Close')
+    volume = load_prices(tickers + curve, start=start_date, end=end_date, field='Volume')
+    df = pd.concat([close, volume.add_suffix('_Vol')], axis=1)
+    # All deep charts share the days where both spot and the Feb contract traded
+    front = front_contract
+    if front_contract not in df:
+        contracts = [c for c in curve if c in close]
+        if not contracts:
+            print(f"No CME contract data for {curve}; keeping every spot day")
+            return df.dropna(subset=['BTC-USD'])
+        print(f"No data for {front_contract}; aligning on the back-adjusted {', '.join(contracts)} chain")
+        df[front_continuous] = continuous(close[contracts])['price']
+        front = front_continuous
+    return df.dropna(subset=['BTC-USD', front])
+
+# 1. Annualized CME Basis (The "Unwind" Trigger) across the curve
+def generate_cme_basis(df):
+    # Annualized Basis (%) = ((Futures / Spot) - 1) * (365 / days_to_expiry), every contract at once
+    contracts = [c for c in curve if c in df]
+    # Contracts in their last week are dropped; annualizing tiny premiums there swamps the curve
+    basis_df = annualized_basis(df['BTC-USD'], df[contracts], min_days=7)
 
     plt.figure(figsize=(12, 6))
-    plt.plot(basis_df.index, basis_df['basis_annualized'], color='#2ECC71', linewidth=2, label='CME Annualized Basis (%)')
+    for contract in contracts:
+        if contract == front_contract:
+            plt.plot(basis_df.index, basis_df[contract], color='#2ECC71', linewidth=2, label='CME Annualized Basis (%)')
+        else:
+            plt.plot(basis_df.index, basis_df[contract], linewidth=1, alpha=0.6, label=contract.split('.')[0])
     plt.axhline(0, color='black', linestyle='--', alpha=0.3)
     plt.axvspan(datetime(2026, 2, 4), datetime(2026, 2, 6), color='red', alpha=0.1, label='Feb 5 Unwind')
     plt.axvspan(datetime(2026, 2, 12), datetime(2026, 2, 13), color='orange', alpha=0.1, label='Feb 13 Macro Panic')
@@ -56,12 +78,12 @@ def generate_deep_charts(df):
     plt.title('CME Bitcoin Basis: The Two Faces of Contraction', fontsize=14, fontweight='bold')
     plt.ylabel('Annualized Yield (%)')
     plt.legend()
-    plt.tight_layout()
-    plt.savefig(f"{ASSETS_DIR}/cme_basis_deep.png", dpi=300)
+    tight_layout()
+    savefig(f"{ASSETS_DIR}/cme_basis_deep.png", dpi=300)
     plt.close()
 
-    # 2. ETF Volume Spike vs Price (The "Mechanical Inflow" Paradox)
-    plt.figure(figsize=(12, 6))
+# 2. ETF Volume Spike vs Price (The "Mechanical Inflow" Paradox)
+def generate_etf_volume_paradox(df):
     etf_df = df[['IBIT', 'IBIT_Vol']].dropna()
     
     fig, ax1 = plt.subplots(figsize=(12, 6))
@@ -73,13 +95,14 @@ def generate_deep_charts(df):
     ax2.set_ylabel('Trading Volume', color='#34495E', fontweight='bold')
     
     plt.title('IBIT ETF: Price Collapse vs Record Volume Spike', fontsize=14, fontweight='bold')
-    plt.tight_layout()
-    plt.savefig(f"{ASSETS_DIR}/etf_volume_paradox.png", dpi=300)
+    tight_layout()
+    savefig(f"{ASSETS_DIR}/etf_volume_paradox.png", dpi=300)
     plt.close()
 
-    # 3. Cross-Asset Volatility Correlation
-    # Calculate rolling 10-day volatility
-    vol_df = df[['BTC-USD', 'IGV', '^VIX']].pct_change().rolling(10).std() * np.sqrt(252) * 100
+# 3. Cross-Asset Volatility Correlation
+def generate_volatility_contagion(df):
+    # Rolling 10-day volatility, streamed bar by bar (see macrokit.covariance)
+    vol_df = rolling_volatility(df[['BTC-USD', 'IGV', '^VIX']].pct_change(), 10) * 100
     vol_df = vol_df.dropna()
 
     plt.figure(figsize=(12, 6))
@@ -90,14 +113,15 @@ def generate_deep_charts(df):
     plt.title('Cross-Asset Volatility: The Contagion Map', fontsize=14, fontweight='bold')
     plt.ylabel('Annualized Volatility (%)')
     plt.legend()
-    plt.savefig(f"{ASSETS_DIR}/volatility_contagion.png", dpi=300)
+    savefig(f"{ASSETS_DIR}/volatility_contagion.png", dpi=300)
     plt.close()
 
-    print("Deeper charts generated successfully.")
+CHARTS = {
+    'cme_basis_deep': generate_cme_basis,
+    'etf_volume_paradox': generate_etf_volume_paradox,
+    'volatility_contagion': generate_volatility_contagion,
+}
 
 if __name__ == "__main__":
-    df = fetch_data()
-    if not df.empty:
-        generate_deep_charts(df)
-    else:
-        print("Error fetching deep data.")
+    build(sys.modules[__name__])
+    print("Deeper charts generated successfully.")
@@ -1,11 +1,17 @@
-import yfinance as yf
 import pandas as pd
 import matplotlib.pyplot as plt
-import os
 from datetime import datetime
 
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from macrokit.articles import build
+from macrokit.indexing import IndexedPanel
+from macrokit.loader import load_prices
+from macrokit.render import savefig, tight_layout
+
 # Setup
-ASSETS_DIR = "assets"
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
 os.makedirs(ASSETS_DIR, exist_ok=True)
 
 # Tickers: SPX, DEU40, US100, Gold, Silver, Bitcoin
@@ -21,27 +27,23 @@ tickers = {
 start_date = "2026-01-29" # Extended to capture baseline for Feb 1
 end_date = "2026-02-14"
 
-def fetch_data():
+# Market data read by the charts below (see macrokit.planner)
+DATA_NEEDS = [
+    {'tickers': tickers, 'start': start_date, 'end': end_date},
+]
+
+def set_style():
+    plt.style.use('seaborn-v0_8-whitegrid')
+
+def load_data():
     print("Fetching synchronized 'Everything Crash' data...")
-    data = {}
-    for symbol, name in tickers.items():
-        df = yf.download(symbol, start=start_date, end=end_date)
-        if not df.empty:
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)
-            data[name] = df['Close']
-    return pd.DataFrame(data)
+    data = load_prices(list(tickers), start=start_date, end=end_date, field='Close')
+    return data.rename(columns=tickers)
 
 def generate_everything_chart(df):
-    plt.style.use('seaborn-v0_8-whitegrid')
-    
     # Baseline: The value on or immediately before Feb 1
-    # We bfill to get the last known price for traditionally closed markets on Sunday Feb 1
-    feb_data = df.loc['2026-02-01':]
-    pre_feb_data = df.loc[:'2026-02-01'].ffill().iloc[-1]
-    
-    norm_df = (feb_data / pre_feb_data) * 100
-    plot_df = norm_df.ffill()
+    # Markets closed on Sunday Feb 1 are based on their last known price, and gaps are carried forward
+    plot_df = IndexedPanel(df).rebase(at='2026-02-01', start='2026-02-01', missing='ffill')
     
     import matplotlib.dates as mdates
     
@@ -72,15 +74,15 @@ def generate_everything_chart(df):
     plt.xlabel('Date')
     plt.legend(loc='lower left')
     plt.grid(True, linestyle='--', alpha=0.7)
-    plt.tight_layout()
-    plt.savefig(f"{ASSETS_DIR}/everything_crash_synchronous.png", dpi=300)
+    tight_layout()
+    savefig(f"{ASSETS_DIR}/everything_crash_synchronous.png", dpi=300)
     plt.close()
     
     print("Everything Crash chart generated successfully.")
 
+CHARTS = {
+    'everything_crash_synchronous': generate_everything_chart,
+}
+
 if __name__ == "__main__":
-    df = fetch_data()
-    if not df.empty:
-        generate_everything_chart(df)
-    else:
-        print("Error: No data fetched for Everything Crash.")
+    build(sys.modules[__name__])
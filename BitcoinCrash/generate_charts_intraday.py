@@ -0,0 +1,86 @@
+import pandas as pd
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from macrokit.articles import SkipArticle, build
+from macrokit.indexing import IndexedPanel
+from macrokit.intraday import INTRADAY_DIR, load_window
+from macrokit.render import savefig, tight_layout
+
+# Setup
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+os.makedirs(ASSETS_DIR, exist_ok=True)
+
+# The same six markets and colors as the daily "Everything Crash" chart
+tickers = {
+    "^GSPC": "SPX (S&P 500)",
+    "^GDAXI": "DEU40 (DAX)",
+    "^IXIC": "US100 (Nasdaq)",
+    "GC=F": "Gold",
+    "SI=F": "Silver",
+    "BTC-USD": "Bitcoin"
+}
+colors = dict(zip(tickers.values(), ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#F7931A']))
+
+# Crash week at 1-minute resolution, read from local intraday files (see macrokit.intraday)
+window_start = "2026-02-09"
+window_end = "2026-02-14"
+interval = "1min"
+
+def set_style():
+    plt.style.use('seaborn-v0_8-whitegrid')
+
+def load_data():
+    print(f"Loading {interval} bars for the crash week...")
+    # Read (not just listed) so a snapshot build serves the frozen bars
+    data = load_window(list(tickers), window_start, window_end, interval)
+    if data.empty:
+        raise SkipArticle(f"everything_crash_intraday needs {interval} bars or ticks for {window_start}..{window_end} "
+                          f"under {INTRADAY_DIR} (add them with `python -m macrokit.intraday <ticker> <file>`)")
+    return data.rename(columns=tickers)
+
+def generate_intraday_crash(df):
+    # Indexed to each market's first trade of the week; closed hours stay gaps
+    plot_df = IndexedPanel(df).rebase(at=window_start)
+
+    # The hour in which the markets fell hardest together, once all have traded (closed ones held at their last price)
+    grid = plot_df.resample(interval).last().ffill().dropna()
+    hourly = (grid / grid.shift(60) - 1).mean(axis=1)
+    worst = hourly.idxmin()
+
+    fig, ax = plt.subplots(figsize=(14, 8))
+    for column in plot_df.columns:
+        ax.plot(plot_df.index, plot_df[column], label=column, linewidth=1.2, color=colors[column], alpha=0.85)
+
+    ax.axvspan(worst - pd.Timedelta(minutes=60), worst, color='red', alpha=0.15,
+               label=f"Sharpest synchronous hour ({hourly.min() * 100:+.1f}% avg)")
+    ax.annotate(f"{worst - pd.Timedelta(minutes=60):%b %d %H:%M}-{worst:%H:%M} UTC",
+                xy=(worst, grid.loc[worst].min()), xytext=(40, -40), textcoords='offset points',
+                arrowprops=dict(facecolor='black', shrink=0.05, width=1, headwidth=8),
+                fontsize=11, fontweight='bold', bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="black", alpha=0.8))
+
+    ax.xaxis.set_major_locator(mdates.DayLocator())
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %d'))
+    ax.xaxis.set_minor_locator(mdates.HourLocator(byhour=[6, 12, 18]))
+
+    ax.set_title(f'The February "Everything Crash", Minute by Minute ({interval} bars, UTC)', fontsize=16, fontweight='bold')
+    ax.set_ylabel('Indexed Price (First Trade of the Week = 100)')
+    ax.set_xlabel('Date')
+    ax.legend(loc='lower left')
+    ax.grid(True, which='major', linestyle='--', alpha=0.7)
+    tight_layout()
+    savefig(f"{ASSETS_DIR}/everything_crash_intraday.png", dpi=300)
+    plt.close()
+
+    print("Intraday Everything Crash chart generated successfully.")
+
+# Needs the crash week's intraday data; load_data says how to ingest it when it is missing
+CHARTS = {
+    'everything_crash_intraday': generate_intraday_crash,
+}
+
+if __name__ == "__main__":
+    build(sys.modules[__name__])
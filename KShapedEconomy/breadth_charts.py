@@ -0,0 +1,72 @@
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from macrokit.articles import SkipArticle, build
+from macrokit.breadth import read_universe, universe_breadth
+from macrokit.render import savefig, tight_layout
+
+# Constituent list (one ticker per line, e.g. the S&P 500 or Russell 3000); the chart needs it
+UNIVERSE_PATH = os.environ.get('MACRO_UNIVERSE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'universe.txt'))
+
+# Start of the AI Boom, as in generate_charts.py
+start_date = '2023-01-01'
+
+output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+os.makedirs(output_dir, exist_ok=True)
+
+def set_style():
+    plt.style.use('seaborn-v0_8-darkgrid')
+
+# Breadth of the whole universe, loaded in chunks (see macrokit.breadth)
+def load_data():
+    if not os.path.exists(UNIVERSE_PATH):
+        raise SkipArticle(f"k_shape_breadth needs a universe file at {UNIVERSE_PATH} "
+                          f"(one ticker per line; MACRO_UNIVERSE points to another list)")
+    tickers = read_universe(UNIVERSE_PATH)
+    print(f"Measuring breadth of {len(tickers)} tickers from {start_date}...")
+    return universe_breadth(tickers, start=start_date)
+
+def generate_k_shape_breadth(breadth):
+    fig, (ax, ax2) = plt.subplots(2, 1, figsize=(14, 10), sharex=True, gridspec_kw={'height_ratios': [3, 1]})
+
+    # The spread of outcomes: every stock indexed to 100 at the start
+    ax.fill_between(breadth.index, breadth['p10'], breadth['p90'], color='#1f77b4', alpha=0.12, label='10th-90th percentile')
+    ax.fill_between(breadth.index, breadth['p25'], breadth['p75'], color='#1f77b4', alpha=0.25, label='25th-75th percentile')
+    ax.plot(breadth.index, breadth['p50'], color='#1f77b4', linewidth=2, label=f"Median stock ({breadth['p50'].iloc[-1]-100:+.1f}%)")
+    ax.plot(breadth.index, breadth['top_decile'], color='#2ca02c', linewidth=2,
+            label=f"Top decile, average ({breadth['top_decile'].iloc[-1]-100:+.1f}%)")
+    ax.plot(breadth.index, breadth['bottom_decile'], color='#d62728', linewidth=2,
+            label=f"Bottom decile, average ({breadth['bottom_decile'].iloc[-1]-100:+.1f}%)")
+    ax.axhline(100, color='black', linewidth=1, alpha=0.5)
+
+    names = int(breadth['names'].iloc[-1])
+    ax.set_title(f"The K-Shape, Measured: {names:,} Stocks Since the Start of the AI Boom", fontsize=16, fontweight='bold', pad=20)
+    ax.set_ylabel('Performance (Indexed to 100)', fontsize=12)
+    ax.legend(fontsize=11, loc='upper left', frameon=True, framealpha=0.9)
+
+    # Participation vs concentration
+    ax2.plot(breadth.index, breadth['above_ma'], color='#ff7f0e', linewidth=1.5, label='% of stocks above their 200-day average')
+    ax2.plot(breadth.index, breadth['top_decile_share'], color='#7f7f7f', linewidth=1.5, linestyle='--',
+             label='% of equal-weight value held by the top decile')
+    ax2.set_ylabel('%', fontsize=12)
+    ax2.set_ylim(0, 100)
+    ax2.legend(fontsize=10, loc='upper left', frameon=True, framealpha=0.9)
+
+    ax2.xaxis.set_major_formatter(mdates.DateFormatter('%b %Y'))
+    ax2.xaxis.set_major_locator(mdates.MonthLocator(interval=3))
+    plt.setp(ax2.get_xticklabels(), rotation=45)
+
+    tight_layout()
+    save_path = savefig(os.path.join(output_dir, 'k_shape_breadth.png'), dpi=300)
+    plt.close()
+    print(f"Chart saved to {save_path}")
+
+CHARTS = {
+    'k_shape_breadth': generate_k_shape_breadth,
+}
+
+if __name__ == "__main__":
+    build(sys.modules[__name__])
@@ -1,14 +1,30 @@
 import pandas as pd
-import yfinance as yf
 import matplotlib.pyplot as plt
 import numpy as np
+
 import os
-from datetime import datetime
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from macrokit.articles import build
+from macrokit.cache import now
+from macrokit.indexing import IndexedPanel
+from macrokit.loader import load_prices
+from macrokit.montecarlo import bands, probability, simulate
+from macrokit.render import savefig, tight_layout
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+os.makedirs(ASSETS_DIR, exist_ok=True)
 
 # Set visual style
-plt.style.use('seaborn-v0_8-whitegrid')
-plt.rcParams['font.family'] = 'sans-serif'
-plt.rcParams['font.sans-serif'] = ['Inter', 'Roboto', 'Arial']
+def set_style():
+    plt.style.use('seaborn-v0_8-whitegrid')
+    plt.rcParams['font.family'] = 'sans-serif'
+    plt.rcParams['font.sans-serif'] = ['Inter', 'Roboto', 'Arial']
+
+# Market data read by the charts below (see macrokit.planner)
+DATA_NEEDS = [
+    {'tickers': ['BTC-USD', 'SPY', 'GC=F', 'DX-Y.NYB'], 'start': '2016-01-01'},
+]
 
 def fetch_real_data():
     # Define tickers
@@ -20,66 +36,28 @@ def fetch_real_data():
     }
     
     start_date = '2016-01-01'
-    end_date = datetime.now().strftime('%Y-%m-%d')
-    
-    data = pd.DataFrame()
-    for name, ticker in tickers.items():
-        print(f"Fetching {name} ({ticker})...")
-        df = yf.download(ticker, start=start_date, end=end_date)
-        
-        if isinstance(df.columns, pd.MultiIndex):
-            try:
-                data[name] = df.xs('Close', axis=1, level=1).iloc[:,0]
-            except (KeyError, IndexError):
-                data[name] = df.iloc[:,0]
-        else:
-            if 'Adj Close' in df.columns:
-                data[name] = df['Adj Close']
-            elif 'Close' in df.columns:
-                data[name] = df['Close']
-            else:
-                data[name] = df.iloc[:,0]
-    
-    data = data.ffill().dropna()
+    end_date = now().strftime('%Y-%m-%d')
     
-    # 2026 Projection Logic
-    last_real_date = data.index[-1]
-    target_date = pd.Timestamp('2026-02-11')
+    print(f"Fetching {', '.join(tickers)}...")
+    prices = load_prices(list(tickers.values()), start=start_date, end=end_date)
+    data = prices.rename(columns={ticker: name for name, ticker in tickers.items()})
     
-    if last_real_date < target_date:
-        future_dates = pd.date_range(start=last_real_date + pd.Timedelta(days=1), end=target_date, freq='D')
-        future_data = pd.DataFrame(index=future_dates, columns=data.columns)
-        total_days = (target_date - last_real_date).days
-        days_to_peak = max(1, total_days // 2)
-        
-        for asset in data.columns:
-            last_val = float(data[asset].iloc[-1])
-            if asset == 'Bitcoin':
-                peak_val = last_val * 2.2
-                winter_val = peak_val * 0.72  # Showing a real drop
-                path = np.zeros(total_days)
-                path[:days_to_peak] = np.linspace(last_val, peak_val, days_to_peak)
-                path[days_to_peak:] = np.linspace(peak_val, winter_val, total_days - days_to_peak)
-                future_data[asset] = path
-            elif asset in ['Gold', 'USD Index']:
-                future_data[asset] = np.linspace(last_val, last_val * 1.35, total_days)
-            else: # S&P 500
-                future_data[asset] = np.linspace(last_val, last_val * 1.15, total_days)
-        
-        combined_data = pd.concat([data, future_data])
-    else:
-        combined_data = data
-    
-    combined_data.columns = [str(c[0]) if isinstance(c, tuple) else str(c) for c in combined_data.columns]
-    combined_data = combined_data.astype(float)
-    return combined_data
+    return data.ffill().dropna()
+
+# Projection: correlated Monte Carlo paths for a year past the last real close
+PROJECTION_DAYS = 365
+
+def project(data):
+    sim = simulate(data, PROJECTION_DAYS)
+    return sim, bands(sim)
 
 def plot_strength_index(df, output_path, title, is_zoomed=False):
-    if is_zoomed:
-        df = df[df.index >= '2024-01-01']
+    sim, fan = project(df)
     
-    # Normalize all to 100 at the start of the visible period
-    norm_df = df / df.iloc[0] * 100
+    # Normalize all to 100 at the start of the visible period (history + median projection)
+    panel = IndexedPanel(pd.concat([df, fan[50]]))
+    norm_df = panel.rebase(start='2024-01-01' if is_zoomed else None)
+    base = panel.level(norm_df.index[0])
     
     plt.figure(figsize=(15, 10))
     
@@ -96,6 +74,9 @@ def plot_strength_index(df, output_path, title, is_zoomed=False):
         lw = 3 if asset == 'Bitcoin' else 2
         alpha = 1.0 if asset == 'Bitcoin' else 0.8
         plt.plot(norm_df.index, norm_df[asset], label=asset, color=colors.get(asset, 'black'), linewidth=lw, alpha=alpha)
+        # 5-95% projection fan around the median path
+        plt.fill_between(fan.index, fan[5][asset] / base[asset] * 100, fan[95][asset] / base[asset] * 100,
+                         color=colors.get(asset, 'black'), alpha=0.08, linewidth=0)
 
     # --- CROSS FILL LOGIC ---
     # We want to highlight when Bitcoin crosses the Safe Haven Basket (Avg of Gold & USD)
@@ -120,38 +101,52 @@ def plot_strength_index(df, output_path, title, is_zoomed=False):
         plt.yscale('log')
         plt.ylabel('Strength Index (Log Scale, Start=100)', fontsize=14, fontweight='bold')
     
-    plt.legend(loc='upper left', frameon=True, fontsize=12, facecolor='white', framealpha=0.9)
+    ax = plt.gca()
+    handles, labels = ax.get_legend_handles_labels()
     plt.grid(True, linestyle='--', alpha=0.3)
     
     # Mark real data boundary
-    current_time = datetime.now()
-    if current_time < norm_df.index[-1] and current_time > norm_df.index[0]:
-        plt.axvline(current_time, color='black', linestyle='--', linewidth=2, alpha=0.6)
-        plt.text(current_time, plt.ylim()[0]*1.1, ' ← REAL DATA | PROJECTION →', 
-                 rotation=90, verticalalignment='bottom', fontweight='bold', fontsize=11, alpha=0.7)
-
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300)
+    last_real = df.index[-1]
+    plt.axvline(last_real, color='black', linestyle='--', linewidth=2, alpha=0.6)
+    plt.text(last_real, plt.ylim()[0]*1.1, ' ← REAL DATA | PROJECTION →', 
+             rotation=90, verticalalignment='bottom', fontweight='bold', fontsize=11, alpha=0.7)
+
+    # Share of simulated paths in which Bitcoin is above the Safe Haven Basket
+    crossing = probability(sim, lambda p: p['Bitcoin'] / base['Bitcoin'] >=
+                           (p['Gold'] / base['Gold'] + p['USD Index'] / base['USD Index']) / 2)
+    prob_ax = ax.twinx()
+    prob_ax.fill_between(crossing.index, 0, crossing * 100, color='#F7931A', alpha=0.15, linewidth=0,
+                         label='P(Bitcoin > Safe Haven), simulated')
+    prob_ax.set_ylim(0, 100)
+    prob_ax.set_ylabel('Projected Outperformance Probability (%)', fontsize=12)
+    prob_ax.grid(False)
+    prob_handles, prob_labels = prob_ax.get_legend_handles_labels()
+    ax.legend(handles + prob_handles, labels + prob_labels,
+              loc='upper left', frameon=True, fontsize=12, facecolor='white', framealpha=0.9)
+
+    tight_layout()
+    savefig(output_path, dpi=300)
     plt.close()
 
-if __name__ == "__main__":
-    save_dir = "assets"
-    os.makedirs(save_dir, exist_ok=True)
-    
+def load_data():
     print("Executing Overlapping Strength Analytics...")
-    try:
-        raw_data = fetch_real_data()
-        
-        # Macro Comparison (2016-2026)
-        macro_path = os.path.join(save_dir, "strength_overlap_macro.png")
-        plot_strength_index(raw_data, macro_path, 'Macro Analytics: Relative Strength & Rotation Cycles')
-        
-        # Micro Comparison (2024-2026)
-        micro_path = os.path.join(save_dir, "strength_overlap_micro.png")
-        plot_strength_index(raw_data, micro_path, 'Micro Analytics: The 2026 Rotation Crossing', is_zoomed=True)
-        
-        print(f"Success! Charts saved to {save_dir}")
-    except Exception as e:
-        print(f"Error in pipeline: {e}")
-        import traceback
-        traceback.print_exc()
+    return fetch_real_data()
+
+# Macro Comparison (2016-2026)
+def generate_strength_overlap_macro(raw_data):
+    macro_path = os.path.join(ASSETS_DIR, "strength_overlap_macro.png")
+    plot_strength_index(raw_data, macro_path, 'Macro Analytics: Relative Strength & Rotation Cycles')
+
+# Micro Comparison (2024-2026)
+def generate_strength_overlap_micro(raw_data):
+    micro_path = os.path.join(ASSETS_DIR, "strength_overlap_micro.png")
+    plot_strength_index(raw_data, micro_path, 'Micro Analytics: The 2026 Rotation Crossing', is_zoomed=True)
+
+CHARTS = {
+    'strength_overlap_macro': generate_strength_overlap_macro,
+    'strength_overlap_micro': generate_strength_overlap_micro,
+}
+
+if __name__ == "__main__":
+    build(sys.modules[__name__])
+    print(f"Success! Charts saved to {ASSETS_DIR}")
@@ -0,0 +1,89 @@
+"""Benchmark every article's chart generators against synthetic data.
+
+    python bench.py                                   # all articles -> .bench/results.json
+    python bench.py --article BitcoinCrash --repeat 3
+    python bench.py --save-baseline                   # record .bench/baseline.json
+    python bench.py --threshold 0.2                   # exit 1 on >20% regressions
+
+No network is used: bars come from macrokit.providers.SyntheticProvider
+through a throwaway cache, and charts are written to assets/_bench/.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+# Configuration read at import time by macrokit: isolated cache, unthrottled fetcher
+os.environ['MACRO_CACHE_DIR'] = tempfile.mkdtemp(prefix='macro-bench-')
+os.environ.setdefault('MACRO_FETCH_RATE', '1000')
+os.environ.setdefault('MACRO_FETCH_BURST', '1000')
+
+import matplotlib  # noqa: E402
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402,F401
+import pandas as pd  # noqa: E402,F401
+import seaborn as sns  # noqa: E402,F401
+
+from macrokit import bench  # noqa: E402
+from macrokit.articles import discover  # noqa: E402
+from macrokit.providers import SyntheticProvider, set_provider  # noqa: E402
+from macrokit.render import set_profile  # noqa: E402
+
+RESULTS = os.path.join('.bench', 'results.json')
+BASELINE = os.path.join('.bench', 'baseline.json')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark article charts.")
+    parser.add_argument('--article', action='append', help="Article directory to benchmark (repeatable)")
+    parser.add_argument('--chart', action='append', help="Chart name to benchmark (repeatable)")
+    parser.add_argument('--repeat', type=int, default=1, help="Timing passes; the best is kept")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc pass")
+    parser.add_argument('--draft', action='store_true', help="Benchmark the draft render profile")
+    parser.add_argument('--seed', type=int, default=0, help="Synthetic data seed")
+    parser.add_argument('--output', default=RESULTS, help=f"Results file (default {RESULTS})")
+    parser.add_argument('--baseline', default=BASELINE, help=f"Baseline to compare against (default {BASELINE})")
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the baseline")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Relative slowdown or memory growth that counts as a regression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    set_profile('draft' if args.draft else 'bench')
+    set_provider(SyntheticProvider(args.seed))
+
+    articles = discover(args.article)
+    modules = [m for ms in articles.values() for m in ms]
+    if args.chart:
+        modules = [m for m in modules if set(m.CHARTS) & set(args.chart)]
+    if not modules:
+        sys.exit("Nothing to benchmark.")
+
+    try:
+        results = bench.run(modules, only=args.chart, repeat=args.repeat, memory=not args.no_memory)
+    finally:
+        shutil.rmtree(os.environ['MACRO_CACHE_DIR'], ignore_errors=True)
+    print(bench.report(results))
+    bench.save(results, args.output)
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        bench.save(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one.")
+        return
+    regressions = bench.compare(results, bench.load(args.baseline), args.threshold)
+    for r in regressions:
+        print(f"REGRESSION {r.entry} {r.metric}: {r.baseline} -> {r.current}")
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Build every article's charts in one warm process.
+
+    python build.py                                   # all articles
+    python build.py --article BitcoinCrash            # one article
+    python build.py --article BitcoinCrash --chart cme_basis_deep
+    python build.py --force                           # ignore the render cache
+    python build.py --draft --chart everything_crash_synchronous   # quick preview
+    python build.py --trace                           # stage timeline in .trace/build.json
+    python build.py --article BitcoinCrash --freeze   # snapshot the article's inputs
+    python build.py --snapshot                        # offline rebuild from the latest snapshots
+    python build.py --list
+"""
+import argparse
+import os
+import sys
+
+# Shared libraries are imported once for every article
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+import pandas as pd  # noqa: E402,F401
+import seaborn as sns  # noqa: E402,F401
+
+from macrokit import REPO_ROOT, prerender, snapshot, trace  # noqa: E402
+from macrokit.articles import build, discover  # noqa: E402
+from macrokit.images import has_viewer  # noqa: E402
+from macrokit.planner import prefetch  # noqa: E402
+from macrokit.render import profile, set_profile  # noqa: E402
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build article charts.")
+    parser.add_argument('--article', action='append', help="Article directory to build (repeatable)")
+    parser.add_argument('--chart', action='append', help="Chart name to build, e.g. cme_basis_deep (repeatable)")
+    parser.add_argument('--list', action='store_true', help="List articles and their charts")
+    parser.add_argument('--parallel', action='store_true', default=None, help="Render charts on a process pool")
+    parser.add_argument('--memory-budget', type=float, help="Render pool memory budget in MB")
+    parser.add_argument('--force', action='store_true', help="Re-render charts even if unchanged")
+    parser.add_argument('--draft', action='store_true',
+                        help="Low-dpi preview render into <article>/assets/_draft/")
+    parser.add_argument('--snapshot', nargs='?', const='latest', metavar='VERSION',
+                        help="Build from each article's frozen input snapshot (default: latest)")
+    parser.add_argument('--freeze', action='store_true',
+                        help="Record each article's inputs as a new snapshot version while building")
+    parser.add_argument('--trace', nargs='?', const=trace.DEFAULT_PATH, metavar='PATH',
+                        help=f"Record a Chrome-trace timeline of every stage (default {trace.DEFAULT_PATH})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.draft:
+        set_profile('draft')
+    if args.trace:
+        trace.enable(args.trace)
+    if args.snapshot and args.freeze:
+        sys.exit("--snapshot and --freeze are mutually exclusive")
+    if args.snapshot or args.freeze:
+        snapshot.select(args.snapshot, freeze=args.freeze)
+    articles = discover(args.article)
+    if args.article:
+        unknown = set(args.article) - set(articles)
+        if unknown:
+            sys.exit(f"Unknown article(s): {', '.join(sorted(unknown))}")
+
+    if args.list:
+        for article, modules in articles.items():
+            print(article)
+            for module in modules:
+                for name in module.CHARTS:
+                    print(f"  {name}")
+        return
+
+    modules = [m for ms in articles.values() for m in ms]
+    if args.chart:
+        known = {n for m in modules for n in m.CHARTS}
+        unknown = set(args.chart) - known
+        if unknown:
+            sys.exit(f"Unknown chart(s): {', '.join(sorted(unknown))}")
+        modules = [m for m in modules if set(m.CHARTS) & set(args.chart)]
+
+    if args.freeze and args.chart:
+        sys.exit("--freeze snapshots whole articles; drop --chart")
+
+    def article_dir(module):
+        return os.path.dirname(os.path.abspath(module.__file__))
+
+    # One fetch plan across every selected article not served from a snapshot
+    frozen = {a for a in articles if args.snapshot and snapshot.resolve(os.path.join(REPO_ROOT, a), args.snapshot)}
+    prefetch([m.__file__ for m in modules
+              if hasattr(m, 'DATA_NEEDS') and os.path.basename(article_dir(m)) not in frozen])
+
+    built = []
+    for article in articles:
+        # One snapshot session per article, across all of its scripts
+        with snapshot.session(os.path.join(REPO_ROOT, article)):
+            for module in (m for m in modules if os.path.basename(article_dir(m)) == article):
+                built += build(module, only=args.chart, fetch=False, parallel=args.parallel,
+                               memory_budget_mb=args.memory_budget, force=args.force or args.freeze)
+    print(f"Done! Built {len(built)} chart(s).")
+
+    if profile().subdir is None:
+        prerender_articles(articles)
+
+
+def prerender_articles(articles):
+    """Static article.html for every built article with a web viewer."""
+    for article in articles:
+        article_dir = os.path.join(REPO_ROOT, article)
+        if not has_viewer(article_dir):
+            continue
+        try:
+            path = prerender.prerender(article_dir)
+        except ImportError as exc:
+            print(f"Skipping article prerender: {exc}")
+            return
+        print(f"Prerendered {os.path.relpath(path, REPO_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Shared data and rendering helpers for the article chart generators."""
+import os
+
+# Repository root, used to anchor caches and article paths
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
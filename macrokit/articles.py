@@ -0,0 +1,137 @@
+"""Article discovery and building.
+
+Every article script exposes:
+
+    CHARTS     {chart name: chart function}; the name is the PNG stem in assets/
+    set_style  optional, applies the article's matplotlib/seaborn theme
+    load_data  optional, returns the data passed to charts that take an argument;
+               raises SkipArticle when an optional input is missing
+    DATA_NEEDS optional, market data to prefetch (see macrokit.planner)
+
+Scripts are imported once per process; each article is built inside its own
+rc_context so one article's theme never leaks into the next. Charts whose
+data, code and style are unchanged since the last build are skipped (see
+macrokit.render_cache). Articles with a web viewer also get responsive
+image variants (see macrokit.images). With a snapshot selected, inputs come
+from the article's frozen snapshot instead of the cache (see
+macrokit.snapshot).
+"""
+import glob
+import importlib.util
+import inspect
+import os
+import sys
+
+import matplotlib.pyplot as plt
+
+from macrokit import REPO_ROOT, images, snapshot, trace
+from macrokit.cache import frozen
+from macrokit.planner import prefetch
+from macrokit.render import output_dir, profile, run_charts
+from macrokit.render_cache import RenderCache, chart_key
+
+# Directories at the repository root that are not articles
+NON_ARTICLES = {'macrokit'}
+
+
+class SkipArticle(Exception):
+    """Raised by load_data when an optional input is missing; the message says which and how to add it."""
+
+
+def article_scripts(root=REPO_ROOT):
+    """Map article name -> chart scripts in that article's directory."""
+    scripts = {}
+    for path in sorted(glob.glob(os.path.join(root, '*', '*.py'))):
+        article = os.path.basename(os.path.dirname(path))
+        if article not in NON_ARTICLES:
+            scripts.setdefault(article, []).append(path)
+    return scripts
+
+
+def load_script(path):
+    """Import a chart script by path under a unique module name."""
+    article = os.path.basename(os.path.dirname(path))
+    name = f"articles.{article}.{os.path.splitext(os.path.basename(path))[0]}"
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered before executing so forked render workers can unpickle its functions
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def discover(articles=None, root=REPO_ROOT):
+    """Import the chart scripts of `articles` (all by default); returns {article: [modules]}."""
+    found = {}
+    for article, paths in article_scripts(root).items():
+        if articles and article not in articles:
+            continue
+        modules = [load_script(p) for p in paths]
+        found[article] = [m for m in modules if hasattr(m, 'CHARTS')]
+    return found
+
+
+def _takes_data(func):
+    return len(inspect.signature(func).parameters) > 0
+
+
+def assets_dir(module):
+    return os.path.join(os.path.dirname(os.path.abspath(module.__file__)), 'assets')
+
+
+def build(module, only=None, fetch=True, parallel=None, memory_budget_mb=None, force=False):
+    """Build the charts of one script (all of them, or the names in `only`).
+
+    Returns the names actually rendered; `force` ignores the render cache.
+    """
+    names = [n for n in module.CHARTS if not only or n in only]
+    if not names:
+        return []
+
+    with snapshot.session(os.path.dirname(assets_dir(module))), plt.rc_context():
+        plt.rcdefaults()
+        if hasattr(module, 'set_style'):
+            module.set_style()
+        plt.rcParams.update(profile().rc)
+
+        if fetch and hasattr(module, 'DATA_NEEDS') and not frozen():
+            prefetch([module.__file__])
+
+        script = os.path.relpath(module.__file__, REPO_ROOT)
+        data = None
+        if any(_takes_data(module.CHARTS[n]) for n in names):
+            try:
+                with trace.chart(f"{script}::load_data"), trace.span('transform'):
+                    data = module.load_data()
+            except SkipArticle as skip:
+                print(f"{script}: skipped: {skip}")
+                return []
+            if data is None or data.empty:
+                print(f"Error: No data fetched for {module.__name__}.")
+                return []
+
+        cache = RenderCache(output_dir(assets_dir(module)), enabled=False if force else None)
+        jobs, keys = [], []
+        for name in names:
+            func = module.CHARTS[name]
+            args = (data,) if _takes_data(func) else ()
+            key = chart_key(func, args)
+            if cache.is_fresh(name, key):
+                continue
+            jobs.append((func, args))
+            keys.append((name, key))
+
+        skipped = len(names) - len(jobs)
+        if skipped:
+            print(f"{script}: {skipped} chart(s) unchanged, reusing cached PNGs")
+        if jobs:
+            run_charts(jobs, parallel=parallel, memory_budget_mb=memory_budget_mb,
+                       on_done=lambda i: cache.record(*keys[i]),
+                       labels=[f"{script}::{name}" for name, _ in keys])
+
+        # Web variants for articles with a viewer (drafts are never published)
+        if profile().subdir is None and images.has_viewer(os.path.dirname(assets_dir(module))):
+            images.update(assets_dir(module))
+    return [name for name, _ in keys]
@@ -0,0 +1,185 @@
+"""Weighted, rebalanced basket indices over a price panel.
+
+A basket holds fixed share counts between rebalances. At a rebalance row r
+the value V is redistributed to the target weights w, so each constituent
+holds h = w / price[r] units per unit of value; until the next rebalance
+the basket grows by
+
+    g[t] = sum_i h_i * price[t, i]
+
+and V at the next rebalance is V[r] * g[next]. With the rebalance rows
+known, the whole index is one pass over the panel: gather each row's
+holdings, take a row-wise dot product with the prices, and chain the
+segments with a cumulative product.
+
+Weights are 'equal', 'price' (price-weighted, like the Dow), 'market_cap'
+(price times `shares`, a Series or a dated DataFrame), or custom: a Series
+of fixed weights or a DataFrame of target weights by date. Dated inputs are
+taken as of each rebalance. Rebalancing is by calendar (`rebalance`, a
+pandas period alias such as 'M', 'Q' or 'Y', at each period's last row),
+by drift (`drift`, when any weight is more than that many points off its
+target), both, or neither (buy and hold). Only drift needs a sequential
+scan, in blocks of rows, to find where it triggers.
+
+Prices are forward-filled, so a halted or delisted name is held at its
+last price until the next rebalance. A constituent without a price yet
+gets no weight until the first rebalance after it starts trading.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+WEIGHTINGS = ('equal', 'price', 'market_cap')
+
+# Rows scanned at a time when looking for the next drift rebalance
+DRIFT_BLOCK = 64
+
+Basket = namedtuple('Basket', 'level weights turnover')
+
+
+def _asof(frame, index, columns):
+    """`frame` (dated rows) aligned to `index` and `columns`, each row as of that date."""
+    frame = frame.reindex(columns=columns)
+    if not frame.index.is_monotonic_increasing:
+        frame = frame.sort_index()
+    return frame.reindex(index, method='ffill').to_numpy(dtype='float64')
+
+
+def _calendar_rows(index, rebalance):
+    """Last row of every `rebalance` period, except the panel's last row."""
+    if rebalance is None:
+        return np.array([], dtype='int64')
+    stamps = index.tz_localize(None) if getattr(index, 'tz', None) is not None else index
+    periods = stamps.to_period(rebalance)
+    return np.flatnonzero(periods[1:] != periods[:-1])
+
+
+class _Targets:
+    """Target weights at any set of rows, vectorized over rows."""
+
+    def __init__(self, weighting, values, index, columns, shares):
+        self.values = values
+        # Custom weights are a Series or DataFrame, which must not be compared with the names
+        self.kind = weighting if isinstance(weighting, str) else 'custom'
+        self.fixed = self.dated = self.shares = None
+        if isinstance(weighting, str):
+            if weighting not in WEIGHTINGS:
+                raise ValueError(f"weighting must be one of {WEIGHTINGS} or weights, not {weighting!r}")
+            if weighting == 'market_cap':
+                if shares is None:
+                    raise ValueError("weighting='market_cap' needs `shares`")
+                if isinstance(shares, pd.DataFrame):
+                    self.shares = _asof(shares, index, columns)
+                else:
+                    self.fixed = pd.Series(shares).reindex(columns).to_numpy(dtype='float64')
+        elif isinstance(weighting, pd.DataFrame):
+            self.dated = _asof(weighting, index, columns)
+        else:
+            self.fixed = pd.Series(weighting).reindex(columns).to_numpy(dtype='float64')
+
+    def __call__(self, rows):
+        prices = self.values[rows]
+        if self.kind == 'equal':
+            raw = np.ones_like(prices)
+        elif self.kind == 'price':
+            raw = prices.copy()
+        elif self.kind == 'market_cap':
+            raw = prices * (self.shares[rows] if self.shares is not None else self.fixed)
+        else:
+            raw = np.broadcast_to(self.dated[rows] if self.dated is not None else self.fixed, prices.shape).copy()
+        raw[np.isnan(prices) | np.isnan(raw)] = 0.0
+        if (raw < 0).any():
+            raise ValueError("Basket weights must not be negative")
+        total = raw.sum(axis=1, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(total > 0, raw / total, 0.0)
+
+
+def _drift_rows(values, targets, start, calendar, drift):
+    """Rebalance rows from `start` on: every calendar row plus wherever drift triggers."""
+    rows, r = [start], start
+    calendar = calendar[calendar > start]
+    end = len(values) - 1
+    while True:
+        upcoming = calendar[calendar > r]
+        stop = int(upcoming[0]) if len(upcoming) else end
+        weights = targets(np.array([r]))[0]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            holdings = np.where(weights > 0, weights / values[r], 0.0)
+        breach = None
+        for lo in range(r + 1, stop + 1, DRIFT_BLOCK):
+            block = np.nan_to_num(values[lo:min(lo + DRIFT_BLOCK, stop + 1)]) * holdings
+            drifted = block / block.sum(axis=1, keepdims=True)
+            hit = np.flatnonzero((np.abs(drifted - weights) > drift).any(axis=1))
+            if len(hit):
+                breach = lo + int(hit[0])
+                break
+        if breach is None and not len(upcoming):
+            return np.array(rows, dtype='int64')
+        r = breach if breach is not None else stop
+        if r >= end:
+            return np.array(rows, dtype='int64')
+        rows.append(r)
+
+
+def build_basket(prices, constituents=None, weighting='equal', rebalance=None, drift=None, shares=None,
+                 base=100.0, name=None):
+    """Index level of a basket of `constituents` (default: every column of `prices`).
+
+    Returns a Basket of the level (a Series starting at `base` on the first
+    row any constituent has a price), the target weights set at each
+    rebalance, and the one-way turnover of each rebalance.
+    """
+    if constituents is not None:
+        prices = prices[list(constituents)]
+    if not prices.index.is_monotonic_increasing:
+        prices = prices.sort_index()
+    index, columns = prices.index, prices.columns
+    values = prices.ffill().to_numpy(dtype='float64')
+    targets = _Targets(weighting, values, index, columns, shares)
+
+    priced = np.flatnonzero(~np.isnan(values).all(axis=1))
+    if not len(priced):
+        raise ValueError("No constituent of the basket has a price")
+    start = int(priced[0])
+    calendar = _calendar_rows(index, rebalance)
+    if drift is None:
+        rows = np.concatenate([[start], calendar[calendar > start]]).astype('int64')
+    else:
+        rows = _drift_rows(values, targets, start, calendar, drift)
+
+    weights = targets(rows)
+    filled = np.nan_to_num(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        holdings = np.where(weights > 0, weights / values[rows], 0.0)
+
+    # Segment of every row: rows (r_k, r_k+1] are held as set at r_k
+    segment = np.searchsorted(rows, np.arange(len(index)), side='left') - 1
+    live = segment >= 0
+    growth = np.ones(len(index))
+    growth[live] = np.einsum('ij,ij->i', filled[live], holdings[segment[live]])
+
+    # Value at each rebalance, chained from the growth of the segment it ends
+    at_rebalance = np.cumprod(np.concatenate([[1.0], growth[rows[1:]]]))
+    level = np.full(len(index), np.nan)
+    level[start] = 1.0
+    level[live] = at_rebalance[segment[live]] * growth[live]
+    level *= base
+
+    # Turnover: half the distance between the drifted weights and the new targets
+    before = filled[rows[1:]] * holdings[:-1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        before /= before.sum(axis=1, keepdims=True)
+    turnover = np.concatenate([[1.0], 0.5 * np.abs(weights[1:] - before).sum(axis=1)])
+
+    dates = index[rows]
+    return Basket(pd.Series(level, index=index, name=name),
+                  pd.DataFrame(weights, index=dates, columns=columns),
+                  pd.Series(turnover, index=dates, name='turnover'))
+
+
+def basket_index(prices, constituents=None, weighting='equal', rebalance=None, drift=None, shares=None,
+                 base=100.0, name=None):
+    """The level of build_basket() alone."""
+    return build_basket(prices, constituents, weighting, rebalance, drift, shares, base, name).level
@@ -0,0 +1,243 @@
+"""Benchmarks for the article chart generators.
+
+Every chart function of every article is run against deterministic local
+data (macrokit.providers.SyntheticProvider, through a throwaway cache), so
+timings depend on the code alone. Each measured call is split into:
+
+    fetch      filling the cache from the provider (cache.fetch_batches)
+    transform  everything else before the chart creates its first figure
+               (plt.figure, or a pooled figure for a ChartSpec)
+    render     drawing and saving, from the first figure on
+
+A script's prefetch of its DATA_NEEDS and its load_data() are measured as
+entries of their own ('<script>::prefetch', '<script>::load_data'); charts
+are '<script>::<chart name>'. Every script starts from an empty cache and
+timings are the best of `repeat` passes; peak Python-heap memory
+(tracemalloc, which numpy and pandas report to) comes from one extra pass,
+since tracing slows everything down.
+
+Results are JSON; compare() flags entries slower or larger than a stored
+baseline by more than a relative threshold (and an absolute floor, so
+millisecond noise never fails a run). See bench.py for the command line.
+"""
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import time
+import tracemalloc
+from collections import namedtuple
+
+import matplotlib.pyplot as plt
+
+from macrokit import REPO_ROOT, cache
+from macrokit.articles import SkipArticle, _takes_data
+from macrokit.planner import prefetch
+from macrokit.render import profile
+from macrokit.specs import FigurePool
+
+STAGES = ('fetch', 'transform', 'render')
+METRICS = STAGES + ('total', 'peak_mb')
+
+# Regressions smaller than these are noise
+MIN_SECONDS = 0.05
+MIN_MB = 5.0
+
+Regression = namedtuple('Regression', 'entry metric baseline current')
+
+
+class _Clock:
+    """Seconds spent in cache fetches and when the first figure was created, while active."""
+
+    def __enter__(self):
+        self.fetch_before = self.fetch_after = 0.0
+        self.first_figure = None
+        self._fetch_batches, self._figure, self._axes = cache.fetch_batches, plt.figure, FigurePool.axes
+
+        def fetch_batches(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return self._fetch_batches(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                if self.first_figure is None:
+                    self.fetch_before += elapsed
+                else:
+                    self.fetch_after += elapsed
+
+        def figure(*args, **kwargs):
+            # plt.subplots() goes through pyplot.figure too
+            if self.first_figure is None:
+                self.first_figure = time.perf_counter()
+            return self._figure(*args, **kwargs)
+
+        def axes(pool, spec):
+            # Spec charts draw on pooled figures that never go through pyplot
+            if self.first_figure is None:
+                self.first_figure = time.perf_counter()
+            return self._axes(pool, spec)
+
+        cache.fetch_batches, plt.figure, FigurePool.axes = fetch_batches, figure, axes
+        return self
+
+    def __exit__(self, *exc):
+        cache.fetch_batches, plt.figure, FigurePool.axes = self._fetch_batches, self._figure, self._axes
+
+
+def measure(func, *args, trace_memory=False):
+    """Stage timings (and peak traced MB) of one call of `func`."""
+    if trace_memory:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+    with _Clock() as clock, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        func(*args)
+        end = time.perf_counter()
+    split = clock.first_figure or end
+    record = {
+        'fetch': clock.fetch_before + clock.fetch_after,
+        'transform': split - start - clock.fetch_before,
+        'render': end - split - clock.fetch_after,
+        'total': end - start,
+    }
+    if trace_memory:
+        record['peak_mb'] = (tracemalloc.get_traced_memory()[1] - baseline) / 2**20
+    return record
+
+
+def _script(module):
+    return os.path.relpath(module.__file__, REPO_ROOT)
+
+
+def _record(entries, key, func, *args, trace_memory=False):
+    """Measure one call into entries[key]; a skip or failure is recorded instead of raised."""
+    try:
+        entries[key] = measure(func, *args, trace_memory=trace_memory)
+        return True
+    except SkipArticle as skip:
+        entries[key] = {'skipped': str(skip)}
+        return False
+    except Exception as exc:
+        entries[key] = {'error': f"{type(exc).__name__}: {exc}"}
+        return False
+    finally:
+        plt.close('all')
+
+
+def _bench_module(module, only=None, trace_memory=False):
+    script = _script(module)
+    names = [n for n in module.CHARTS if not only or n in only]
+    entries = {}
+    with plt.rc_context():
+        plt.rcdefaults()
+        if hasattr(module, 'set_style'):
+            module.set_style()
+        plt.rcParams.update(profile().rc)
+
+        if hasattr(module, 'DATA_NEEDS'):
+            _record(entries, f"{script}::prefetch", prefetch, [module.__file__], trace_memory=trace_memory)
+
+        data = []
+        if any(_takes_data(module.CHARTS[n]) for n in names):
+            loaded = _record(entries, f"{script}::load_data", lambda: data.append(module.load_data()),
+                             trace_memory=trace_memory)
+            # As in articles.build, charts without data (e.g. a missing optional input) are skipped
+            if not loaded or data[0] is None or data[0].empty:
+                names = [n for n in names if not _takes_data(module.CHARTS[n])]
+
+        for name in names:
+            func = module.CHARTS[name]
+            args = tuple(data) if _takes_data(func) else ()
+            _record(entries, f"{script}::{name}", func, *args, trace_memory=trace_memory)
+    return entries
+
+
+def _clear_cache():
+    if os.path.isdir(cache.CACHE_DIR):
+        shutil.rmtree(cache.CACHE_DIR)
+
+
+def run(modules, only=None, repeat=1, memory=True, progress=print):
+    """Benchmark every chart of `modules`; returns the results document."""
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    passes = [False] * repeat + ([True] if memory else [])
+    entries = {}
+    for i, trace_memory in enumerate(passes):
+        progress(f"Pass {i + 1}/{len(passes)}{' (memory)' if trace_memory else ''}")
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            for module in modules:
+                # Cold cache per script, so no script's fetch depends on the ones before it
+                _clear_cache()
+                for key, record in _bench_module(module, only, trace_memory).items():
+                    best = entries.setdefault(key, {})
+                    if 'error' in record or 'skipped' in record:
+                        best.update(record)
+                        continue
+                    if trace_memory:
+                        best['peak_mb'] = record['peak_mb']
+                        continue
+                    for metric in STAGES + ('total',):
+                        best[metric] = min(best.get(metric, float('inf')), record[metric])
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+
+    return {
+        'profile': profile().name,
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'entries': {k: {m: round(v, 4) if isinstance(v, float) else v for m, v in e.items()}
+                    for k, e in sorted(entries.items())},
+    }
+
+
+def save(results, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(current, baseline, threshold=0.25, min_seconds=MIN_SECONDS, min_mb=MIN_MB):
+    """Regressions of `current` against `baseline` beyond `threshold` (0.25 = 25% worse)."""
+    regressions = []
+    for key, entry in current['entries'].items():
+        old = baseline['entries'].get(key)
+        if old is None:
+            continue
+        if 'error' in entry and 'error' not in old:
+            regressions.append(Regression(key, 'error', None, entry['error']))
+            continue
+        for metric in METRICS:
+            if metric not in entry or metric not in old:
+                continue
+            floor = min_mb if metric == 'peak_mb' else min_seconds
+            if entry[metric] > old[metric] * (1 + threshold) and entry[metric] - old[metric] > floor:
+                regressions.append(Regression(key, metric, old[metric], entry[metric]))
+    return regressions
+
+
+def report(results, limit=None):
+    """Table of the slowest entries, worst first."""
+    rows = sorted(((k, e) for k, e in results['entries'].items() if 'total' in e and 'error' not in e),
+                  key=lambda item: item[1]['total'], reverse=True)
+    lines = [f"{'entry':<70} {'fetch':>7} {'transf':>7} {'render':>7} {'total':>7} {'peakMB':>7}"]
+    for key, e in rows[:limit]:
+        peak = f"{e['peak_mb']:7.1f}" if 'peak_mb' in e else f"{'-':>7}"
+        lines.append(f"{key:<70} {e['fetch']:7.3f} {e['transform']:7.3f} {e['render']:7.3f} {e['total']:7.3f} {peak}")
+    for key, e in results['entries'].items():
+        if 'error' in e:
+            lines.append(f"{key:<70} FAILED: {e['error']}")
+        elif 'skipped' in e:
+            lines.append(f"{key:<70} skipped: {e['skipped']}")
+    return '\n'.join(lines)
@@ -0,0 +1,267 @@
+"""Persistent, incremental on-disk cache in front of the market data provider.
+
+Every (ticker, interval, field) series is stored as its own pickle under
+CACHE_DIR, next to a small meta.json recording the date ranges that have
+already been fetched. On a hit only the parts of the requested range that
+no stored range covers (a head, gaps between earlier downloads, a stale
+tail) are downloaded (see macrokit.fetcher) and merged in. A download that
+comes back empty covers nothing, so it is tried again on the next run.
+"""
+import contextlib
+import json
+import os
+import re
+from datetime import datetime
+
+import pandas as pd
+
+from macrokit import REPO_ROOT, trace
+from macrokit.fetcher import fetch_all
+
+CACHE_DIR = os.environ.get('MACRO_CACHE_DIR', os.path.join(REPO_ROOT, '.cache', 'prices'))
+
+# A cached tail younger than this is considered fresh and is not re-fetched
+CACHE_TTL = pd.Timedelta(hours=float(os.environ.get('MACRO_CACHE_TTL_HOURS', 6)))
+
+# Installed by macrokit.snapshot: a frozen store served instead of the cache
+# (and of the local inputs read through read_local), a recorder of every
+# read to freeze, and the build clock they pin
+_snapshot = None
+_recorder = None
+_now = None
+
+
+@contextlib.contextmanager
+def override(snapshot=None, recorder=None, now=None):
+    """Serve reads from `snapshot`, log them to `recorder` and pin now() for the duration."""
+    global _snapshot, _recorder, _now
+    previous = _snapshot, _recorder, _now
+    _snapshot, _recorder, _now = snapshot, recorder, now
+    try:
+        yield
+    finally:
+        _snapshot, _recorder, _now = previous
+
+
+def frozen():
+    return _snapshot is not None
+
+
+def now():
+    """The build clock: wall time, or the instant the active snapshot was frozen."""
+    return _now if _now is not None else pd.Timestamp(datetime.now())
+
+
+def _parse_period(period):
+    # yfinance style periods: '60d', '6mo', '10y'
+    match = re.fullmatch(r'(\d+)(d|wk|mo|y)', period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    n, unit = int(match.group(1)), match.group(2)
+    offsets = {'d': pd.DateOffset(days=n), 'wk': pd.DateOffset(weeks=n),
+               'mo': pd.DateOffset(months=n), 'y': pd.DateOffset(years=n)}
+    return offsets[unit]
+
+
+def resolve_range(start=None, end=None, period=None):
+    """Turn yf.download style start/end/period arguments into a [start, end) pair."""
+    current = now()
+    end = current if end is None else min(pd.Timestamp(end), current)
+    if start is None:
+        start = end - _parse_period(period) if period and period != 'max' else pd.Timestamp('1900-01-01')
+    return pd.Timestamp(start), end
+
+
+def _ticker_dir(ticker, interval):
+    return os.path.join(CACHE_DIR, interval, ticker.replace(os.sep, '_'))
+
+
+def _read_meta(ticker, interval):
+    path = os.path.join(_ticker_dir(ticker, interval), 'meta.json')
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        meta = json.load(f)
+    # Older caches recorded a single start..end span
+    ranges = meta['ranges'] if 'ranges' in meta else [[meta['start'], meta['end']]]
+    return {'ranges': [(pd.Timestamp(lo), pd.Timestamp(hi)) for lo, hi in ranges], 'fields': meta['fields']}
+
+
+def _merge_ranges(ranges):
+    """Sorted union of [start, end) ranges, touching ones joined."""
+    merged = []
+    for lo, hi in sorted(ranges):
+        if merged and lo <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def _write_atomic(path, writer):
+    tmp = f"{path}.tmp"
+    writer(tmp)
+    os.replace(tmp, path)
+
+
+def _dump_json(payload):
+    def writer(path):
+        with open(path, 'w') as f:
+            json.dump(payload, f)
+    return writer
+
+
+def _store(ticker, interval, frame, start, end):
+    """Merge freshly downloaded fields into the cache and record [start, end) as covered.
+
+    An empty download (or one whose fields are all NaN) records nothing: it
+    is a failed or not yet published range, not proof that there is no data.
+    """
+    frame = frame.dropna(axis=1, how='all').dropna(how='all')
+    if frame.empty:
+        return
+    folder = _ticker_dir(ticker, interval)
+    os.makedirs(folder, exist_ok=True)
+    meta = _read_meta(ticker, interval)
+
+    fields = list(frame.columns)
+    for field in fields:
+        series = frame[field].astype('float64')
+        path = os.path.join(folder, f"{field}.pkl")
+        if os.path.exists(path):
+            old = pd.read_pickle(path)
+            series = pd.concat([old, series])
+            series = series[~series.index.duplicated(keep='last')].sort_index()
+        _write_atomic(path, series.to_pickle)
+
+    ranges = [(start, end)]
+    if meta is not None:
+        ranges += meta['ranges']
+        fields = sorted(set(fields) | set(meta['fields']))
+
+    payload = {'ranges': [[lo.isoformat(), hi.isoformat()] for lo, hi in _merge_ranges(ranges)],
+               'fields': sorted(fields)}
+    _write_atomic(os.path.join(folder, 'meta.json'), _dump_json(payload))
+
+
+def fetch_batches(batches, provider=None):
+    """Download planner batches concurrently and merge the results into the cache."""
+    if not batches or _snapshot is not None:
+        # Nothing missing, or a frozen snapshot is being served: stay offline
+        return
+    with trace.span('download', f"{len(batches)} batch(es)"):
+        for batch, frames in fetch_all(batches, provider=provider):
+            print(f"Fetched {', '.join(batch.tickers)} [{batch.interval}] {batch.start.date()} -> {batch.end.date()}")
+            for ticker, frame in frames.items():
+                # None marks a ticker that kept failing: leave its range uncached
+                if frame is not None:
+                    _store(ticker, batch.interval, frame, batch.start, batch.end)
+
+
+def missing_ranges(ticker, start, end, interval='1d'):
+    """Return the [start, end) ranges of `ticker` that are not yet cached."""
+    meta = _read_meta(ticker, interval)
+    if meta is None:
+        return [(start, end)]
+
+    # Gaps before and between the stored ranges
+    ranges, cursor = [], start
+    for lo, hi in meta['ranges']:
+        if lo >= end:
+            break
+        if lo > cursor:
+            ranges.append((cursor, lo))
+        cursor = max(cursor, hi)
+
+    last = meta['ranges'][-1][1]
+    if end <= last:
+        if cursor < end:
+            ranges.append((cursor, end))
+    elif end - last > CACHE_TTL:
+        # Re-fetch from the last cached bar: it may have been incomplete when stored
+        close_path = os.path.join(_ticker_dir(ticker, interval), 'Close.pkl')
+        tail_start = last
+        if os.path.exists(close_path):
+            cached = pd.read_pickle(close_path)
+            if not cached.empty:
+                tail_start = min(tail_start, cached.index[-1])
+        ranges.append((max(tail_start, start), end))
+    return ranges
+
+
+def update(tickers, start, end, interval='1d'):
+    """Bring the cache for `tickers` up to date over [start, end) with as few requests as possible."""
+    if _snapshot is not None:
+        return
+    from macrokit.planner import Need, plan_batches
+
+    fetch_batches(plan_batches([Need(t, start, end, interval) for t in tickers]))
+
+
+def cached_fields(ticker, interval='1d'):
+    if _snapshot is not None:
+        return _snapshot.fields(ticker, interval)
+    meta = _read_meta(ticker, interval)
+    return meta['fields'] if meta is not None else []
+
+
+def read_field(ticker, field, start, end, interval='1d'):
+    """Read one cached field over [start, end) as a positional slice (no copy of the stored series)."""
+    if _recorder is not None:
+        _recorder.add(ticker, field, start, end, interval)
+    if _snapshot is not None:
+        return _snapshot.read_field(ticker, field, start, end, interval)
+    path = os.path.join(_ticker_dir(ticker, interval), f"{field}.pkl")
+    if not os.path.exists(path):
+        return None
+    series = pd.read_pickle(path)
+    lo, hi = series.index.searchsorted(start), series.index.searchsorted(end)
+    return series.iloc[lo:hi]
+
+
+def read_local(source, key, start, end, load):
+    """A frame from a local input outside the cache (a UTXO dump, intraday files).
+
+    `load()` reads it, None when there is none. Like read_field() it is
+    recorded while freezing and served from the snapshot when building from
+    one: `source` names its table there and `key` the frame's columns.
+    """
+    if _snapshot is not None:
+        return _snapshot.read_local(source, key, start, end)
+    frame = load()
+    if _recorder is not None and frame is not None:
+        _recorder.add_local(source, key, frame, start, end)
+    return frame
+
+
+def read(ticker, start, end, interval='1d', fields=None):
+    """Read cached fields for one ticker over [start, end) without touching the network."""
+    columns = {}
+    for field in fields or cached_fields(ticker, interval):
+        series = read_field(ticker, field, start, end, interval)
+        if series is not None:
+            columns[field] = series
+    return pd.DataFrame(columns)
+
+
+def download(tickers, start=None, end=None, interval='1d', period=None, fields=None):
+    """Drop-in replacement for yf.download backed by the local cache.
+
+    Returns the same (Price, Ticker) MultiIndex column layout recent yfinance
+    versions produce, for a single ticker as well as a list.
+    """
+    if isinstance(tickers, str):
+        tickers = tickers.split()
+    start, end = resolve_range(start, end, period)
+
+    with trace.span('load', ' '.join(tickers)):
+        update(tickers, start, end, interval)
+        frames = {t: read(t, start, end, interval, fields) for t in tickers}
+
+        frames = {t: f for t, f in frames.items() if not f.empty}
+        if not frames:
+            return pd.DataFrame()
+        data = pd.concat(frames, axis=1).swaplevel(0, 1, axis=1).sort_index(axis=1, level=0, sort_remaining=False)
+        data.columns.names = ['Price', 'Ticker']
+        data.index.name = 'Date'
+    return data
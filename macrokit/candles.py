@@ -0,0 +1,123 @@
+"""Candlestick, OHLC-bar, volume and zone drawing built from arrays.
+
+Every function adds a fixed number of collections to the axes however
+many bars there are (one LineCollection for the wicks, one PolyCollection
+for the bodies, ...), so 10k candles cost about as much to draw as a
+line plot instead of 20k separate vlines artists.
+
+x positions are matplotlib date numbers taken from the frame's
+DatetimeIndex, so these layers mix freely with ax.plot(df.index, ...).
+"""
+import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import to_rgba
+
+UP_COLOR = 'green'
+DOWN_COLOR = 'red'
+
+# Body / volume bar width as a fraction of the typical bar spacing
+BODY_WIDTH = 0.6
+
+
+def _x(index):
+    return mdates.date2num(index)
+
+
+def _spacing(x):
+    return float(np.median(np.diff(x))) if len(x) > 1 else 1.0
+
+
+def _rects(x, y0, y1, width):
+    """(n, 4, 2) rectangle vertices centred on x."""
+    left, right = x - width / 2, x + width / 2
+    return np.stack([
+        np.column_stack([left, y0]), np.column_stack([left, y1]),
+        np.column_stack([right, y1]), np.column_stack([right, y0]),
+    ], axis=1)
+
+
+def _colors(df, up, down):
+    rising = df['Close'].to_numpy() >= df['Open'].to_numpy()
+    return np.where(rising[:, None], np.array(to_rgba(up)), np.array(to_rgba(down)))
+
+
+def _add(ax, collection, x, y0, y1):
+    ax.add_collection(collection)
+    if len(x):
+        ax.update_datalim([(np.min(x), np.nanmin(y0)), (np.max(x), np.nanmax(y1))])
+        ax.autoscale_view()
+    ax.xaxis_date()
+    return collection
+
+
+def candlestick(ax, df, width=BODY_WIDTH, up=UP_COLOR, down=DOWN_COLOR, wick_width=1.0, alpha=1.0, label=None):
+    """Draw `df` (Open, High, Low, Close) as candles; returns (wicks, bodies)."""
+    x = _x(df.index)
+    o, h, l, c = (df[f].to_numpy(dtype='float64') for f in ('Open', 'High', 'Low', 'Close'))
+    colors = _colors(df, up, down)
+
+    wicks = LineCollection(np.stack([np.column_stack([x, l]), np.column_stack([x, h])], axis=1),
+                           colors=colors, linewidths=wick_width, alpha=alpha)
+    bodies = PolyCollection(_rects(x, np.minimum(o, c), np.maximum(o, c), width * _spacing(x)),
+                            facecolors=colors, edgecolors=colors, linewidths=0.5, alpha=alpha, label=label)
+    _add(ax, wicks, x, l, h)
+    _add(ax, bodies, x, l, h)
+    return wicks, bodies
+
+
+def ohlc_bars(ax, df, width=BODY_WIDTH, up=UP_COLOR, down=DOWN_COLOR, linewidth=1.0, alpha=1.0, label=None):
+    """Draw `df` as OHLC bars (range line, open tick left, close tick right) in one LineCollection."""
+    x = _x(df.index)
+    o, h, l, c = (df[f].to_numpy(dtype='float64') for f in ('Open', 'High', 'Low', 'Close'))
+    tick = width * _spacing(x) / 2
+    segments = np.concatenate([
+        np.stack([np.column_stack([x, l]), np.column_stack([x, h])], axis=1),
+        np.stack([np.column_stack([x - tick, o]), np.column_stack([x, o])], axis=1),
+        np.stack([np.column_stack([x, c]), np.column_stack([x + tick, c])], axis=1),
+    ])
+    colors = np.tile(_colors(df, up, down), (3, 1))
+    return _add(ax, LineCollection(segments, colors=colors, linewidths=linewidth, alpha=alpha, label=label),
+                x, l, h)
+
+
+def volume(ax, df, width=BODY_WIDTH, up=UP_COLOR, down=DOWN_COLOR, alpha=0.6):
+    """Volume bars coloured like their candle, as one PolyCollection."""
+    x = _x(df.index)
+    v = np.nan_to_num(df['Volume'].to_numpy(dtype='float64'))
+    colors = _colors(df, up, down)
+    bars = PolyCollection(_rects(x, np.zeros_like(v), v, width * _spacing(x)),
+                          facecolors=colors, edgecolors='none', alpha=alpha)
+    _add(ax, bars, x, np.zeros_like(v), v)
+    ax.set_ylim(bottom=0)
+    return bars
+
+
+def zones(ax, table, width=None, color='tab:blue', alpha=0.3, label=None, until_mitigated=False):
+    """Shade price zones as rectangles in one PolyCollection.
+
+    `table` has time, top and bottom columns (e.g. from
+    macrokit.smc.detect). Each rectangle starts at its time and spans
+    `width` (a Timedelta), or runs to its mitigated_time when
+    `until_mitigated` is set (open zones then run to the axes' right edge).
+    """
+    if len(table) == 0:
+        return None
+    start = _x(table['time'])
+    if until_mitigated:
+        end = _x(table['mitigated_time'].fillna(mdates.num2date(ax.get_xlim()[1]).replace(tzinfo=None)))
+    else:
+        end = _x(table['time'] + width)
+    bottom, top = table['bottom'].to_numpy(), table['top'].to_numpy()
+    verts = np.stack([np.column_stack([start, bottom]), np.column_stack([start, top]),
+                      np.column_stack([end, top]), np.column_stack([end, bottom])], axis=1)
+    rects = PolyCollection(verts, facecolors=color, edgecolors='none', alpha=alpha, label=label)
+    return _add(ax, rects, np.concatenate([start, end]), bottom, top)
+
+
+def price_volume_axes(figsize=(14, 8), height_ratios=(3, 1)):
+    """Figure with a price panel above a volume panel sharing the date axis."""
+    fig, (price_ax, volume_ax) = plt.subplots(2, 1, figsize=figsize, sharex=True,
+                                              gridspec_kw={'height_ratios': height_ratios})
+    return fig, price_ax, volume_ax
@@ -0,0 +1,144 @@
+"""Streaming volatility and correlation for many assets.
+
+RollingCovariance keeps the last `window` return vectors in a ring buffer
+together with running pairwise sums, so a new bar costs one O(assets^2)
+update (add the new row, subtract the one falling out) regardless of the
+window length. Missing returns are handled pairwise, like pandas'
+rolling().cov(). Running sums are rebuilt from the buffer once per window
+so floating-point drift never accumulates.
+
+EWMCovariance is the exponentially weighted counterpart (RiskMetrics
+style) and needs no buffer at all.
+
+rolling_volatility() and rolling_correlation() stream a whole returns
+frame through RollingCovariance for charting.
+"""
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+class RollingCovariance:
+    """Pairwise covariance over the last `window` bars of `n_assets` return series."""
+
+    def __init__(self, n_assets, window, min_periods=None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.buffer = np.full((window, n_assets), np.nan)
+        self.position = 0
+        self.updates = 0
+        self._reset_sums()
+
+    def _reset_sums(self):
+        n = self.buffer.shape[1]
+        self.count = np.zeros((n, n))
+        # [i, j] entries run over the bars where both x_i and x_j are present
+        self.sum = np.zeros((n, n))       # sum of x_i
+        self.square = np.zeros((n, n))    # sum of x_i^2
+        self.product = np.zeros((n, n))   # sum of x_i * x_j
+
+    def _accumulate(self, row, sign):
+        valid = ~np.isnan(row)
+        x = np.where(valid, row, 0.0)
+        self.count += sign * np.outer(valid, valid)
+        self.sum += sign * np.outer(x, valid)
+        self.square += sign * np.outer(x * x, valid)
+        self.product += sign * np.outer(x, x)
+
+    def update(self, row):
+        """Add one bar of returns (NaN where an asset has no return) and drop the oldest."""
+        row = np.asarray(row, dtype='float64')
+        old = self.buffer[self.position].copy()
+        self.buffer[self.position] = row
+        self.position = (self.position + 1) % self.window
+        self.updates += 1
+
+        if self.updates % self.window == 0:
+            # Periodic exact rebuild; amortized O(assets^2) per bar
+            self._reset_sums()
+            for past in self.buffer:
+                self._accumulate(past, 1.0)
+        else:
+            self._accumulate(old, -1.0)
+            self._accumulate(row, 1.0)
+
+    def covariance(self):
+        count = self.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = (self.product - self.sum * self.sum.T / count) / (count - 1)
+        cov[count < max(self.min_periods, 2)] = np.nan
+        return cov
+
+    def volatility(self):
+        return np.sqrt(np.clip(np.diag(self.covariance()), 0, None))
+
+    def correlation(self):
+        count = self.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # Each pair's variances use only the bars the pair shares
+            var = self.square - self.sum ** 2 / count
+            corr = (self.product - self.sum * self.sum.T / count) / np.sqrt(var * var.T)
+        corr[count < max(self.min_periods, 2)] = np.nan
+        return corr
+
+
+class EWMCovariance:
+    """Exponentially weighted covariance; `halflife` in bars."""
+
+    def __init__(self, n_assets, halflife):
+        self.alpha = 1 - 0.5 ** (1 / halflife)
+        self.mean = np.zeros(n_assets)
+        self.cov = np.zeros((n_assets, n_assets))
+        self.seen = np.zeros(n_assets, dtype=bool)
+
+    def update(self, row):
+        row = np.asarray(row, dtype='float64')
+        valid = ~np.isnan(row)
+        first = valid & ~self.seen
+        self.mean[first] = row[first]
+        self.seen |= valid
+
+        delta = np.where(valid, row - self.mean, 0.0)
+        both = np.outer(valid, valid)
+        a = self.alpha
+        self.cov = np.where(both, (1 - a) * (self.cov + a * np.outer(delta, delta)), self.cov)
+        self.mean += a * delta
+
+    def covariance(self):
+        return self.cov
+
+    def volatility(self):
+        return np.sqrt(np.diag(self.cov))
+
+    def correlation(self):
+        vol = self.volatility()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.cov / np.outer(vol, vol)
+
+
+def rolling_volatility(returns, window, annualize=TRADING_DAYS, min_periods=None):
+    """Rolling standard deviation of every column, annualized with sqrt(`annualize`)."""
+    stats = RollingCovariance(returns.shape[1], window, min_periods)
+    out = np.empty(returns.shape)
+    for t, row in enumerate(returns.to_numpy(dtype='float64')):
+        stats.update(row)
+        out[t] = stats.volatility()
+    return pd.DataFrame(out * np.sqrt(annualize), index=returns.index, columns=returns.columns)
+
+
+def rolling_correlation(returns, window, min_periods=None):
+    """(average pairwise correlation per bar, correlation matrix at the last bar)."""
+    n = returns.shape[1]
+    stats = RollingCovariance(n, window, min_periods)
+    average = np.empty(len(returns))
+    off_diagonal = ~np.eye(n, dtype=bool)
+    corr = np.full((n, n), np.nan)
+    for t, row in enumerate(returns.to_numpy(dtype='float64')):
+        stats.update(row)
+        corr = stats.correlation()
+        values = corr[off_diagonal]
+        values = values[~np.isnan(values)]
+        average[t] = values.mean() if len(values) else np.nan
+    return (pd.Series(average, index=returns.index),
+            pd.DataFrame(corr, index=returns.columns, columns=returns.columns))
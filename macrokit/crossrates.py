@@ -0,0 +1,74 @@
+"""Any asset priced in any other, computed lazily over one price panel.
+
+CrossRates takes the log of the panel once, column-major, so the price of
+asset a in units of asset b is a subtraction of two contiguous columns:
+
+    log(a / b)[t] = log_price[t, a] - log_price[t, b]
+
+Nothing is computed up front: an N-asset panel has N*N pairs, but only
+the requested ones are built. They are memoized in a bounded LRU, and
+the inverse of a cached pair is served from it by negation. A bar where
+either asset has no price is NaN, unless the panel is forward-filled on
+construction (`ffill=True`, to price a weekday asset on weekends).
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Pairs kept in memory; 10 years of daily bars is ~30 KB per pair
+MAX_PAIRS = 512
+
+
+class CrossRates:
+    def __init__(self, prices, ffill=False, max_pairs=MAX_PAIRS):
+        if not prices.index.is_monotonic_increasing:
+            prices = prices.sort_index()
+        if ffill:
+            prices = prices.ffill()
+        self.index = prices.index
+        self.columns = prices.columns
+        self.max_pairs = max_pairs
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.log = np.asfortranarray(np.log(prices.to_numpy(dtype='float64')))
+        self._positions = {name: i for i, name in enumerate(self.columns)}
+        self._pairs = OrderedDict()  # (asset, quote) -> log ratio
+
+    def _column(self, name):
+        try:
+            return self.log[:, self._positions[name]]
+        except KeyError:
+            raise KeyError(f"{name!r} is not in the panel") from None
+
+    def log_ratio(self, asset, quote):
+        """log(asset / quote) per bar, as a read-only array."""
+        key = (asset, quote)
+        if key in self._pairs:
+            self._pairs.move_to_end(key)
+            return self._pairs[key]
+        inverse = self._pairs.get((quote, asset))
+        if inverse is not None:
+            values = -inverse
+        else:
+            values = self._column(asset) - self._column(quote)
+        values.flags.writeable = False
+        self._pairs[key] = values
+        if len(self._pairs) > self.max_pairs:
+            self._pairs.popitem(last=False)
+        return values
+
+    def ratio(self, asset, quote):
+        """Price of `asset` in units of `quote`."""
+        return pd.Series(np.exp(self.log_ratio(asset, quote)), index=self.index, name=f"{asset}/{quote}")
+
+    def __getitem__(self, pair):
+        return self.ratio(*pair)
+
+    def priced_in(self, quote, assets=None):
+        """Every asset in `assets` (default: all others) priced in `quote`, one column each."""
+        if assets is None:
+            assets = [name for name in self.columns if name != quote]
+        return pd.DataFrame({asset: np.exp(self.log_ratio(asset, quote)) for asset in assets}, index=self.index)
+
+    def cached_pairs(self):
+        return len(self._pairs)
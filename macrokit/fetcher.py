@@ -0,0 +1,112 @@
+"""Concurrent market-data fetcher.
+
+Batches from the planner are sent to the active provider on a bounded
+thread pool. A token bucket caps the request rate, and requests that
+raise are retried with exponential backoff, as are tickers that come back
+empty or all-NaN (Yahoo reports most failures that way instead of
+raising); only the tickers still missing are asked for again. A batch that
+keeps raising is split into single-ticker requests so one bad symbol
+cannot sink the rest of the run.
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from macrokit.providers import get_provider
+
+MAX_WORKERS = int(os.environ.get('MACRO_FETCH_WORKERS', 4))
+RATE_PER_SECOND = float(os.environ.get('MACRO_FETCH_RATE', 2.0))
+BURST = int(os.environ.get('MACRO_FETCH_BURST', 4))
+MAX_RETRIES = int(os.environ.get('MACRO_FETCH_RETRIES', 3))
+BACKOFF_SECONDS = 1.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `capacity` banked."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def _has_data(frame):
+    return frame is not None and not frame.empty and frame.notna().to_numpy().any()
+
+
+def _attempt(provider, bucket, batch, retries, backoff):
+    """Fetch `batch`, retrying the tickers that raise or come back without data.
+
+    Returns the frames that arrived, the tickers still missing after the
+    last try and why they are missing.
+    """
+    frames, tickers, error = {}, list(batch.tickers), None
+    for attempt in range(retries + 1):
+        bucket.acquire()
+        try:
+            result = provider.fetch(tickers, batch.start, batch.end, batch.interval)
+        except Exception as e:
+            result, error = {}, e
+        else:
+            # Providers report a failed ticker as an empty (or all-NaN) frame rather than raising
+            error = 'no data returned'
+        frames.update((t, result[t]) for t in tickers if _has_data(result.get(t)))
+        tickers = [t for t in tickers if t not in frames]
+        if not tickers or attempt == retries:
+            break
+        delay = backoff * (2 ** attempt) * (1 + random.random())
+        print(f"Fetch of {', '.join(tickers)} failed ({error}); retrying in {delay:.1f}s...")
+        time.sleep(delay)
+    return frames, tickers, error
+
+
+def _give_up(frames, tickers, error):
+    for ticker in tickers:
+        print(f"Giving up on {ticker}: {error}")
+        frames[ticker] = None
+
+
+def fetch_all(batches, provider=None, workers=None, rate=None, retries=None, backoff=BACKOFF_SECONDS):
+    """Fetch every batch concurrently.
+
+    Yields (batch, {ticker: frame}) as requests complete. Tickers that still
+    fail (or have no data) after retrying are yielded with a None frame, so
+    the caller can leave them uncached instead of recording an empty range.
+    """
+    provider = provider or get_provider()
+    workers = workers or MAX_WORKERS
+    retries = MAX_RETRIES if retries is None else retries
+    bucket = TokenBucket(rate or RATE_PER_SECOND, BURST)
+
+    def run(batch):
+        frames, failed, error = _attempt(provider, bucket, batch, retries, backoff)
+        if len(failed) > 1 and isinstance(error, Exception):
+            # The request kept raising, maybe over one bad symbol: try the rest on their own
+            for ticker in failed:
+                single, missing, reason = _attempt(provider, bucket, batch._replace(tickers=[ticker]), retries, backoff)
+                frames.update(single)
+                _give_up(frames, missing, reason)
+        else:
+            _give_up(frames, failed, error)
+        return batch, frames
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(batches) or 1))) as pool:
+        futures = [pool.submit(run, batch) for batch in batches]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,125 @@
+"""Futures contract chains, curve basis and continuous rolls.
+
+Contracts use Yahoo's dated-contract symbols, root + CME month code +
+two-digit year + exchange suffix (BTCG26.CME is the February 2026 Bitcoin
+contract). Expiries come from a calendar rule instead of being typed in
+per script: CME Bitcoin futures expire on the last Friday of the contract
+month.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+MONTH_CODES = 'FGHJKMNQUVXZ'  # January ... December
+
+SYMBOL = re.compile(r'^(?P<root>[A-Z]+?)(?P<code>[FGHJKMNQUVXZ])(?P<year>\d{2})(?P<suffix>\.[A-Z]+)?$')
+
+
+def parse_symbol(symbol):
+    """'BTCG26.CME' -> ('BTC', 2026, 2, '.CME')."""
+    match = SYMBOL.match(symbol)
+    if not match:
+        raise ValueError(f"Not a dated futures symbol: {symbol!r}")
+    month = MONTH_CODES.index(match['code']) + 1
+    return match['root'], 2000 + int(match['year']), month, match['suffix'] or ''
+
+
+def contract_symbol(root, year, month, suffix='.CME'):
+    return f"{root}{MONTH_CODES[month - 1]}{year % 100:02d}{suffix}"
+
+
+def last_friday(year, month):
+    """Expiry of the `year`/`month` contract under the CME Bitcoin rule."""
+    month_end = pd.Timestamp(year, month, 1) + pd.offsets.MonthEnd(0)
+    return month_end - pd.Timedelta(days=(month_end.weekday() - 4) % 7)
+
+
+def expiry(symbol, rule=last_friday):
+    _, year, month, _ = parse_symbol(symbol)
+    return rule(year, month)
+
+
+def chain(root, first, last, suffix='.CME', months=None):
+    """Contract symbols from the `first` to the `last` contract month ('2026-01'), optionally only `months`."""
+    periods = pd.period_range(first, last, freq='M')
+    return [contract_symbol(root, p.year, p.month, suffix) for p in periods if not months or p.month in months]
+
+
+def expiries(symbols, rule=last_friday):
+    return pd.DatetimeIndex([expiry(s, rule) for s in symbols])
+
+
+def days_to_expiry(index, symbols, rule=last_friday):
+    """(dates, contracts) array of calendar days until each contract expires."""
+    dates = pd.DatetimeIndex(index).normalize().to_numpy(dtype='datetime64[D]')
+    ends = expiries(symbols, rule).to_numpy(dtype='datetime64[D]')
+    return (ends[None, :] - dates[:, None]).astype('int64')
+
+
+def annualized_basis(spot, futures, rule=last_friday, min_days=0):
+    """Annualized basis (%) of every contract column of `futures` against `spot` on every date.
+
+    ((F / S) - 1) * 365 / days_to_expiry * 100; the expiry day counts as
+    one day. Dates after expiry, or closer than `min_days` to it (where
+    annualizing blows small premiums up), are NaN.
+    """
+    days = days_to_expiry(futures.index, futures.columns, rule)
+    premium = futures.to_numpy(dtype='float64') / spot.reindex(futures.index).to_numpy(dtype='float64')[:, None] - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        basis = premium * 365 / np.maximum(days, 1) * 100
+    basis[days < max(min_days, 0)] = np.nan
+    return pd.DataFrame(basis, index=futures.index, columns=futures.columns)
+
+
+def active_contract(futures, roll_days=5, volume=None, rule=last_friday):
+    """Position (in `futures.columns`, ordered by expiry) of the contract held on each date.
+
+    By default the position rolls `roll_days` calendar days before expiry.
+    With a `volume` frame (same columns) it rolls once a later contract
+    trades more than the held one; it never rolls back.
+    """
+    days = days_to_expiry(futures.index, futures.columns, rule)
+    live = days > roll_days
+    # First contract still outside its roll window (len(columns) when the chain has run out)
+    active = np.where(live.any(axis=1), live.argmax(axis=1), len(futures.columns))
+    if volume is not None:
+        traded = np.where(days >= 0, np.nan_to_num(volume[futures.columns].to_numpy(dtype='float64')), -1)
+        active = np.maximum(active, traded.argmax(axis=1))
+    return np.maximum.accumulate(np.minimum(active, len(futures.columns) - 1))
+
+
+def continuous(futures, roll_days=5, volume=None, method='difference', rule=last_friday):
+    """Back-adjusted continuous series across the chain in `futures`.
+
+    At every roll the older history is shifted by the gap between the new
+    and the old contract on the roll date ('difference'), or scaled by
+    their ratio ('ratio'), so the series has no roll jumps and ends at the
+    live contract's actual price. A contract without a price on the roll
+    date contributes its last price before it; a roll where either side
+    has never traded is not adjusted.
+    """
+    futures = futures[sorted(futures.columns, key=lambda s: expiry(s, rule))]
+    active = active_contract(futures, roll_days, volume, rule)
+    prices = futures.to_numpy(dtype='float64')
+    rows = np.arange(len(futures))
+    raw = prices[rows, active]
+
+    rolls = np.flatnonzero(np.diff(active)) + 1
+    # A gap on the roll date would carry NaN into all earlier history
+    last = futures.ffill().to_numpy(dtype='float64')
+    new, old = last[rolls, active[rolls]], last[rolls, active[rolls - 1]]
+    unpriced = np.isnan(new) | np.isnan(old)
+    new[unpriced], old[unpriced] = 1.0, 1.0
+    # Each segment is adjusted by every roll that follows it
+    segment = np.searchsorted(rolls, rows, side='right')
+    if method == 'ratio':
+        factors = np.append(np.cumprod((new / old)[::-1])[::-1], 1.0)
+        adjusted = raw * factors[segment]
+    elif method == 'difference':
+        offsets = np.append(np.cumsum((new - old)[::-1])[::-1], 0.0)
+        adjusted = raw + offsets[segment]
+    else:
+        raise ValueError(f"Unknown back-adjustment method {method!r}")
+
+    return pd.DataFrame({'price': adjusted, 'contract': futures.columns[active]}, index=futures.index)
@@ -0,0 +1,126 @@
+"""Responsive image variants for the article viewers.
+
+Charts are rendered once at publication dpi (4000+ px wide). For the web
+viewer every PNG in an article's assets/ also gets downscaled AVIF and WebP
+copies in assets/responsive/, listed in assets/responsive/manifest.json:
+
+    {"supply_constant.png": {"width": 4200, "height": 2400, "source": "<sha256>",
+                             "avif": [["responsive/supply_constant-480.avif", 480], ...],
+                             "webp": [["responsive/supply_constant-480.webp", 480], ...]}}
+
+viewer.js reads the manifest to turn each <img> into a <picture> with an
+AVIF srcset, then a WebP one, then the PNG itself, explicit dimensions and
+lazy loading. Variants are regenerated only when the PNG's content changes
+(or when an entry lacks a format this Pillow can write). AVIF needs a
+Pillow built with it (11.2+ wheels are); without it only WebP is written.
+
+    python -m macrokit.images BitcoinConstant Debt
+"""
+import glob
+import hashlib
+import json
+import os
+import sys
+
+from PIL import Image, features
+
+from macrokit import REPO_ROOT
+
+# The viewer column is 900 CSS px; 1920 covers it on 2x screens
+WIDTHS = (480, 960, 1440, 1920)
+WEBP_QUALITY = 82
+# AVIF reaches WebP's quality on charts (flat fills, thin lines) at a lower setting
+AVIF_QUALITY = 60
+
+# Preferred first: the order of the <source> elements
+FORMATS = ('avif', 'webp')
+
+RESPONSIVE_DIR = 'responsive'
+MANIFEST_NAME = 'manifest.json'
+
+
+def has_viewer(article_dir):
+    return os.path.exists(os.path.join(article_dir, 'index.html'))
+
+
+def _digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def formats():
+    """The variant formats this Pillow can write, preferred first."""
+    return [f for f in FORMATS if features.check(f)]
+
+
+def _save(image, path, fmt):
+    if fmt == 'avif':
+        image.save(path, 'AVIF', quality=AVIF_QUALITY)
+    else:
+        image.save(path, 'WEBP', quality=WEBP_QUALITY)
+
+
+def _variants(png, out_dir, widths, kinds):
+    stem = os.path.splitext(os.path.basename(png))[0]
+    with Image.open(png) as image:
+        image.load()
+        width, height = image.size
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        sources = {fmt: [] for fmt in kinds}
+        # Never upscale; images narrower than the largest width also keep their own size
+        targets = sorted(w for w in widths if w < width)
+        if width <= max(widths):
+            targets.append(width)
+        for target in targets:
+            scaled = image if target == width else image.resize(
+                (target, round(height * target / width)), Image.Resampling.LANCZOS)
+            for fmt in kinds:
+                name = f"{stem}-{target}.{fmt}"
+                _save(scaled, os.path.join(out_dir, name), fmt)
+                sources[fmt].append([f"{RESPONSIVE_DIR}/{name}", target])
+    return {'width': width, 'height': height, **sources}
+
+
+def update(assets_dir, widths=WIDTHS):
+    """Bring assets/responsive/ in line with the PNGs in `assets_dir`; returns the names regenerated."""
+    out_dir = os.path.join(assets_dir, RESPONSIVE_DIR)
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    os.makedirs(out_dir, exist_ok=True)
+    kinds = formats()
+    pngs = sorted(glob.glob(os.path.join(assets_dir, '*.png')))
+    updated = []
+    for png in pngs:
+        name = os.path.basename(png)
+        digest = _digest(png)
+        entry = manifest.get(name, {})
+        if entry.get('source') == digest and all(fmt in entry for fmt in kinds):
+            continue
+        manifest[name] = dict(_variants(png, out_dir, widths, kinds), source=digest)
+        updated.append(name)
+
+    # Forget charts that no longer exist
+    current = {os.path.basename(p) for p in pngs}
+    for name in set(manifest) - current:
+        entry = manifest.pop(name)
+        for path, _ in (source for fmt in FORMATS for source in entry.get(fmt, [])):
+            if os.path.exists(os.path.join(assets_dir, path)):
+                os.remove(os.path.join(assets_dir, path))
+        updated.append(name)
+
+    if updated:
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    return updated
+
+
+if __name__ == "__main__":
+    for article in sys.argv[1:] or sorted(os.listdir(REPO_ROOT)):
+        article_dir = os.path.join(REPO_ROOT, article)
+        if has_viewer(article_dir):
+            print(f"{article}: {len(update(os.path.join(article_dir, 'assets')))} image(s) updated")
@@ -0,0 +1,104 @@
+"""Rebasing price panels ("indexed to 100 at date X").
+
+IndexedPanel takes the log of the forward-filled panel once. Rebasing to
+any date, window or subset of assets is then a subtraction of one
+baseline row and an exp over just the requested block:
+
+    indexed[t] = base * exp(log_price[t] - log_price[at])
+
+The baseline is the last price on or before `at`, so an asset that did
+not trade that day (a Sunday for equities) is based on its previous
+close. An asset that has not started trading by `at` is based on its
+first price.
+"""
+import numpy as np
+import pandas as pd
+
+MISSING = ('keep', 'drop', 'ffill')
+
+
+class IndexedPanel:
+    def __init__(self, prices):
+        if not prices.index.is_monotonic_increasing:
+            prices = prices.sort_index()
+        self.index = prices.index
+        self.columns = prices.columns
+        values = prices.to_numpy(dtype='float64')
+        self.missing = np.isnan(values)
+        with np.errstate(divide='ignore'):
+            self.log = np.log(prices.ffill().to_numpy(dtype='float64'))
+        # Log price of each asset's first bar, for assets that start after the baseline date
+        started = ~self.missing
+        first = np.where(started.any(axis=0), started.argmax(axis=0), 0)
+        self.first_log = self.log[first, np.arange(len(self.columns))]
+
+    def _columns(self, columns):
+        if columns is None:
+            return slice(None)
+        columns = list(columns)
+        cols = self.columns.get_indexer(columns)
+        if (cols < 0).any():
+            raise KeyError(f"{[c for c, i in zip(columns, cols) if i < 0]} not in index")
+        # A contiguous run of columns is a slice, so the log panel is read as a view
+        if len(cols) and (np.diff(cols) == 1).all():
+            return slice(cols[0], cols[-1] + 1)
+        return cols
+
+    def _rows(self, start, end):
+        lo = 0 if start is None else self.index.searchsorted(pd.Timestamp(start), side='left')
+        hi = len(self.index) if end is None else self.index.searchsorted(pd.Timestamp(end), side='right')
+        return slice(lo, hi)
+
+    def _baseline(self, at, cols):
+        row = self.index.searchsorted(pd.Timestamp(at), side='right') - 1
+        if row < 0:
+            return self.first_log[cols]
+        base = self.log[row, cols]
+        return np.where(np.isnan(base), self.first_log[cols], base)
+
+    def level(self, at, columns=None):
+        """Each asset's last price on or before `at`."""
+        cols = self._columns(columns)
+        return pd.Series(np.exp(self._baseline(at, cols)), index=self.columns[cols])
+
+    def rebase(self, at=None, columns=None, start=None, end=None, base=100.0, missing='keep', out=None):
+        """Prices from `start` to `end` indexed to `base` at `at`.
+
+        `at` defaults to the first row returned. `missing` decides what
+        happens to bars an asset did not trade:
+
+            'keep'   NaN, every row kept
+            'drop'   only rows where every asset traded
+            'ffill'  carried forward; rows before every asset has started,
+                     and rows where none of them traded, are dropped
+
+        `out` may be a preallocated float64 array of the result's shape to
+        compute the result in, so repeated re-baselining of a large panel
+        does not allocate one. Only all columns or a contiguous run of them
+        are read as a view: a scattered subset, or rows dropped by
+        `missing`, are gathered into a temporary copy first.
+        """
+        if missing not in MISSING:
+            raise ValueError(f"missing must be one of {MISSING}, not {missing!r}")
+        cols = self._columns(columns)
+        rows = self._rows(start, end)
+        log, gaps = self.log[rows, cols], self.missing[rows, cols]
+
+        if missing == 'drop':
+            keep = ~gaps.any(axis=1)
+        elif missing == 'ffill':
+            keep = ~gaps.all(axis=1) & ~np.isnan(log).any(axis=1)
+        else:
+            keep = None
+        if keep is not None and not keep.all():
+            log, gaps = log[keep], gaps[keep]
+        index = self.index[rows] if keep is None else self.index[rows][keep]
+
+        if at is None:
+            at = index[0] if len(index) else self.index[0]
+        values = np.subtract(log, self._baseline(at, cols), out=out)
+        np.exp(values, out=values)
+        values *= base
+        if missing == 'keep':
+            values[gaps] = np.nan
+        return pd.DataFrame(values, index=index, columns=self.columns[cols], copy=False)
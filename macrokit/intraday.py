@@ -0,0 +1,226 @@
+"""Minute and tick data from local files, stored in day partitions.
+
+Vendor exports (CSV or Parquet, any size) are ingested once into one
+Parquet file per ticker, interval and UTC day:
+
+    .cache/intraday/BTC-USD/1min/2026-02-12.parquet   time, open, high, low, close, volume
+    .cache/intraday/^GSPC/tick/2026-02-12.parquet     time, price, size
+
+Source files are streamed in chunks and re-ingesting overlapping files
+merges into the existing partitions (a later row for the same time wins).
+Column names are matched loosely (Timestamp, Datetime, Last, Qty, ...);
+times may be dates, strings or unix seconds/ms/us/ns and are stored as
+naive UTC.
+
+Reading a window opens only the partitions of the days it touches and only
+the requested column, one day at a time, so a week of 1-minute bars across
+six markets is a few MB however much history is stored. On days without
+bar partitions, bars are built on read from the day's ticks.
+
+    python -m macrokit.intraday BTC-USD btc_1min.csv [more.csv ...] [--interval tick]
+    python -m macrokit.intraday                      # list what is stored
+
+Parquet needs pyarrow.
+"""
+import datetime
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from macrokit import REPO_ROOT
+from macrokit.cache import read_local
+
+INTRADAY_DIR = os.environ.get('MACRO_INTRADAY_DIR', os.path.join(REPO_ROOT, '.cache', 'intraday'))
+
+BAR_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+TICK_COLUMNS = ('price', 'size')
+ALIASES = {
+    'timestamp': 'time', 'datetime': 'time', 'date': 'time', 'ts': 'time',
+    'o': 'open', 'h': 'high', 'l': 'low', 'c': 'close', 'v': 'volume', 'vol': 'volume',
+    'last': 'price', 'qty': 'size', 'quantity': 'size', 'amount': 'size',
+}
+# How each field is built from ticks: (tick column, resample aggregation)
+FROM_TICKS = {'open': ('price', 'first'), 'high': ('price', 'max'), 'low': ('price', 'min'),
+              'close': ('price', 'last'), 'volume': ('size', 'sum')}
+
+CHUNK_ROWS = 1_000_000
+
+
+def _directory(ticker, interval, root):
+    return os.path.join(root, ticker.replace('/', '_'), interval)
+
+
+def partitions(ticker, interval='1min', root=INTRADAY_DIR):
+    """Days stored for `ticker` at `interval`, sorted."""
+    paths = glob.glob(os.path.join(_directory(ticker, interval, root), '*.parquet'))
+    return sorted(datetime.date.fromisoformat(os.path.basename(p)[:-len('.parquet')]) for p in paths)
+
+
+def _read_source(path, chunk_rows):
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+
+
+def _times(column, tz):
+    if pd.api.types.is_numeric_dtype(column):
+        values = column.to_numpy(dtype='float64')
+        # Unix epoch in s, ms, us or ns, told apart by magnitude
+        scale = np.select([values < 1e11, values < 1e14, values < 1e17], [1e9, 1e6, 1e3], 1.0)
+        times = pd.to_datetime((values * scale).astype('int64'), utc=True)
+    else:
+        times = pd.to_datetime(column, errors='coerce')
+        if getattr(times.dt, 'tz', None) is None:
+            times = times.dt.tz_localize(tz)
+    return pd.DatetimeIndex(times).tz_convert('UTC').tz_localize(None)
+
+
+def _normalize(chunk, interval, tz):
+    chunk = chunk.rename(columns=lambda c: ALIASES.get(str(c).strip().lower(), str(c).strip().lower()))
+    if 'time' not in chunk:
+        raise ValueError(f"No time column among {list(chunk.columns)}")
+    wanted = TICK_COLUMNS if interval == 'tick' else BAR_COLUMNS
+    columns = {name: chunk[name].to_numpy(dtype='float64') for name in wanted if name in chunk}
+    if 'price' in wanted and 'price' not in columns:
+        raise ValueError("Tick data needs a price column")
+    if 'close' in wanted and 'close' not in columns:
+        raise ValueError("Bar data needs a close column")
+    frame = pd.DataFrame(columns)
+    frame.insert(0, 'time', _times(chunk['time'], tz))
+    return frame[frame['time'].notna()]
+
+
+def _write_day(directory, day, frames):
+    path = os.path.join(directory, f"{day:%Y-%m-%d}.parquet")
+    if os.path.exists(path):
+        frames = [pd.read_parquet(path)] + frames
+    frame = pd.concat(frames, ignore_index=True)
+    frame = frame.drop_duplicates('time', keep='last').sort_values('time', ignore_index=True)
+    tmp = f"{path}.tmp"
+    frame.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def ingest(path, ticker, interval='1min', tz='UTC', chunk_rows=CHUNK_ROWS, root=INTRADAY_DIR):
+    """Add a local CSV/Parquet file of bars (or ticks, with interval='tick') to the day partitions.
+
+    Naive times are taken to be in `tz`. Returns the number of rows read.
+    """
+    directory = _directory(ticker, interval, root)
+    os.makedirs(directory, exist_ok=True)
+    pending, pending_rows, rows = {}, 0, 0
+    for chunk in _read_source(path, chunk_rows):
+        frame = _normalize(chunk, interval, tz)
+        rows += len(frame)
+        for day, part in frame.groupby(frame['time'].dt.floor('D')):
+            pending.setdefault(day.date(), []).append(part)
+        pending_rows += len(frame)
+        # Keep the latest day buffered: the next chunk may continue it
+        if pending_rows >= chunk_rows and len(pending) > 1:
+            latest = max(pending)
+            for day in sorted(pending):
+                if day != latest:
+                    _write_day(directory, day, pending.pop(day))
+            pending_rows = sum(len(f) for f in pending[latest])
+    for day in sorted(pending):
+        _write_day(directory, day, pending[day])
+    return rows
+
+
+def _window_days(start, end):
+    return pd.date_range(start.floor('D'), (end - pd.Timedelta(1, 'ns')).floor('D'), freq='D').date
+
+
+def _read_day(directory, day, columns, start, end):
+    read = None if columns is None else ['time'] + list(columns)
+    frame = pd.read_parquet(os.path.join(directory, f"{day:%Y-%m-%d}.parquet"), columns=read)
+    frame = frame.set_index('time')
+    return frame.loc[(frame.index >= start) & (frame.index < end)]
+
+
+def iter_days(ticker, start, end, interval='1min', columns=None, root=INTRADAY_DIR):
+    """One stored day at a time of `ticker` in [start, end), indexed by time."""
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    directory = _directory(ticker, interval, root)
+    stored = set(partitions(ticker, interval, root))
+    for day in _window_days(start, end):
+        if day in stored:
+            yield _read_day(directory, day, columns, start, end)
+
+
+def load_series(ticker, start, end, interval='1min', field='close', root=INTRADAY_DIR):
+    """`field` of one ticker in [start, end): stored bars, or on days without them bars built from ticks.
+
+    Frozen with an article's input snapshot like its daily prices (see macrokit.snapshot).
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    frame = read_local(f"intraday-{interval}", ticker, start, end,
+                       lambda: _load_series(ticker, start, end, interval, field, root))
+    return None if frame is None or field not in frame else frame[field]
+
+
+def _load_series(ticker, start, end, interval, field, root):
+    bars, ticks = set(partitions(ticker, interval, root)), set(partitions(ticker, 'tick', root))
+    days = []
+    for day in _window_days(start, end):
+        if day in bars:
+            days.append(_read_day(_directory(ticker, interval, root), day, [field], start, end)[field])
+        elif day in ticks:
+            column, how = FROM_TICKS[field]
+            frame = _read_day(_directory(ticker, 'tick', root), day, [column], start, end)
+            days.append(frame[column].resample(interval).agg(how).dropna())
+    days = [day for day in days if not day.empty]
+    if not days:
+        return None
+    return pd.concat(days).rename(field).to_frame()
+
+
+def available(tickers, start, end, interval='1min', root=INTRADAY_DIR):
+    """Tickers with bars (or ticks) stored for any day of [start, end)."""
+    days = set(_window_days(pd.Timestamp(start), pd.Timestamp(end)))
+    return [t for t in tickers
+            if days & set(partitions(t, interval, root)) or days & set(partitions(t, 'tick', root))]
+
+
+def load_window(tickers, start, end, interval='1min', field='close', root=INTRADAY_DIR):
+    """Wide frame of `field` for `tickers` in [start, end) on the union of their timestamps.
+
+    Tickers without stored data are left out; columns keep the order of `tickers`.
+    """
+    columns = {}
+    for ticker in tickers:
+        series = load_series(ticker, start, end, interval, field, root)
+        if series is not None:
+            columns[ticker] = series
+    if not columns:
+        return pd.DataFrame(columns=list(tickers), dtype='float64')
+    data = pd.concat(columns, axis=1).sort_index()
+    data.index.name = 'Time'
+    return data
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ingest local intraday files into day partitions.")
+    parser.add_argument('ticker', nargs='?', help="Ticker the files belong to")
+    parser.add_argument('files', nargs='*', help="CSV or Parquet files")
+    parser.add_argument('--interval', default='1min', help="Bar interval of the files, or 'tick' (default 1min)")
+    parser.add_argument('--tz', default='UTC', help="Time zone of naive timestamps (default UTC)")
+    args = parser.parse_args()
+
+    if args.ticker and args.files:
+        for file in args.files:
+            print(f"{args.ticker} {args.interval}: {ingest(file, args.ticker, args.interval, args.tz):,} rows from {file}")
+    elif os.path.isdir(INTRADAY_DIR):
+        for ticker in sorted(os.listdir(INTRADAY_DIR)):
+            for interval in sorted(os.listdir(os.path.join(INTRADAY_DIR, ticker))):
+                days = partitions(ticker, interval)
+                if days:
+                    print(f"{ticker} {interval}: {len(days)} day(s), {days[0]} .. {days[-1]}")
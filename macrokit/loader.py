@@ -0,0 +1,67 @@
+"""Columnar price loader shared by every article script.
+
+Replaces the per-script "is it a MultiIndex, is 'Adj Close' in level 0 or
+level 1, fall back to 'Close'" juggling. Only the requested field is read
+from the cache for each ticker, and the per-ticker slices are assembled
+into the final wide frame in a single allocation.
+"""
+import pandas as pd
+
+from macrokit import cache, trace
+
+PRICE_FIELDS = ('Adj Close', 'Close')
+OHLC_FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+def _as_float64(data):
+    # The cache already stores float64, so this is normally a no-op
+    if all(dtype == 'float64' for dtype in data.dtypes):
+        return data
+    return data.astype('float64')
+
+
+def _pick_field(ticker, field, interval):
+    if field is not None:
+        return field
+    available = cache.cached_fields(ticker, interval)
+    return next((f for f in PRICE_FIELDS if f in available), 'Close')
+
+
+def load_prices(tickers, start=None, end=None, interval='1d', period=None, field=None):
+    """Wide float64 frame with a sorted DatetimeIndex and one column per ticker.
+
+    `field` defaults to 'Adj Close' where the provider supplies it and
+    'Close' otherwise. Tickers without data are left out; columns keep the
+    order of `tickers`.
+    """
+    if isinstance(tickers, str):
+        tickers = [tickers]
+    tickers = list(tickers)
+    start, end = cache.resolve_range(start, end, period)
+
+    with trace.span('load', ' '.join(tickers)):
+        cache.update(tickers, start, end, interval)
+
+        columns = {}
+        for ticker in tickers:
+            series = cache.read_field(ticker, _pick_field(ticker, field, interval), start, end, interval)
+            if series is not None and not series.empty:
+                columns[ticker] = series
+
+        if not columns:
+            return pd.DataFrame(columns=tickers, dtype='float64')
+        data = pd.concat(columns, axis=1)
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index()
+        data.index.name = 'Date'
+        return _as_float64(data)
+
+
+def load_ohlc(ticker, start=None, end=None, interval='1d', period=None, fields=OHLC_FIELDS):
+    """One ticker's bars with a column per field (Open, High, Low, Close, Volume)."""
+    start, end = cache.resolve_range(start, end, period)
+    with trace.span('load', ticker):
+        cache.update([ticker], start, end, interval)
+        data = cache.read(ticker, start, end, interval, fields=list(fields))
+        data.index.name = 'Date'
+        return _as_float64(data)
@@ -0,0 +1,143 @@
+"""Cross-script fetch planner.
+
+Every article script declares the market data it reads in a module-level
+DATA_NEEDS list, e.g.
+
+    DATA_NEEDS = [
+        {'tickers': ['BTC-USD', 'GLD'], 'start': '2025-07-01', 'end': '2026-02-14'},
+        {'tickers': ['SPY'], 'period': '10y'},
+    ]
+
+Entries may refer to earlier module-level literals such as `tickers`. The
+planner reads those declarations statically (scripts are not imported, some
+of them still do their work at import time), merges overlapping ranges
+per ticker, drops what is already cached and groups the rest into a handful
+of batched multi-ticker downloads.
+"""
+import ast
+import glob
+import os
+from collections import namedtuple
+
+import pandas as pd
+
+from macrokit import REPO_ROOT
+from macrokit import cache
+
+Need = namedtuple('Need', ['ticker', 'start', 'end', 'interval'])
+Batch = namedtuple('Batch', ['tickers', 'start', 'end', 'interval'])
+
+# Ranges closer than this are fetched as one request
+MERGE_GAP = pd.Timedelta(days=7)
+
+# Tickers whose missing ranges start/end within this window share a request
+BATCH_TOLERANCE = pd.Timedelta(days=31)
+
+MAX_BATCH_SIZE = 50
+
+
+def _literal(node, env):
+    # literal_eval that can also see earlier module-level literals (e.g. `tickers`)
+    if isinstance(node, ast.Name):
+        return env[node.id]
+    if isinstance(node, ast.List):
+        return [_literal(n, env) for n in node.elts]
+    if isinstance(node, ast.Dict):
+        return {_literal(k, env): _literal(v, env) for k, v in zip(node.keys, node.values)}
+    return ast.literal_eval(node)
+
+
+def read_declared_needs(path):
+    """Return the DATA_NEEDS declared in a script, or [] if it has none."""
+    with open(path) as f:
+        tree = ast.parse(f.read(), filename=path)
+    env = {}
+    for node in tree.body:
+        if not (isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)):
+            continue
+        name = node.targets[0].id
+        if name == 'DATA_NEEDS':
+            return _literal(node.value, env)
+        try:
+            env[name] = _literal(node.value, env)
+        except (ValueError, KeyError, TypeError, SyntaxError):
+            pass
+    return []
+
+
+def expand(declared):
+    """Turn DATA_NEEDS entries into one Need per ticker."""
+    needs = []
+    for entry in declared:
+        start, end = cache.resolve_range(entry.get('start'), entry.get('end'), entry.get('period'))
+        interval = entry.get('interval', '1d')
+        # 'tickers' may be a list or a {ticker: label} mapping
+        needs.extend(Need(t, start, end, interval) for t in entry['tickers'])
+    return needs
+
+
+def collect_needs(paths=None):
+    """Collect the needs of every registered chart generator in the repository."""
+    if paths is None:
+        paths = sorted(glob.glob(os.path.join(REPO_ROOT, '*', '*.py')))
+    needs = []
+    for path in paths:
+        needs.extend(expand(read_declared_needs(path)))
+    return needs
+
+
+def merge_needs(needs):
+    """Merge overlapping (or nearly adjacent) ranges per ticker and interval."""
+    by_key = {}
+    for need in needs:
+        by_key.setdefault((need.ticker, need.interval), []).append((need.start, need.end))
+
+    merged = []
+    for (ticker, interval), ranges in by_key.items():
+        ranges.sort()
+        lo, hi = ranges[0]
+        for start, end in ranges[1:]:
+            if start <= hi + MERGE_GAP:
+                hi = max(hi, end)
+            else:
+                merged.append(Need(ticker, lo, hi, interval))
+                lo, hi = start, end
+        merged.append(Need(ticker, lo, hi, interval))
+    return merged
+
+
+def plan_batches(needs):
+    """Return the smallest set of batched requests that brings `needs` into the cache."""
+    missing = []
+    for need in merge_needs(needs):
+        for start, end in cache.missing_ranges(need.ticker, need.start, need.end, need.interval):
+            missing.append(Need(need.ticker, start, end, need.interval))
+
+    # Greedy clustering: tickers with similar missing ranges share one request
+    batches = []
+    for need in sorted(missing, key=lambda n: (n.interval, n.start, n.end)):
+        for i, batch in enumerate(batches):
+            if (batch.interval == need.interval
+                    and len(batch.tickers) < MAX_BATCH_SIZE
+                    and need.ticker not in batch.tickers
+                    and abs(need.start - batch.start) <= BATCH_TOLERANCE
+                    and abs(need.end - batch.end) <= BATCH_TOLERANCE):
+                batches[i] = Batch(batch.tickers + [need.ticker], min(batch.start, need.start),
+                                   max(batch.end, need.end), batch.interval)
+                break
+        else:
+            batches.append(Batch([need.ticker], need.start, need.end, need.interval))
+    return batches
+
+
+def prefetch(paths=None):
+    """Fill the cache for every declared need across all article scripts."""
+    needs = collect_needs(paths)
+    batches = plan_batches(needs)
+    print(f"Planner: {len(needs)} ticker needs -> {len(batches)} batched request(s)")
+    cache.fetch_batches(batches)
+    return batches
+
+
+if __name__ == "__main__":
+    prefetch()
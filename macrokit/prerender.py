@@ -0,0 +1,181 @@
+"""Static prerender of an article's ARTICLE.md.
+
+The browser viewer (index.html + viewer.js) fetches ARTICLE.md and parses
+it with marked and mermaid on every page load. This module does the same
+work once at build time and writes article.html next to index.html:
+
+- the <article id="content"> of index.html is filled with the rendered
+  Markdown and marked data-prerendered, so viewer.js skips its fetch
+- file:///.../assets/ image paths are rewritten to assets/, as viewer.js does
+- images become <picture> elements with the AVIF and WebP srcsets from
+  macrokit.images, explicit dimensions and lazy loading
+- ```mermaid blocks become inline SVG through the mermaid CLI (mmdc) when
+  it is installed; otherwise they are left for the mermaid runtime, which
+  is then the only script the page still loads
+
+Markdown rendering needs the `markdown` package (pip install markdown).
+
+    python -m macrokit.prerender BitcoinConstant Debt
+"""
+import html
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from macrokit import REPO_ROOT
+from macrokit.images import FORMATS, MANIFEST_NAME, RESPONSIVE_DIR, has_viewer
+
+OUTPUT_NAME = 'article.html'
+
+MARKDOWN_EXTENSIONS = ['extra', 'sane_lists']
+
+LOCAL_ASSETS = re.compile(r'file:///.*?/assets/')
+MERMAID_BLOCK = re.compile(r'^```mermaid[ \t]*\n(.*?)^```[ \t]*$', re.MULTILINE | re.DOTALL)
+IMG_TAG = re.compile(r'<img\s+([^>]*?)\s*/?>')
+ATTRIBUTE = re.compile(r'(\w+)="([^"]*)"')
+CONTENT = re.compile(r'(<article id="content"[^>]*)>.*?(</article>)', re.DOTALL)
+LIBRARY_SCRIPT = re.compile(r'\s*<script src="[^"]*/(marked|mermaid)[^"]*"></script>')
+
+LIST_ITEM = re.compile(r'^\s*([-*+]|\d+[.)])\s')
+
+IMAGE_SIZES = '(max-width: 900px) 100vw, 900px'
+
+
+def _markdown(text):
+    try:
+        import markdown
+    except ImportError as exc:
+        raise ImportError("Prerendering articles requires the 'markdown' package (pip install markdown)") from exc
+    return markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS, output_format='html')
+
+
+def _gfm_lists(text):
+    """Blank line before a list that directly follows a paragraph line.
+
+    marked (GitHub-flavoured) lets a list interrupt a paragraph; Python-Markdown
+    does not, and the articles are written for the former.
+    """
+    lines, fenced = [], False
+    for line in text.split('\n'):
+        if line.lstrip().startswith('```'):
+            fenced = not fenced
+        elif (not fenced and LIST_ITEM.match(line) and lines and lines[-1].strip()
+                and not LIST_ITEM.match(lines[-1]) and not lines[-1].startswith((' ', '\t', '>'))):
+            lines.append('')
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def mermaid_svg(source):
+    """Render one diagram with the mermaid CLI; None when mmdc is not installed or fails."""
+    mmdc = shutil.which('mmdc')
+    if not mmdc:
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        src, out = os.path.join(tmp, 'diagram.mmd'), os.path.join(tmp, 'diagram.svg')
+        with open(src, 'w') as f:
+            f.write(source)
+        result = subprocess.run([mmdc, '-i', src, '-o', out, '-t', 'neutral', '-b', 'transparent'],
+                                capture_output=True)
+        if result.returncode != 0 or not os.path.exists(out):
+            return None
+        with open(out) as f:
+            svg = f.read()
+    # Inline SVG must not carry an XML prolog
+    return svg[svg.index('<svg'):]
+
+
+def _replace_mermaid(text):
+    """Swap mermaid blocks for HTML placeholders; returns (text, {placeholder: html}, all_rendered)."""
+    blocks, rendered = {}, True
+
+    def replace(match):
+        nonlocal rendered
+        source = match.group(1)
+        svg = mermaid_svg(source)
+        if svg is None:
+            rendered = False
+            svg = f'<pre class="mermaid">{html.escape(source)}</pre>'
+        key = f"MERMAIDBLOCK{len(blocks)}"
+        blocks[key] = f'<div class="mermaid-diagram">{svg}</div>'
+        # Blank lines keep the placeholder its own paragraph
+        return f"\n\n{key}\n\n"
+
+    return MERMAID_BLOCK.sub(replace, text), blocks, rendered
+
+
+def _responsive_images(body, manifest):
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        attrs = dict(ATTRIBUTE.findall(match.group(1)))
+        loading = 'eager' if count == 0 else 'lazy'
+        count += 1
+        src = attrs.get('src', '')
+        entry = manifest.get(src[len('assets/'):]) if src.startswith('assets/') else None
+
+        attrs.update(loading=loading, decoding='async')
+        if entry:
+            attrs.update(width=str(entry['width']), height=str(entry['height']))
+        img = '<img ' + ' '.join(f'{k}="{v}"' for k, v in attrs.items()) + '>'
+        if not entry:
+            return img
+        # Preferred format first; the browser takes the first <source> it supports
+        sources = []
+        for fmt in FORMATS:
+            if entry.get(fmt):
+                srcset = ', '.join(f"assets/{path} {width}w" for path, width in entry[fmt])
+                sources.append(f'<source type="image/{fmt}" srcset="{srcset}" sizes="{IMAGE_SIZES}">')
+        return f'<picture>{"".join(sources)}{img}</picture>'
+
+    return IMG_TAG.sub(replace, body)
+
+
+def render_article(article_dir):
+    """Rendered HTML of `article_dir`/ARTICLE.md and whether the mermaid runtime is still needed."""
+    with open(os.path.join(article_dir, 'ARTICLE.md')) as f:
+        text = LOCAL_ASSETS.sub('assets/', f.read())
+
+    text, diagrams, all_rendered = _replace_mermaid(text)
+    body = _markdown(_gfm_lists(text))
+    for key, diagram in diagrams.items():
+        body = body.replace(f"<p>{key}</p>", diagram).replace(key, diagram)
+
+    manifest_path = os.path.join(article_dir, 'assets', RESPONSIVE_DIR, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    return _responsive_images(body, manifest), bool(diagrams) and not all_rendered
+
+
+def prerender(article_dir):
+    """Write article.html next to index.html; returns its path."""
+    with open(os.path.join(article_dir, 'index.html')) as f:
+        page = f.read()
+    body, needs_mermaid = render_article(article_dir)
+
+    page = CONTENT.sub(lambda m: f'{m.group(1)} data-prerendered>\n{body}\n        {m.group(2)}', page, count=1)
+
+    def keep_script(match):
+        return match.group(0) if match.group(1) == 'mermaid' and needs_mermaid else ''
+
+    page = LIBRARY_SCRIPT.sub(keep_script, page)
+    path = os.path.join(article_dir, OUTPUT_NAME)
+    with open(path, 'w') as f:
+        f.write(page)
+    return path
+
+
+def viewer_articles(root=REPO_ROOT):
+    return [d for d in sorted(os.listdir(root)) if has_viewer(os.path.join(root, d))]
+
+
+if __name__ == "__main__":
+    for article in sys.argv[1:] or viewer_articles():
+        print(f"Prerendered {os.path.relpath(prerender(os.path.join(REPO_ROOT, article)), REPO_ROOT)}")
@@ -0,0 +1,186 @@
+"""Market data providers.
+
+A provider turns one (tickers, start, end, interval) request into a
+{ticker: DataFrame} mapping with one column per price field (Open, High,
+Low, Close, Volume, ...). Tickers without data, or that failed on their
+own, map to an empty frame; transport errors are raised. The fetcher
+retries both.
+"""
+import glob
+import logging
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from macrokit import REPO_ROOT
+
+
+def normalize_frame(df, ticker):
+    """Flatten a yfinance style frame to one column per field for `ticker`."""
+    # Flatten columns if MultiIndex (sometimes happens with yfinance)
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.xs(ticker, axis=1, level=1) if ticker in df.columns.get_level_values(1) else df.droplevel(1, axis=1)
+    # Intraday bars come back tz-aware; store everything as naive UTC
+    if isinstance(df.index, pd.DatetimeIndex) and df.index.tz is not None:
+        df.index = df.index.tz_convert('UTC').tz_localize(None)
+    df.columns.name = None
+    # Batched downloads align every ticker on the union calendar
+    return df.dropna(how='all')
+
+
+class Provider:
+    name = 'base'
+
+    def fetch(self, tickers, start, end, interval='1d'):
+        raise NotImplementedError
+
+
+class _ErrorLog(logging.Handler):
+    """Collects the failed-download messages yfinance logs instead of raising."""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class YahooProvider(Provider):
+    name = 'yahoo'
+
+    def fetch(self, tickers, start, end, interval='1d'):
+        import yfinance as yf
+        from yfinance import shared
+
+        log, logger = _ErrorLog(), logging.getLogger('yfinance')
+        logger.addHandler(log)
+        try:
+            df = yf.download(tickers, start=start, end=end, interval=interval, group_by='column', progress=False)
+        finally:
+            logger.removeHandler(log)
+        # Per-ticker failures: yfinance < 1.0 records them in shared._ERRORS, later versions only log them
+        recorded = getattr(shared, '_ERRORS', None) or {}
+        failed = {t for t in tickers if t in recorded or any(repr(t) in m for m in log.messages)}
+
+        if df is None or df.empty:
+            return {t: pd.DataFrame() for t in tickers}
+        present = set(df.columns.get_level_values(1)) if isinstance(df.columns, pd.MultiIndex) else {tickers[0]}
+        return {t: normalize_frame(df, t) if t in present and t not in failed else pd.DataFrame() for t in tickers}
+
+
+class FileProvider(Provider):
+    """Serves bars from local CSV files, one `<root>/<interval>/<ticker>.csv` per ticker.
+
+    Each file needs a date column first and one column per field. Used as a
+    stand-in for Yahoo in tests, benchmarks and offline rebuilds.
+    """
+    name = 'file'
+
+    def __init__(self, root):
+        self.root = root
+        self._frames = {}
+
+    def _load(self, ticker, interval):
+        key = (ticker, interval)
+        if key not in self._frames:
+            path = os.path.join(self.root, interval, f"{ticker}.csv")
+            if os.path.exists(path):
+                self._frames[key] = pd.read_csv(path, index_col=0, parse_dates=True).sort_index()
+            else:
+                self._frames[key] = pd.DataFrame()
+        return self._frames[key]
+
+    def fetch(self, tickers, start, end, interval='1d'):
+        result = {}
+        for ticker in tickers:
+            df = self._load(ticker, interval)
+            result[ticker] = df[(df.index >= start) & (df.index < end)] if not df.empty else df
+        return result
+
+    def tickers(self, interval='1d'):
+        return sorted(os.path.splitext(os.path.basename(p))[0]
+                      for p in glob.glob(os.path.join(self.root, interval, '*.csv')))
+
+
+class SyntheticProvider(Provider):
+    """Deterministic random-walk bars for any ticker, with no network or files.
+
+    Every (ticker, interval) gets its own seeded geometric random walk, so
+    the same request always returns the same bars. Daily and slower bars
+    are anchored at EPOCH, which keeps a date's bar identical whatever
+    range is asked for; intraday walks start at the first of the requested
+    month. Tickers ending in -USD trade every day, everything else on
+    business days. Used by the benchmarks (bench.py).
+    """
+    name = 'synthetic'
+
+    EPOCH = pd.Timestamp('2000-01-01')
+    DAILY_VOLATILITY = 0.02
+    # pandas frequency and length in days of every Yahoo interval
+    INTERVALS = {'1m': ('min', 1 / 1440), '2m': ('2min', 2 / 1440), '5m': ('5min', 5 / 1440),
+                 '15m': ('15min', 15 / 1440), '30m': ('30min', 30 / 1440), '60m': ('h', 1 / 24),
+                 '90m': ('90min', 1.5 / 24), '1h': ('h', 1 / 24), '1d': ('D', 1), '5d': ('5D', 5),
+                 '1wk': ('W-MON', 7), '1mo': ('MS', 30), '3mo': ('QS', 91)}
+
+    def __init__(self, seed=0):
+        self.seed = seed
+
+    def _bars(self, ticker, start, end, interval):
+        freq, days = self.INTERVALS[interval]
+        if days < 1:
+            anchor = start.to_period('M').to_timestamp()
+        else:
+            anchor = self.EPOCH
+            if freq == 'D' and not ticker.endswith('-USD'):
+                freq = 'B'
+        index = pd.date_range(anchor, end, freq=freq, inclusive='left')
+
+        rng = np.random.default_rng([zlib.crc32(f"{ticker}|{interval}".encode()), self.seed])
+        level = 10 ** rng.uniform(1, 4.5)
+        sigma = self.DAILY_VOLATILITY * np.sqrt(days)
+        n = len(index)
+
+        close = level * np.exp(np.cumsum(rng.normal(0.0002 * days, sigma, n)))
+        open_ = np.concatenate(([level], close[:-1])) * np.exp(rng.normal(0, sigma / 4, n))
+        wick = np.abs(rng.normal(0, sigma / 2, (2, n)))
+        frame = pd.DataFrame({
+            'Open': open_,
+            'High': np.maximum(open_, close) * np.exp(wick[0]),
+            'Low': np.minimum(open_, close) * np.exp(-wick[1]),
+            'Close': close,
+            'Volume': np.round(rng.lognormal(14, 0.5, n)),
+        }, index=index)
+        return frame.iloc[index.searchsorted(start):]
+
+    def fetch(self, tickers, start, end, interval='1d'):
+        return {t: self._bars(t, pd.Timestamp(start), pd.Timestamp(end), interval) for t in tickers}
+
+
+def _from_env():
+    # MACRO_PROVIDER=file:/path/to/bars swaps Yahoo for local files, =synthetic for generated bars
+    spec = os.environ.get('MACRO_PROVIDER', 'yahoo')
+    if spec.startswith('file:'):
+        return FileProvider(os.path.join(REPO_ROOT, spec[len('file:'):]))
+    if spec == 'synthetic':
+        return SyntheticProvider()
+    return YahooProvider()
+
+
+_provider = None
+
+
+def get_provider():
+    global _provider
+    if _provider is None:
+        _provider = _from_env()
+    return _provider
+
+
+def set_provider(provider):
+    """Install `provider` for every subsequent cache miss; returns the previous one."""
+    global _provider
+    previous, _provider = _provider, provider
+    return previous
@@ -0,0 +1,239 @@
+"""Bitcoin realized price from a local UTXO dump.
+
+The realized cap values every coin at the price of the day it last moved;
+divided by the supply it gives the realized price, the network's average
+cost basis. Both only change when an output is created (its value and
+cost basis enter) or spent (they leave), so the whole history reduces to
+two per-day delta arrays:
+
+    cap_delta[created]    += value * price_at_creation
+    cap_delta[spent]      -= value * price_at_creation
+    supply_delta[created] += value
+    supply_delta[spent]   -= value
+
+followed by one cumulative sum. The dump is streamed in chunks and each
+chunk is folded in with np.bincount, so memory is one chunk plus one float
+per day since the genesis block, however many rows the dump has.
+
+A dump is a CSV or Parquet file (or a directory of them) with one row per
+output:
+
+    created  creation date or unix timestamp
+    spent    spend date or timestamp, empty while unspent
+    value    amount in BTC
+    price    USD price at creation; without it outputs are valued at the
+             daily close in `prices` on their creation day (the last one
+             before it on days without a close). Outputs created before
+             the first price are left out of the cap and the supply
+             (RealizedCap.unpriced counts them), so pass the full history.
+
+Parquet needs pyarrow. Results are cached under .cache/realized/, keyed on
+the dump's files, sizes and modification times alone. Only the prices of
+days on which outputs were created enter the result, so a cached result
+records them and is reused until one of them changes: daily market data
+appended after the dump does not trigger a new pass over it.
+
+The result is frozen with an article's input snapshot (see macrokit.snapshot),
+so a snapshot build shows the realized price of the dump it was frozen with.
+"""
+import glob
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from macrokit import REPO_ROOT
+from macrokit.cache import now, read_local
+
+GENESIS = np.datetime64('2009-01-03', 'D')
+SECONDS_PER_DAY = 86400
+GENESIS_SECONDS = int(GENESIS.astype('datetime64[s]').astype('int64'))
+
+COLUMNS = ('created', 'spent', 'value', 'price')
+CHUNK_ROWS = 2_000_000
+
+UTXO_PATH = os.environ.get('MACRO_UTXO_PATH', os.path.join(REPO_ROOT, '.cache', 'utxo'))
+RESULT_DIR = os.path.join(REPO_ROOT, '.cache', 'realized')
+
+
+def _days(column):
+    """Days since GENESIS for dates or unix timestamps; -1 where missing."""
+    if pd.api.types.is_numeric_dtype(column):
+        seconds = column.to_numpy(dtype='float64')
+        missing = np.isnan(seconds)
+        days = (np.where(missing, 0, seconds) - GENESIS_SECONDS) // SECONDS_PER_DAY
+    else:
+        dates = pd.to_datetime(column, errors='coerce')
+        if getattr(dates.dt, 'tz', None) is not None:
+            dates = dates.dt.tz_convert('UTC').dt.tz_localize(None)
+        missing = dates.isna().to_numpy()
+        days = (dates.to_numpy(dtype='datetime64[D]') - GENESIS).astype('int64')
+    days = days.astype('int64')
+    days[missing] = -1
+    return days
+
+
+def dump_files(path=UTXO_PATH):
+    if os.path.isdir(path):
+        return sorted(p for p in glob.glob(os.path.join(path, '*'))
+                      if p.endswith(('.csv', '.csv.gz', '.parquet')))
+    return [path] if os.path.exists(path) else []
+
+
+def iter_chunks(path=UTXO_PATH, chunk_rows=CHUNK_ROWS):
+    """DataFrames of at most `chunk_rows` rows holding the dump's COLUMNS."""
+    for file in dump_files(path):
+        if file.endswith('.parquet'):
+            import pyarrow.parquet as pq
+
+            parquet = pq.ParquetFile(file)
+            columns = [c for c in COLUMNS if c in parquet.schema_arrow.names]
+            for batch in parquet.iter_batches(batch_size=chunk_rows, columns=columns):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(file, usecols=lambda c: c in COLUMNS, chunksize=chunk_rows)
+
+
+def _price_by_day(prices, days):
+    """Daily close for `days` days from GENESIS; NaN before the history starts."""
+    grid = pd.date_range(pd.Timestamp(GENESIS), periods=days, freq='D')
+    daily = prices.dropna().groupby(prices.dropna().index.normalize()).last()
+    return daily.reindex(grid).ffill().to_numpy(dtype='float64')
+
+
+class RealizedCap:
+    """Accumulates created/spent outputs into per-day realized cap and supply."""
+
+    def __init__(self, prices=None, until=None):
+        until = np.datetime64(until or now(), 'D')
+        days = max(int((until - GENESIS).astype('int64')) + 1, 1)
+        self.cap_delta = np.zeros(days)
+        self.supply_delta = np.zeros(days)
+        self.last_created = -1
+        # BTC created before the first of `prices`, left out instead of valued at a later price
+        self.unpriced = 0.0
+        self.price_by_day = None if prices is None else _price_by_day(prices, days)
+
+    def _fit(self, last_day):
+        if last_day >= len(self.cap_delta):
+            grow = last_day + 1 - len(self.cap_delta)
+            self.cap_delta = np.concatenate([self.cap_delta, np.zeros(grow)])
+            self.supply_delta = np.concatenate([self.supply_delta, np.zeros(grow)])
+            if self.price_by_day is not None:
+                self.price_by_day = np.concatenate([self.price_by_day, np.full(grow, self.price_by_day[-1])])
+
+    def update(self, created, spent, value, price=None):
+        """Fold in one chunk: day indices since GENESIS (spent -1 if unspent), BTC values, USD prices."""
+        created = np.asarray(created, dtype='int64')
+        spent = np.asarray(spent, dtype='int64')
+        value = np.asarray(value, dtype='float64')
+        keep = created >= 0
+        if not keep.all():
+            created, spent, value = created[keep], spent[keep], value[keep]
+            price = None if price is None else np.asarray(price)[keep]
+        if not len(created):
+            return
+        self._fit(int(max(created.max(), spent.max())))
+        self.last_created = max(self.last_created, int(created.max()))
+
+        if price is None:
+            if self.price_by_day is None:
+                raise ValueError("The dump has no 'price' column; pass daily `prices` to value outputs")
+            price = self.price_by_day[created]
+            priced = ~np.isnan(price)
+            if not priced.all():
+                self.unpriced += value[~priced].sum()
+                created, spent, value, price = created[priced], spent[priced], value[priced], price[priced]
+        cost = value * np.nan_to_num(np.asarray(price, dtype='float64'))
+
+        n = len(self.cap_delta)
+        self.cap_delta += np.bincount(created, weights=cost, minlength=n)
+        self.supply_delta += np.bincount(created, weights=value, minlength=n)
+        gone = spent >= 0
+        if gone.any():
+            self.cap_delta -= np.bincount(spent[gone], weights=cost[gone], minlength=n)
+            self.supply_delta -= np.bincount(spent[gone], weights=value[gone], minlength=n)
+
+    def update_frame(self, chunk):
+        price = chunk['price'].to_numpy(dtype='float64') if 'price' in chunk else None
+        spent = _days(chunk['spent']) if 'spent' in chunk else np.full(len(chunk), -1)
+        self.update(_days(chunk['created']), spent, chunk['value'], price)
+
+    def valuation(self):
+        """The daily prices outputs were valued at, up to the last creation day (None without `prices`)."""
+        return None if self.price_by_day is None else self.price_by_day[:self.last_created + 1].copy()
+
+    def result(self):
+        """Daily realized cap (USD), supply (BTC) and realized price, from the first output on."""
+        cap = np.cumsum(self.cap_delta)
+        supply = np.cumsum(self.supply_delta)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            price = np.where(supply > 0, cap / supply, np.nan)
+        index = pd.date_range(pd.Timestamp(GENESIS), periods=len(cap), freq='D')
+        frame = pd.DataFrame({'realized_cap': cap, 'supply': supply, 'realized_price': price}, index=index)
+        started = np.flatnonzero(supply > 0)
+        return frame.iloc[started[0]:] if len(started) else frame.iloc[:0]
+
+
+def _has_prices(files):
+    for file in files:
+        if file.endswith('.parquet'):
+            import pyarrow.parquet as pq
+
+            names = pq.ParquetFile(file).schema_arrow.names
+        else:
+            names = pd.read_csv(file, nrows=0).columns
+        if 'price' not in names:
+            return False
+    return True
+
+
+def _result_key(files):
+    # 'v2': entries hold the result and the prices it was valued at
+    digest = hashlib.sha256(b'v2')
+    for file in files:
+        stat = os.stat(file)
+        digest.update(f"{os.path.abspath(file)}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:32]
+
+
+def realized(path=UTXO_PATH, prices=None, chunk_rows=CHUNK_ROWS, use_cache=True):
+    """Daily realized cap, supply and price of the dump at `path`; None when there is no dump."""
+    return read_local('utxo', 'BTC', pd.Timestamp(GENESIS), now() + pd.Timedelta(days=1),
+                      lambda: _realized(path, prices, chunk_rows, use_cache))
+
+
+def _realized(path, prices, chunk_rows, use_cache):
+    files = dump_files(path)
+    if not files:
+        return None
+    if _has_prices(files):
+        # The dump values its own outputs; new market data must not invalidate the cache
+        prices = None
+    cached = os.path.join(RESULT_DIR, f"{_result_key(files)}.pkl")
+    if use_cache and os.path.exists(cached):
+        entry = pd.read_pickle(cached)
+        valued = entry['prices']
+        if valued is None or (prices is not None
+                              and np.array_equal(_price_by_day(prices, len(valued)), valued, equal_nan=True)):
+            return entry['result']
+
+    engine = RealizedCap(prices)
+    for chunk in iter_chunks(path, chunk_rows):
+        engine.update_frame(chunk)
+    if engine.unpriced:
+        print(f"Realized price: left out {engine.unpriced:,.2f} BTC created before the first price")
+    result = engine.result()
+
+    if use_cache:
+        os.makedirs(RESULT_DIR, exist_ok=True)
+        pd.to_pickle({'result': result, 'prices': engine.valuation()}, f"{cached}.tmp")
+        os.replace(f"{cached}.tmp", cached)
+    return result
+
+
+def realized_price(path=UTXO_PATH, prices=None):
+    """The realized price series alone, or None when there is no dump."""
+    result = realized(path, prices)
+    return None if result is None else result['realized_price']
@@ -0,0 +1,187 @@
+"""Chart rendering helpers.
+
+savefig() is the single place every chart writes its PNG, so it is also
+where the render profile applies: 'publish' (the default) writes the
+300-dpi assets, 'draft' writes quick low-dpi previews to assets/_draft/
+and 'bench' renders like 'publish' into assets/_bench/.
+run_charts()
+renders independent chart functions either one after another (the default)
+or on a process pool. The pool size is derived from a memory budget, since
+every 300-dpi figure is a large RGBA canvas: a 14x8in chart is 4200x2400
+pixels, ~40 MB before Agg's scratch buffers and PNG encoding.
+"""
+import multiprocessing
+import os
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib.pyplot as plt
+
+from macrokit import trace
+
+PUBLISH_DPI = 300
+
+# Largest figure in the repository (LiquidityRotation strength charts)
+LARGEST_FIGSIZE = (15, 10)
+
+# Canvas + Agg renderer buffers + PNG encoder, relative to one RGBA canvas
+CANVAS_OVERHEAD = 3.0
+
+# Private memory of a forked worker once pandas/matplotlib pages are touched
+WORKER_BASE_MB = 150
+
+MEMORY_BUDGET_MB = float(os.environ.get('MACRO_RENDER_MEMORY_MB', 2048))
+
+# dpi=None keeps whatever the chart asks for; subdir is relative to the chart's directory
+Profile = namedtuple('Profile', 'name dpi tight subdir rc')
+
+PROFILES = {
+    'publish': Profile('publish', None, True, None, {}),
+    'draft': Profile('draft', 72, False, '_draft', {
+        # Collapse near-collinear segments and split long paths into chunks
+        'path.simplify': True,
+        'path.simplify_threshold': 1.0,
+        'agg.path.chunksize': 10000,
+        'lines.antialiased': False,
+        'patch.antialiased': False,
+    }),
+    # Publish settings, written aside so benchmarks never touch the committed charts
+    'bench': Profile('bench', None, True, '_bench', {}),
+}
+
+_profile = PROFILES[os.environ.get('MACRO_RENDER_PROFILE', 'publish')]
+
+
+def profile():
+    return _profile
+
+
+def set_profile(name):
+    """Switch every later render in this process (and forked workers) to profile `name`."""
+    global _profile
+    if name not in PROFILES:
+        raise ValueError(f"Unknown render profile {name!r}; expected one of {sorted(PROFILES)}")
+    _profile = PROFILES[name]
+
+
+def output_dir(directory):
+    """Where the current profile writes charts destined for `directory`."""
+    return os.path.join(directory, _profile.subdir) if _profile.subdir else directory
+
+
+def canvas_bytes(figsize, dpi=PUBLISH_DPI):
+    width, height = figsize
+    return int(width * dpi) * int(height * dpi) * 4
+
+
+def worker_memory_mb(figsize=LARGEST_FIGSIZE, dpi=PUBLISH_DPI):
+    return WORKER_BASE_MB + canvas_bytes(figsize, dpi) * CANVAS_OVERHEAD / 2**20
+
+
+def worker_count(memory_budget_mb=None, figsize=LARGEST_FIGSIZE, dpi=PUBLISH_DPI):
+    """How many render workers fit in the memory budget (at least 1, at most one per core)."""
+    budget = MEMORY_BUDGET_MB if memory_budget_mb is None else memory_budget_mb
+    fits = int(budget // worker_memory_mb(figsize, dpi))
+    return max(1, min(os.cpu_count() or 1, fits))
+
+
+def tight_layout(fig=None, **kwargs):
+    """fig.tight_layout, skipped by profiles that trade layout polish for speed."""
+    if _profile.tight:
+        with trace.span('layout'):
+            (fig or plt.gcf()).tight_layout(**kwargs)
+
+
+def savefig(path, fig=None, **kwargs):
+    """plt.savefig under the current render profile.
+
+    PNG metadata is deterministic, so identical inputs give byte-identical
+    files. Returns the path actually written.
+    """
+    fig = fig or plt.gcf()
+    # Matplotlib stamps its version into the 'Software' chunk; drop it
+    kwargs.setdefault('metadata', {'Software': None})
+    if _profile.dpi:
+        kwargs['dpi'] = _profile.dpi
+    if not _profile.tight:
+        kwargs.pop('bbox_inches', None)
+
+    directory = output_dir(os.path.dirname(path))
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, os.path.basename(path))
+    with trace.span('save', os.path.basename(path)):
+        fig.savefig(path, **kwargs)
+    return path
+
+
+def _parallel_default():
+    return os.environ.get('MACRO_RENDER_PARALLEL', '0') not in ('', '0', 'false')
+
+
+def _as_job(job):
+    # A job is a chart function or a (function, args) tuple
+    return job if isinstance(job, tuple) else (job, ())
+
+
+def _call(job, label=None):
+    func, args = job
+    with trace.chart(label or func.__name__):
+        func(*args)
+
+
+def _call_traced(job, label):
+    # Forked workers start with a copy of the parent's events; send back only this chart's
+    trace.drain()
+    _call(job, label)
+    return trace.drain()
+
+
+def run_charts(jobs, parallel=None, memory_budget_mb=None, figsize=LARGEST_FIGSIZE, dpi=None,
+               on_done=None, labels=None):
+    """Render every job, on a process pool when `parallel` (or MACRO_RENDER_PARALLEL=1) is set.
+
+    Workers are forked so they inherit the parent's styles and imported
+    modules. `on_done(i)` is called in this process as job i succeeds. A
+    failing chart does not stop the others; failures are reported together
+    at the end. `labels` name the jobs in traces (default: function names).
+    """
+    jobs = [_as_job(job) for job in jobs]
+    labels = labels or [None] * len(jobs)
+    dpi = dpi or _profile.dpi or PUBLISH_DPI
+    parallel = _parallel_default() if parallel is None else parallel
+    workers = min(worker_count(memory_budget_mb, figsize, dpi), len(jobs)) if parallel else 1
+    on_done = on_done or (lambda i: None)
+    failures = []
+
+    if workers <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        for i, job in enumerate(jobs):
+            try:
+                _call(job, labels[i])
+            except Exception:
+                failures.append(job[0].__name__)
+                traceback.print_exc()
+                plt.close('all')
+            else:
+                on_done(i)
+    else:
+        print(f"Rendering {len(jobs)} charts on {workers} worker processes...")
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            worker = _call_traced if trace.enabled() else _call
+            futures = {pool.submit(worker, job, labels[i]): i for i, job in enumerate(jobs)}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    recorded = future.result()
+                    if recorded:
+                        trace.merge(recorded)
+                except Exception:
+                    failures.append(jobs[i][0].__name__)
+                    traceback.print_exc()
+                else:
+                    on_done(i)
+
+    if failures:
+        raise RuntimeError(f"Chart rendering failed for: {', '.join(failures)}")
@@ -0,0 +1,147 @@
+"""Content-addressed render cache.
+
+A chart's key hashes the data it is called with, the source of the chart
+function (plus the module-level helpers and constants it references), the
+source of the macrokit package it builds on, the active rcParams and the
+render profile. Keys are kept in a small manifest
+next to the PNGs; when a chart's key is unchanged and its PNG still exists,
+the render is skipped.
+"""
+import datetime
+import hashlib
+import inspect
+import json
+import os
+import types
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+from macrokit.render import profile
+
+MANIFEST_NAME = '.render_cache.json'
+
+ENABLED = os.environ.get('MACRO_RENDER_CACHE', '1') not in ('', '0', 'false')
+
+# rcParams that depend on how the build was launched, not on what is drawn
+VOLATILE_RCPARAMS = {'backend', 'backend_fallback', 'interactive', 'webagg.port', 'webagg.address'}
+
+# Charts call into the library (loaders, rebasing, styles, specs), so its source is part of every key
+LIBRARY_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_library_digests = {}
+
+
+def _hash_data(digest, value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest.update(repr(value.shape).encode())
+        digest.update(repr(list(value.columns) if isinstance(value, pd.DataFrame) else value.name).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.shape, value.dtype.str)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        digest.update(repr(value).encode())
+
+
+def _constant_repr(value, module, pending):
+    """repr of a constant with the functions inside it (chart-spec themes, formatters) named
+    instead of printed by address; same-module ones are queued so their source is hashed."""
+    if isinstance(value, types.FunctionType):
+        if value.__module__ == module:
+            pending.append(value)
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, dict):
+        items = (f"{_constant_repr(k, module, pending)}: {_constant_repr(v, module, pending)}" for k, v in value.items())
+        return '{' + ', '.join(items) + '}'
+    if isinstance(value, (tuple, list)):
+        items = ', '.join(_constant_repr(v, module, pending) for v in value)
+        return f"{type(value).__name__}({items})"
+    return repr(value)
+
+
+def _referenced_code(func):
+    """Source of `func` and of the same-module functions it calls, plus the plain constants it reads."""
+    module = func.__module__
+    seen, pending, parts = set(), [func], []
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        try:
+            parts.append(inspect.getsource(current))
+        except (OSError, TypeError):
+            parts.append(current.__qualname__)
+
+        codes = [current.__code__]
+        names = set()
+        while codes:
+            code = codes.pop()
+            names.update(code.co_names)
+            codes.extend(c for c in code.co_consts if isinstance(c, types.CodeType))
+
+        for name in sorted(names):
+            value = current.__globals__.get(name)
+            if isinstance(value, types.FunctionType) and value.__module__ == module:
+                pending.append(value)
+            elif isinstance(value, (str, int, float, tuple, list, dict, datetime.date)):
+                parts.append(f"{name}={_constant_repr(value, module, pending)}")
+    return parts
+
+
+def _library_digest(directory=None):
+    """Hash of every .py file of the macrokit package, recomputed only when one changes."""
+    directory = directory or LIBRARY_DIR
+    files = []
+    for root, dirs, names in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+        files.extend(os.path.join(root, n) for n in sorted(names) if n.endswith('.py'))
+    stamp = tuple((path, os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in files)
+    if _library_digests.get(directory, (None,))[0] != stamp:
+        digest = hashlib.sha256()
+        for path in files:
+            digest.update(os.path.relpath(path, directory).encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        _library_digests[directory] = (stamp, digest.hexdigest())
+    return _library_digests[directory][1]
+
+
+def chart_key(func, args=()):
+    """Hash of a chart's input data, code, active style and render profile."""
+    digest = hashlib.sha256()
+    digest.update(repr(profile()).encode())
+    for arg in args:
+        _hash_data(digest, arg)
+    for part in _referenced_code(func):
+        digest.update(part.encode())
+    digest.update(_library_digest().encode())
+    for name in sorted(set(matplotlib.rcParams) - VOLATILE_RCPARAMS):
+        digest.update(f"{name}={matplotlib.rcParams[name]!r}".encode())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """Manifest of chart name -> key for one assets/ directory."""
+
+    def __init__(self, assets_dir, enabled=None):
+        self.assets_dir = assets_dir
+        self.enabled = ENABLED if enabled is None else enabled
+        self.path = os.path.join(assets_dir, MANIFEST_NAME)
+        self.keys = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.keys = json.load(f)
+
+    def is_fresh(self, name, key):
+        png = os.path.join(self.assets_dir, f"{name}.png")
+        return self.enabled and self.keys.get(name) == key and os.path.exists(png)
+
+    def record(self, name, key):
+        self.keys[name] = key
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.keys, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
@@ -0,0 +1,223 @@
+"""Smart-Money-Concepts detection over whole OHLC arrays.
+
+Finds Fair Value Gaps and Order Blocks in both directions and when each
+zone was first mitigated (price traded back into it), without a Python
+loop over bars:
+
+    Bullish FVG   low[i+1] > high[i-1] on a bullish candle i; the gap is
+                  [high[i-1], low[i+1]]
+    Bullish OB    bearish candle i followed by a bullish candle i+1 and a
+                  close at i+2 above the open of i+1; the zone is
+                  [low[i], high[i]]
+
+Bearish patterns mirror these. A bullish zone is mitigated by the first
+later low at or below its top, a bearish zone by the first later high at
+or above its bottom.
+
+Many series (symbols, timeframes) are scanned in one pass by concatenating
+them; patterns and mitigation searches never cross a series boundary.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+Zones = namedtuple('Zones', 'fvgs order_blocks')
+
+# Bars per block for the first-crossing search; each query scans at most two blocks
+BLOCK = 64
+
+# Queries gathered per chunk in the first-crossing search (bounds scratch memory)
+QUERY_CHUNK = 1 << 16
+
+OHLC_AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'}
+
+
+def _sparse_min(values):
+    """table[k][j] = min(values[j : j + 2**k]), padded with +inf past the end."""
+    table = [values]
+    span = 1
+    while span < len(values):
+        prev = table[-1]
+        shifted = np.full_like(prev, np.inf)
+        shifted[:-span] = prev[span:]
+        table.append(np.minimum(prev, shifted))
+        span *= 2
+    return table
+
+
+def _first_in_block(blocks, block_ids, offsets, levels):
+    """First column >= offset in each gathered block row holding a value <= level (-1 if none)."""
+    rows = blocks[block_ids]
+    hit = rows <= levels[:, None]
+    hit &= np.arange(blocks.shape[1]) >= offsets[:, None]
+    found = hit.any(axis=1)
+    return np.where(found, hit.argmax(axis=1), -1)
+
+
+def first_at_or_below(values, starts, levels):
+    """For each query, the first index j >= start with values[j] <= level (len(values) if none).
+
+    Block minima plus a sparse table over them: each query scans the rest
+    of its own block, binary-lifts over whole blocks to the first one whose
+    minimum reaches the level, then scans that block.
+    """
+    values = np.asarray(values, dtype='float64')
+    starts = np.asarray(starts, dtype='int64')
+    levels = np.asarray(levels, dtype='float64')
+    n = len(values)
+    result = np.full(len(starts), n, dtype='int64')
+    if n == 0 or len(starts) == 0:
+        return result
+
+    n_blocks = -(-n // BLOCK)
+    padded = np.full(n_blocks * BLOCK, np.inf)
+    padded[:n] = np.where(np.isnan(values), np.inf, values)
+    blocks = padded.reshape(n_blocks, BLOCK)
+    table = _sparse_min(blocks.min(axis=1))
+
+    for lo in range(0, len(starts), QUERY_CHUNK):
+        s = starts[lo:lo + QUERY_CHUNK]
+        lvl = levels[lo:lo + QUERY_CHUNK]
+        out = np.full(len(s), n, dtype='int64')
+        live = s < n
+        s_live, lvl_live = s[live], lvl[live]
+
+        # 1. The remainder of the starting block
+        block = s_live // BLOCK
+        col = _first_in_block(blocks, block, s_live % BLOCK, lvl_live)
+        found = col >= 0
+        pos = np.where(found, block * BLOCK + col, n)
+
+        # 2. Binary-lift over whole blocks while their minimum stays above the level
+        todo = ~found
+        b, lt = block[todo] + 1, lvl_live[todo]
+        for k in range(len(table) - 1, -1, -1):
+            step = 1 << k
+            inside = b < n_blocks
+            skip = inside & (table[k][np.minimum(b, n_blocks - 1)] > lt)
+            b = np.where(skip, b + step, b)
+
+        # 3. The block that first reaches the level
+        reached = b < n_blocks
+        col = _first_in_block(blocks, b[reached], np.zeros(reached.sum(), dtype='int64'), lt[reached])
+        hit = np.full(len(b), n, dtype='int64')
+        hit[reached] = b[reached] * BLOCK + col
+        pos[todo] = hit
+
+        out[live] = np.minimum(pos, n)
+        result[lo:lo + QUERY_CHUNK] = out
+    return result
+
+
+def _mitigation(low, high, starts, ends, direction, top, bottom):
+    """Bar position of each zone's first mitigation, or -1 if still open at its series end."""
+    bullish = direction > 0
+    hit = np.empty(len(starts), dtype='int64')
+    # Bullish zones: first low <= top; bearish zones: first high >= bottom (negated to a <= search)
+    hit[bullish] = first_at_or_below(low, starts[bullish], top[bullish])
+    hit[~bullish] = first_at_or_below(-high, starts[~bullish], -bottom[~bullish])
+    return np.where(hit < ends, hit, -1)
+
+
+def _concat(series):
+    """Stack the OHLC columns of every series; returns arrays plus each bar's series id."""
+    arrays = {f: np.concatenate([df[f].to_numpy(dtype='float64') for df in series]) for f in OHLC_AGG}
+    lengths = np.array([len(df) for df in series], dtype='int64')
+    segment = np.repeat(np.arange(len(series)), lengths)
+    ends = np.cumsum(lengths)
+    return arrays, segment, ends, ends - lengths
+
+
+def _categorical(labels, codes):
+    categories = list(dict.fromkeys(labels))
+    lookup = np.array([categories.index(label) for label in labels], dtype='int64')
+    return pd.Categorical.from_codes(lookup[codes], categories=categories)
+
+
+def _table(keys, segment, offsets, bar, direction, top, bottom, mitigated, times):
+    seg = segment[bar]
+    mitigated_time = np.full(len(bar), np.datetime64('NaT'), dtype='datetime64[ns]')
+    done = mitigated >= 0
+    mitigated_time[done] = times[mitigated[done]]
+    return pd.DataFrame({
+        'symbol': _categorical([str(k[0]) for k in keys], seg),
+        'timeframe': _categorical([str(k[1]) for k in keys], seg),
+        'time': times[bar],
+        'bar': bar - offsets[seg],
+        'direction': direction.astype('int8'),
+        'top': top,
+        'bottom': bottom,
+        'mitigated_time': mitigated_time,
+        'mitigated': done,
+    })
+
+
+def _normalize(bars, timeframes):
+    """{(symbol, timeframe): OHLC frame} from a frame, {symbol: frame} or {(symbol, tf): frame}."""
+    if isinstance(bars, pd.DataFrame):
+        bars = {'': bars}
+    series = {}
+    for key, df in bars.items():
+        symbol, native = key if isinstance(key, tuple) else (key, '')
+        for rule in timeframes or [None]:
+            if rule is None:
+                series[(symbol, native)] = df
+            else:
+                series[(symbol, rule)] = df.resample(rule).agg(OHLC_AGG).dropna()
+    return series
+
+
+def detect(bars, timeframes=None):
+    """Fair Value Gaps and Order Blocks of every series in `bars`.
+
+    `bars` is one OHLC frame, {symbol: frame} or {(symbol, timeframe): frame};
+    `timeframes` optionally resamples every frame to each pandas rule
+    (e.g. ['1h', '4h', '1D']). Returns Zones(fvgs, order_blocks), two
+    tables with one row per zone: symbol, timeframe, time, bar (position
+    within its series), direction (+1/-1), top, bottom, mitigated_time and
+    mitigated.
+    """
+    series = _normalize(bars, timeframes)
+    keys = list(series)
+    frames = [series[k] for k in keys]
+    if not frames or not sum(len(df) for df in frames):
+        none = np.zeros(0, dtype='int64')
+        empty = _table(keys or [('', '')], none, none, none, none, np.zeros(0), np.zeros(0), none,
+                       np.zeros(0, dtype='datetime64[ns]'))
+        return Zones(empty, empty.copy())
+
+    data, segment, ends, offsets = _concat(frames)
+    o, h, l, c = data['Open'], data['High'], data['Low'], data['Close']
+    times = np.concatenate([df.index.to_numpy(dtype='datetime64[ns]') for df in frames])
+    n = len(c)
+    bull_candle, bear_candle = c > o, c < o
+
+    # Fair Value Gaps: candle i with neighbours i-1 and i+1 in the same series
+    i = np.arange(1, n - 1)
+    same = (segment[i - 1] == segment[i + 1])
+    up = same & (l[i + 1] > h[i - 1]) & bull_candle[i]
+    down = same & (h[i + 1] < l[i - 1]) & bear_candle[i]
+    bar = np.concatenate([i[up], i[down]])
+    direction = np.concatenate([np.ones(up.sum()), -np.ones(down.sum())])
+    top = np.concatenate([l[i[up] + 1], l[i[down] - 1]])
+    bottom = np.concatenate([h[i[up] - 1], h[i[down] + 1]])
+    order = np.argsort(bar, kind='stable')
+    bar, direction, top, bottom = bar[order], direction[order], top[order], bottom[order]
+    mitigated = _mitigation(l, h, bar + 2, ends[segment[bar]], direction, top, bottom)
+    fvgs = _table(keys, segment, offsets, bar, direction, top, bottom, mitigated, times)
+
+    # Order Blocks: opposite candle i, reversal candle i+1, confirmation close at i+2
+    i = np.arange(0, n - 2)
+    same = (segment[i] == segment[i + 2])
+    up = same & bear_candle[i] & bull_candle[i + 1] & (c[i + 2] > o[i + 1])
+    down = same & bull_candle[i] & bear_candle[i + 1] & (c[i + 2] < o[i + 1])
+    bar = np.concatenate([i[up], i[down]])
+    direction = np.concatenate([np.ones(up.sum()), -np.ones(down.sum())])
+    order = np.argsort(bar, kind='stable')
+    bar, direction = bar[order], direction[order]
+    top, bottom = h[bar], l[bar]
+    mitigated = _mitigation(l, h, bar + 3, ends[segment[bar]], direction, top, bottom)
+    order_blocks = _table(keys, segment, offsets, bar, direction, top, bottom, mitigated, times)
+
+    return Zones(fvgs, order_blocks)
@@ -0,0 +1,285 @@
+"""Versioned, memory-mapped input snapshots per article.
+
+Freezing an article (build.py --freeze) builds it normally while recording
+every (ticker, field, interval, range) its scripts read from the cache, then
+writes exactly that panel to a new version:
+
+    <article>/snapshots/v003/1d.arrow   one Arrow IPC file per bar interval
+    <article>/snapshots/v003/meta.json  frozen_at, ranges and file digests
+
+Each .arrow file is a single record batch with a sorted 'time' column and
+one float64 column per 'TICKER|Field'; bars a ticker does not have are
+nulls (a NaN in the data stays NaN). A freeze that reads exactly what the
+latest version already holds does not create a new one.
+
+Local inputs that are not market data (the UTXO dump behind the realized
+price, intraday bars) are read through macrokit.cache.read_local and frozen
+the same way: their frames become columns of a table named after the source
+('utxo.arrow', 'intraday-1min.arrow').
+
+Building from a snapshot (build.py --snapshot [VERSION], or
+MACRO_SNAPSHOT=latest|v003 for a single script) serves every read from it
+instead of the cache: nothing is fetched, and the build clock
+(macrokit.cache.now) is pinned to the instant of the freeze, so 'period'
+windows and "up to today" ranges resolve as they did then. Files are
+memory-mapped; a read binary-searches the time column and materializes only
+that column's slice, so a large universe is never loaded as a whole.
+
+Snapshots need pyarrow.
+"""
+import contextlib
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from macrokit import cache
+
+SNAPSHOT_DIR = 'snapshots'
+META_NAME = 'meta.json'
+VERSION = re.compile(r'^v(\d+)$')
+
+# None (live data), 'latest' or a version name such as 'v003'
+_selected = os.environ.get('MACRO_SNAPSHOT') or None
+_freezing = False
+_session = None
+
+
+def select(version='latest', freeze=False):
+    """Serve later builds from snapshot `version` (None for live data), or record new ones when `freeze`."""
+    global _selected, _freezing
+    _selected, _freezing = version, freeze
+
+
+def versions(article_dir):
+    root = os.path.join(article_dir, SNAPSHOT_DIR)
+    if not os.path.isdir(root):
+        return []
+    found = [d for d in os.listdir(root) if VERSION.match(d) and os.path.exists(os.path.join(root, d, META_NAME))]
+    return sorted(found, key=lambda d: int(VERSION.match(d).group(1)))
+
+
+def resolve(article_dir, version='latest'):
+    """Directory of `version` ('latest' for the newest) or None when the article has none."""
+    available = versions(article_dir)
+    if not available:
+        return None
+    if version == 'latest':
+        version = available[-1]
+    if version not in available:
+        raise ValueError(f"{os.path.basename(article_dir)} has no snapshot {version!r}; available: {available}")
+    return os.path.join(article_dir, SNAPSHOT_DIR, version)
+
+
+def _key(ticker, field):
+    return f"{ticker}|{field}"
+
+
+class Snapshot:
+    """Read-only stand-in for the cache, backed by memory-mapped Arrow files."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, META_NAME)) as f:
+            self.meta = json.load(f)
+        self.frozen_at = pd.Timestamp(self.meta['frozen_at'])
+        self._tables = {}
+
+    def _table(self, interval):
+        if interval not in self._tables:
+            path = os.path.join(self.directory, f"{interval}.arrow")
+            if not os.path.exists(path):
+                self._tables[interval] = None
+            else:
+                import pyarrow as pa
+
+                table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+                # Zero-copy view of the sorted time column
+                times = table.column('time').chunk(0).to_numpy()
+                self._tables[interval] = (table, times)
+        return self._tables[interval]
+
+    def fields(self, ticker, interval='1d'):
+        prefix = f"{ticker}|"
+        return sorted(k[len(prefix):] for k in self.meta['ranges'].get(interval, {}) if k.startswith(prefix))
+
+    def read_field(self, ticker, field, start, end, interval='1d'):
+        loaded = self._table(interval)
+        key = _key(ticker, field)
+        if loaded is None or key not in loaded[0].column_names:
+            return None
+        table, times = loaded
+        lo = times.searchsorted(np.datetime64(pd.Timestamp(start), 'ns'))
+        hi = times.searchsorted(np.datetime64(pd.Timestamp(end), 'ns'))
+        column = table.column(key).chunk(0).slice(lo, hi - lo)
+        present = column.is_valid().to_numpy(zero_copy_only=False)
+        values = column.to_numpy(zero_copy_only=False)
+        return pd.Series(values[present], index=pd.DatetimeIndex(times[lo:hi][present]), name=field)
+
+    def read_local(self, source, key, start, end):
+        """The frame macrokit.cache.read_local froze for `key`, or None when it read nothing."""
+        columns = {field: self.read_field(key, field, start, end, source) for field in self.fields(key, source)}
+        columns = {field: series for field, series in columns.items() if series is not None}
+        return pd.DataFrame(columns) if columns else None
+
+
+class Recorder:
+    """Union of the cache ranges read per (interval, ticker, field), and the local inputs read."""
+
+    def __init__(self):
+        self.ranges = {}
+        self.local = {}
+
+    def add(self, ticker, field, start, end, interval='1d'):
+        key = (interval, ticker, field)
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        if key in self.ranges:
+            old_start, old_end = self.ranges[key]
+            start, end = min(start, old_start), max(end, old_end)
+        self.ranges[key] = (start, end)
+
+    def add_local(self, source, key, frame, start, end):
+        """Keep what macrokit.cache.read_local loaded: it cannot be read back from the cache."""
+        for field in frame.columns:
+            entry = (source, key, field)
+            series = frame[field].astype('float64')
+            if entry in self.local:
+                series = pd.concat([self.local[entry], series])
+                series = series[~series.index.duplicated(keep='last')].sort_index()
+            self.local[entry] = series
+            self.add(key, field, start, end, source)
+
+
+def _write_interval(path, columns):
+    import pyarrow as pa
+
+    times = pd.DatetimeIndex(sorted(set().union(*(s.index for s in columns.values()))))
+    arrays = [pa.array(times.to_numpy(dtype='datetime64[ns]'), type=pa.timestamp('ns'))]
+    names = ['time']
+    for key in sorted(columns):
+        series = columns[key]
+        positions = times.get_indexer(series.index)
+        values = np.full(len(times), np.nan)
+        values[positions] = series.to_numpy(dtype='float64')
+        absent = np.ones(len(times), dtype=bool)
+        absent[positions] = False
+        arrays.append(pa.array(values, mask=absent, type=pa.float64()))
+        names.append(key)
+    batch = pa.record_batch(arrays, names=names)
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+
+
+def _digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def freeze(article_dir, recorder, frozen_at):
+    """Write what `recorder` saw as the article's next snapshot version; returns its directory.
+
+    Returns the latest existing version instead when it already holds exactly these reads.
+    """
+    by_interval = {}
+    for (interval, ticker, field), (start, end) in recorder.ranges.items():
+        series = recorder.local.get((interval, ticker, field))
+        if series is None:
+            series = cache.read_field(ticker, field, start, end, interval)
+        if series is not None and not series.empty:
+            series = series[~series.index.duplicated(keep='last')]
+            by_interval.setdefault(interval, {})[_key(ticker, field)] = series
+
+    digest = hashlib.sha256()
+    for interval in sorted(by_interval):
+        for key in sorted(by_interval[interval]):
+            series = by_interval[interval][key]
+            digest.update(f"{interval}|{key}".encode())
+            digest.update(series.index.asi8.tobytes() + series.to_numpy(dtype='float64').tobytes())
+    content = digest.hexdigest()
+
+    latest = resolve(article_dir)
+    if latest:
+        with open(os.path.join(latest, META_NAME)) as f:
+            if json.load(f).get('content') == content:
+                return latest
+
+    number = int(VERSION.match(versions(article_dir)[-1]).group(1)) + 1 if latest else 1
+    directory = os.path.join(article_dir, SNAPSHOT_DIR, f"v{number:03d}")
+    os.makedirs(directory)
+    files = {}
+    for interval, columns in by_interval.items():
+        path = os.path.join(directory, f"{interval}.arrow")
+        _write_interval(path, columns)
+        files[f"{interval}.arrow"] = _digest(path)
+
+    meta = {
+        'frozen_at': frozen_at.isoformat(),
+        'content': content,
+        'files': files,
+        'ranges': {interval: {_key(t, f): [s.isoformat(), e.isoformat()]
+                              for (i, t, f), (s, e) in sorted(recorder.ranges.items()) if i == interval}
+                   for interval in sorted(by_interval)},
+    }
+    with open(os.path.join(directory, META_NAME), 'w') as f:
+        json.dump(meta, f, indent=2, sort_keys=True)
+    return directory
+
+
+def verify(directory):
+    """Names of the snapshot's files whose content no longer matches meta.json."""
+    with open(os.path.join(directory, META_NAME)) as f:
+        files = json.load(f)['files']
+    return [name for name, digest in files.items() if _digest(os.path.join(directory, name)) != digest]
+
+
+@contextlib.contextmanager
+def session(article_dir):
+    """Build `article_dir` from its selected snapshot, or record a new one when freezing.
+
+    Nested sessions (build.py wraps an article, articles.build each of its
+    scripts) reuse the outer one.
+    """
+    global _session
+    if _session is not None or not (_selected or _freezing):
+        yield
+        return
+
+    name = os.path.basename(os.path.abspath(article_dir))
+    _session = article_dir
+    try:
+        if _freezing:
+            recorder, frozen_at = Recorder(), cache.now()
+            with cache.override(recorder=recorder, now=frozen_at):
+                yield
+            directory = freeze(article_dir, recorder, frozen_at)
+            print(f"{name}: input snapshot {os.path.basename(directory)}")
+            return
+
+        directory = resolve(article_dir, _selected)
+        if directory is None:
+            print(f"{name}: no snapshot, using live data")
+            yield
+            return
+        snapshot = Snapshot(directory)
+        print(f"{name}: building from snapshot {os.path.basename(directory)} "
+              f"(frozen {snapshot.frozen_at:%Y-%m-%d %H:%M})")
+        with cache.override(snapshot=snapshot, now=snapshot.frozen_at):
+            yield
+    finally:
+        _session = None
+
+
+if __name__ == "__main__":
+    import sys
+
+    from macrokit import REPO_ROOT
+
+    # python -m macrokit.snapshot [ARTICLE ...]: list versions and check their files
+    for article in sys.argv[1:] or sorted(os.listdir(REPO_ROOT)):
+        article_dir = os.path.join(REPO_ROOT, article)
+        for version in versions(article_dir):
+            broken = verify(os.path.join(article_dir, SNAPSHOT_DIR, version))
+            print(f"{article} {version}: {'MODIFIED ' + ', '.join(broken) if broken else 'ok'}")
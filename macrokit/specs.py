@@ -0,0 +1,231 @@
+"""Declarative specs for the static-data charts, rendered on pooled figures.
+
+Most charts that plot a handful of researched numbers follow one recipe:
+a figure, bars or lines, value labels, a title, axis labels, maybe an
+annotation, save, close. A ChartSpec states that recipe as data:
+
+    ASSET_GAP = ChartSpec(
+        'asset_gap', (10, 6),
+        [Layer('bar', ['Foreign-held', 'US-held'], [68.9, 41.0], color=['#1a2a6c', '#4b6584'],
+               style={'width': 0.6}, value_labels=ValueLabels('${}T', 1))],
+        title='A $28 Trillion Imbalance', ylabel='Amount (Trillion USD)', ylim=(0, 80))
+
+    render_spec(ASSET_GAP, ASSETS_DIR)   # -> assets/asset_gap.png
+
+Layers are drawn in order; string x values (y for 'barh') are categories
+placed at 0, 1, 2, ... and labelled on the axis, so grouped bars are layers
+with an `offset`. A `theme(ax)` callable styles the axes once.
+
+render_spec() draws on a figure from a small pool keyed by size, theme,
+grid and the active rcParams. The first spec of a kind creates the figure
+and applies the theme; later ones only remove the previous data artists
+(lines, patches, collections, texts, legend) and reset what a spec may
+set, so figure and axes creation, theme setup and the Agg renderer are
+reused. Pooled figures live outside pyplot and are never closed.
+"""
+import hashlib
+import os
+from collections import OrderedDict, namedtuple
+
+import matplotlib
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle
+from matplotlib.ticker import AutoLocator, ScalarFormatter
+
+from macrokit.render import PUBLISH_DPI, savefig, tight_layout
+
+# kind: 'bar', 'barh', 'line', 'fill' (style 'y2', default 0) or 'pie' (style 'hole' for a donut)
+Layer = namedtuple('Layer', 'kind x y label color style offset value_labels',
+                   defaults=(None, None, None, 0.0, None))
+
+# fmt: str.format pattern for the bar's value, or a callable value -> str
+ValueLabels = namedtuple('ValueLabels', 'fmt offset style', defaults=(0, None))
+
+Annotation = namedtuple('Annotation', 'text xy xytext style', defaults=(None, None))
+
+ChartSpec = namedtuple('ChartSpec', [
+    'name', 'figsize', 'layers',
+    'title', 'xlabel', 'ylabel', 'xlim', 'ylim', 'legend', 'annotations',
+    'theme', 'grid', 'invert_y', 'yformatter',  # yformatter: callable (value, pos) -> str
+    'title_style', 'label_style', 'tick_style', 'save',
+], defaults=(None, None, None, None, None, None, (), None, None, False, None, None, None, None, None))
+
+# Every pooled 300-dpi figure keeps its Agg canvas (~40 MB) for reuse
+MAX_FIGURES = 4
+
+SUBPLOT_SIDES = ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')
+
+
+def _rc_digest():
+    return hashlib.sha1(repr(sorted(matplotlib.rcParams.items())).encode()).hexdigest()
+
+
+def _frozen(style):
+    return tuple(sorted((style or {}).items()))
+
+
+def _is_categorical(values):
+    return values is not None and len(values) > 0 and isinstance(values[0], str)
+
+
+class FigurePool:
+    """Figures and axes reused between specs of the same size, theme and style."""
+
+    def __init__(self, size=MAX_FIGURES):
+        self.size = size
+        self._entries = OrderedDict()
+
+    def _key(self, spec):
+        pie = any(layer.kind == 'pie' for layer in spec.layers)
+        return tuple(spec.figsize), spec.theme, _frozen(spec.grid), pie, _rc_digest()
+
+    def axes(self, spec):
+        """Cleared axes for `spec`, creating (and theming) a figure on first use."""
+        key = self._key(spec)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            ax, pristine = self._entries[key]
+            _clear(ax, pristine)
+            return ax
+
+        fig = Figure(figsize=spec.figsize)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        if spec.theme is not None:
+            spec.theme(ax)
+        texts = (ax.title, ax.xaxis.label, ax.yaxis.label)
+        pristine = [(t, {'fontsize': t.get_fontsize(), 'fontweight': t.get_fontweight(),
+                         'fontstyle': t.get_fontstyle(), 'color': t.get_color()}) for t in texts]
+        self._entries[key] = (ax, pristine)
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+        return ax
+
+
+def _clear(ax, pristine):
+    """Remove the data artists and undo what a spec may have set; the theme stays."""
+    for artist in [*ax.lines, *ax.patches, *ax.collections, *ax.texts, *ax.images, *ax.artists, *ax.tables]:
+        artist.remove()
+    ax.containers.clear()
+    if ax.get_legend() is not None:
+        ax.get_legend().remove()
+    for text, props in pristine:
+        text.set_text('')
+        text.update(props)
+    for axis in (ax.xaxis, ax.yaxis):
+        axis.reset_ticks()
+        axis.set_major_locator(AutoLocator())
+        axis.set_major_formatter(ScalarFormatter())
+    if ax.yaxis_inverted():
+        ax.invert_yaxis()
+    ax.set_autoscale_on(True)
+    ax.relim()
+    # tight_layout starts from the current position; start where a new figure would
+    ax.figure.subplots_adjust(**{side: matplotlib.rcParams[f'figure.subplot.{side}'] for side in SUBPLOT_SIDES})
+
+
+def _value_labels(ax, kind, bars, labels):
+    fmt, style = labels.fmt, labels.style or {}
+    for bar in bars:
+        if kind == 'barh':
+            value = bar.get_width()
+            xy = (value + labels.offset, bar.get_y() + bar.get_height() / 2)
+            defaults = {'va': 'center'}
+        else:
+            value = bar.get_height()
+            xy = (bar.get_x() + bar.get_width() / 2, value + labels.offset)
+            defaults = {'ha': 'center', 'va': 'bottom'}
+        ax.text(*xy, fmt(value) if callable(fmt) else fmt.format(value), **{**defaults, **style})
+
+
+def _draw_layer(ax, layer):
+    """Draw one layer; returns its category labels (or None) and the axis they belong to."""
+    style = dict(layer.style or {})
+    extra = {} if layer.label is None else {'label': layer.label}
+
+    if layer.kind == 'pie':
+        hole = style.pop('hole', None)
+        ax.pie(layer.y, labels=layer.x, colors=layer.color, **style)
+        if hole:
+            ax.add_artist(Circle((0, 0), hole, fc='white'))
+        return None, None
+
+    categories, axis = None, 'y' if layer.kind == 'barh' else 'x'
+    x = layer.x
+    if _is_categorical(x):
+        categories, x = list(x), np.arange(len(x))
+    if layer.offset:
+        x = np.asarray(x, dtype=float) + layer.offset
+
+    if layer.kind == 'bar':
+        bars = ax.bar(x, layer.y, color=layer.color, **extra, **style)
+    elif layer.kind == 'barh':
+        bars = ax.barh(x, layer.y, color=layer.color, **extra, **style)
+    elif layer.kind == 'line':
+        ax.plot(x, layer.y, color=layer.color, **extra, **style)
+        bars = None
+    elif layer.kind == 'fill':
+        ax.fill_between(x, layer.y, style.pop('y2', 0), color=layer.color, **extra, **style)
+        bars = None
+    else:
+        raise ValueError(f"Unknown layer kind {layer.kind!r}")
+
+    if layer.value_labels is not None:
+        if bars is None:
+            raise ValueError(f"Value labels need a 'bar' or 'barh' layer, not {layer.kind!r}")
+        _value_labels(ax, layer.kind, bars, layer.value_labels)
+    return categories, axis
+
+
+def draw(ax, spec):
+    """Draw `spec` onto `ax` (pooled or not)."""
+    ticks = {}
+    for layer in spec.layers:
+        categories, axis = _draw_layer(ax, layer)
+        if categories is not None:
+            ticks[axis] = categories
+    tick_style = spec.tick_style or {}
+    if 'x' in ticks:
+        ax.set_xticks(np.arange(len(ticks['x'])), ticks['x'], **tick_style)
+    if 'y' in ticks:
+        ax.set_yticks(np.arange(len(ticks['y'])), ticks['y'], **tick_style)
+
+    label_style = spec.label_style or {}
+    if spec.title:
+        ax.set_title(spec.title, **(spec.title_style or {}))
+    if spec.xlabel:
+        ax.set_xlabel(spec.xlabel, **label_style)
+    if spec.ylabel:
+        ax.set_ylabel(spec.ylabel, **label_style)
+    if spec.xlim is not None:
+        ax.set_xlim(*spec.xlim)
+    if spec.ylim is not None:
+        ax.set_ylim(*spec.ylim)
+    if spec.invert_y:
+        ax.invert_yaxis()
+    if spec.yformatter is not None:
+        ax.yaxis.set_major_formatter(spec.yformatter)
+    if spec.grid is not None:
+        ax.grid(**spec.grid)
+    if spec.legend is not None:
+        ax.legend(**spec.legend)
+    for note in spec.annotations:
+        kwargs = dict(note.style or {})
+        if note.xytext is not None:
+            kwargs['xytext'] = note.xytext
+        ax.annotate(note.text, xy=note.xy, **kwargs)
+
+
+POOL = FigurePool()
+
+
+def render_spec(spec, directory, pool=POOL):
+    """Draw `spec` on a pooled figure and save it as `directory`/<name>.png; returns the path."""
+    ax = pool.axes(spec)
+    draw(ax, spec)
+    tight_layout(ax.figure)
+    path = os.path.join(directory, f"{spec.name}.png")
+    savefig(path, ax.figure, **{'dpi': PUBLISH_DPI, **(spec.save or {})})
+    return path
@@ -0,0 +1,161 @@
+"""Stage timing for the chart pipeline, as a Chrome trace and a per-chart table.
+
+The pipeline is instrumented with spans:
+
+    download   provider requests filling the cache (cache.fetch_batches)
+    load       reading and normalizing cached bars (cache.download, macrokit.loader)
+    transform  a script's load_data()
+    layout     tight_layout()
+    save       savefig(): Agg drawing plus PNG encoding
+
+Each chart runs inside a chart span; its time outside every stage (the
+chart's own pandas work and plotting calls) is reported as 'own'.
+
+Tracing is off unless MACRO_TRACE=<path> is set or build.py gets --trace.
+Disabled, span() returns one shared no-op context manager, so an
+instrumented call costs a global lookup and a function call. Enabled,
+every span becomes a Chrome "complete" event; the timeline is written at
+exit (open it in chrome://tracing or ui.perfetto.dev) and the summary
+table is printed. Stage times are exclusive, so a load span that triggers
+a download is not counted twice.
+"""
+import atexit
+import contextlib
+import json
+import os
+import threading
+import time
+
+STAGES = ('download', 'load', 'transform', 'layout', 'save')
+COLUMNS = STAGES + ('own',)
+
+DEFAULT_PATH = os.path.join('.trace', 'build.json')
+
+_NULL = contextlib.nullcontext()
+
+_enabled = False
+_path = None
+_events = []
+_summary = {}  # chart -> {column: seconds, 'total': seconds}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def enabled():
+    return _enabled
+
+
+def enable(path=DEFAULT_PATH):
+    """Start recording; the timeline goes to `path` when the process exits."""
+    global _enabled, _path
+    if not _enabled:
+        atexit.register(finish)
+    _enabled, _path = True, path
+
+
+class _Span:
+    __slots__ = ('stage', 'name', 'chart', 'start', 'children', 'previous')
+
+    def __init__(self, stage, name, chart=None):
+        self.stage, self.name, self.chart = stage, name, chart
+
+    def __enter__(self):
+        stack = _local.__dict__.setdefault('stack', [])
+        stack.append(self)
+        if self.chart is not None:
+            self.previous = getattr(_local, 'chart', None)
+            _local.chart = self.chart
+        self.children = 0
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        duration = end - self.start
+        stack = _local.stack
+        stack.pop()
+        if stack:
+            stack[-1].children += duration
+
+        chart = getattr(_local, 'chart', None)
+        event = {'name': self.name or self.stage, 'cat': self.stage, 'ph': 'X',
+                 'ts': self.start / 1000, 'dur': duration / 1000,
+                 'pid': os.getpid(), 'tid': threading.get_ident()}
+        if chart is not None:
+            event['args'] = {'chart': chart}
+        with _lock:
+            _events.append(event)
+            if chart is not None and (self.stage in STAGES or self.chart is not None):
+                row = _summary.setdefault(chart, dict.fromkeys(COLUMNS + ('total',), 0.0))
+                row['own' if self.chart is not None else self.stage] += (duration - self.children) / 1e9
+                if self.chart is not None:
+                    row['total'] += duration / 1e9
+
+        if self.chart is not None:
+            _local.chart = self.previous
+        return False
+
+
+def span(stage, name=None):
+    """Time a block as `stage` (one of STAGES, or any label for the timeline only)."""
+    if not _enabled:
+        return _NULL
+    return _Span(stage, name)
+
+
+def chart(name):
+    """Time a whole chart; stage spans inside it are summarized under `name`."""
+    if not _enabled:
+        return _NULL
+    return _Span('chart', name, chart=name)
+
+
+def drain():
+    """Hand over and forget what this process recorded (render workers send it to the parent)."""
+    global _events, _summary
+    with _lock:
+        recorded, _events, _summary = (_events, _summary), [], {}
+    return recorded
+
+
+def merge(recorded):
+    events, summary = recorded
+    with _lock:
+        _events.extend(events)
+        for chart_name, row in summary.items():
+            mine = _summary.setdefault(chart_name, dict.fromkeys(COLUMNS + ('total',), 0.0))
+            for column, seconds in row.items():
+                mine[column] += seconds
+
+
+def summary_table():
+    rows = sorted(_summary.items(), key=lambda item: item[1]['total'], reverse=True)
+    width = max([len('chart')] + [len(name) for name, _ in rows])
+    lines = [f"{'chart':<{width}} " + ' '.join(f"{c:>9}" for c in COLUMNS + ('total',))]
+    for name, row in rows:
+        lines.append(f"{name:<{width}} " + ' '.join(f"{row[c]:9.3f}" for c in COLUMNS + ('total',)))
+    return '\n'.join(lines)
+
+
+def write(path=None):
+    path = path or _path or DEFAULT_PATH
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with _lock:
+        payload = {'traceEvents': list(_events), 'displayTimeUnit': 'ms'}
+    with open(path, 'w') as f:
+        json.dump(payload, f)
+    return path
+
+
+def finish():
+    """Write the timeline and print the summary (registered at exit by enable())."""
+    if not _enabled or not _events:
+        return
+    print(summary_table())
+    print(f"Trace written to {write()} (open in chrome://tracing or ui.perfetto.dev)")
+
+
+if os.environ.get('MACRO_TRACE'):
+    enable(os.environ['MACRO_TRACE'])
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from macrokit import cache  # noqa: E402
+from macrokit.providers import set_provider  # noqa: E402
+
+
+@pytest.fixture
+def price_cache(tmp_path, monkeypatch):
+    """An empty price cache in a temporary directory."""
+    monkeypatch.setattr(cache, 'CACHE_DIR', str(tmp_path / 'prices'))
+    return tmp_path / 'prices'
+
+
+@pytest.fixture
+def provider():
+    """Install a provider for the duration of a test: provider(instance)."""
+    previous = []
+
+    def install(instance):
+        previous.append(set_provider(instance))
+        return instance
+
+    yield install
+    if previous:
+        set_provider(previous[0])
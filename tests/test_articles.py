@@ -0,0 +1,55 @@
+import importlib.util
+import os
+import types
+
+import pandas as pd
+import pytest
+
+from macrokit import REPO_ROOT, articles
+from macrokit.articles import SkipArticle
+
+
+def script(tmp_path, load_data):
+    module = types.ModuleType('optional_charts')
+    module.__file__ = str(tmp_path / 'Article' / 'optional_charts.py')
+    module.load_data = load_data
+    module.CHARTS = {'optional_chart': lambda data: None}
+    return module
+
+
+def test_a_skipped_script_is_reported_as_skipped(tmp_path, capsys):
+    def load_data():
+        raise SkipArticle("optional_chart needs a universe file at universe.txt")
+
+    assert articles.build(script(tmp_path, load_data)) == []
+    out = capsys.readouterr().out
+    assert "skipped: optional_chart needs a universe file at universe.txt" in out
+    assert 'Error' not in out
+
+
+def test_missing_data_is_still_an_error(tmp_path, capsys):
+    assert articles.build(script(tmp_path, lambda: pd.DataFrame())) == []
+    assert "Error: No data fetched" in capsys.readouterr().out
+
+
+def load(relative):
+    path = os.path.join(REPO_ROOT, relative)
+    spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(path))[0], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_breadth_chart_skips_without_a_universe(tmp_path, monkeypatch):
+    module = load('KShapedEconomy/breadth_charts.py')
+    monkeypatch.setattr(module, 'UNIVERSE_PATH', str(tmp_path / 'universe.txt'))
+    with pytest.raises(SkipArticle, match='universe.txt'):
+        module.load_data()
+
+
+def test_intraday_chart_skips_without_bars(monkeypatch):
+    module = load('BitcoinCrash/generate_charts_intraday.py')
+    monkeypatch.setattr(module, 'load_window',
+                        lambda tickers, start, end, interval: pd.DataFrame(columns=tickers, dtype='float64'))
+    with pytest.raises(SkipArticle, match='python -m macrokit.intraday'):
+        module.load_data()
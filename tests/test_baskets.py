@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from macrokit.baskets import build_basket
+
+
+def panel(n=400, names=6, seed=8):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2024-01-01', periods=n)
+    prices = pd.DataFrame(50 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, (n, names)), axis=0)),
+                          index=index, columns=[f"S{i}" for i in range(names)])
+    prices.iloc[:70, 2] = np.nan    # lists late
+    prices.iloc[200:230, 4] = np.nan  # halted
+    return prices
+
+
+def targets(weighting, price_row, shares):
+    if isinstance(weighting, str):
+        raw = {'equal': np.ones_like(price_row), 'price': price_row.copy(), 'market_cap': price_row * shares}[weighting]
+    else:
+        raw = np.asarray(weighting, dtype='float64').copy()
+    raw[np.isnan(price_row)] = 0.0
+    return raw / raw.sum()
+
+
+def simulate(prices, weighting='equal', rebalance=None, drift=None, shares=None):
+    """Day by day: hold shares, revalue, and rebalance on period ends or when a weight drifts too far."""
+    values = prices.ffill().to_numpy()
+    periods = prices.index.to_period(rebalance) if rebalance else None
+    value, level, holdings, weights = 1.0, [], None, None
+    for t, row in enumerate(values):
+        if holdings is not None:
+            value = np.nansum(holdings * row)
+        level.append(100 * value)
+        due = holdings is None
+        if holdings is not None and t < len(values) - 1:
+            due |= periods is not None and periods[t] != periods[t + 1]
+            if drift is not None:
+                current = np.nan_to_num(holdings * row) / value
+                due |= (np.abs(current - weights) > drift).any()
+        if due:
+            weights = targets(weighting, row, shares)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                holdings = np.where(weights > 0, value * weights / row, 0.0)
+    return np.array(level)
+
+
+@pytest.mark.parametrize('weighting', ['equal', 'price', 'market_cap', [1, 2, 3, 4, 5, 6]])
+@pytest.mark.parametrize('rebalance,drift', [(None, None), ('M', None), ('Q', None), (None, 0.05), ('Q', 0.03)])
+def test_matches_a_day_by_day_simulation(weighting, rebalance, drift):
+    prices = panel()
+    shares = np.arange(1.0, 7.0) * 1e6
+    custom = pd.Series(weighting, index=prices.columns) if isinstance(weighting, list) else weighting
+    basket = build_basket(prices, weighting=custom, rebalance=rebalance, drift=drift,
+                          shares=pd.Series(shares, index=prices.columns))
+    expected = simulate(prices, weighting, rebalance, drift, shares)
+    np.testing.assert_allclose(basket.level.to_numpy(), expected, rtol=1e-12)
+
+
+def test_weights_and_turnover():
+    prices = panel()
+    basket = build_basket(prices, rebalance='Q')
+    assert basket.level.iloc[0] == 100.0
+    # The late listing has no weight until the first rebalance after it starts trading
+    np.testing.assert_allclose(basket.weights.iloc[0], [0.2, 0.2, 0.0, 0.2, 0.2, 0.2])
+    np.testing.assert_allclose(basket.weights.sum(axis=1), 1.0)
+    assert basket.turnover.iloc[0] == 1.0 and (basket.turnover.iloc[1:] < 1).all()
+
+
+def test_bad_weights_raise():
+    with pytest.raises(ValueError, match='shares'):
+        build_basket(panel(), weighting='market_cap')
+    with pytest.raises(ValueError, match='negative'):
+        build_basket(panel(), weighting=pd.Series([1, -1, 1, 1, 1, 1], index=panel().columns))
+
+
+def test_dated_weights_are_taken_as_of_each_rebalance():
+    prices = panel()
+    fixed = pd.Series([1, 2, 3, 4, 5, 6], index=prices.columns, dtype='float64')
+    dated = pd.DataFrame([fixed.to_numpy(), fixed[::-1].to_numpy()], index=pd.to_datetime(['2023-12-01', '2024-07-01']),
+                         columns=prices.columns)
+    basket = build_basket(prices, weighting=dated, rebalance='Q')
+    before, after = basket.weights.loc[:'2024-06-30'], basket.weights.loc['2024-07-01':]
+    np.testing.assert_allclose(before.iloc[-1], fixed / fixed.sum())
+    np.testing.assert_allclose(after.iloc[0], fixed[::-1].to_numpy() / fixed.sum())
+    np.testing.assert_allclose(basket.level.loc[:'2024-06-27'],
+                               build_basket(prices, weighting=fixed, rebalance='Q').level.loc[:'2024-06-27'], rtol=1e-12)
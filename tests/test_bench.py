@@ -0,0 +1,53 @@
+import time
+import types
+
+import matplotlib.pyplot as plt
+
+from macrokit import bench
+from macrokit.articles import SkipArticle
+from macrokit.specs import ChartSpec, FigurePool, Layer, render_spec
+
+
+def test_spec_charts_are_timed_from_their_pooled_figure(tmp_path):
+    original = FigurePool.axes
+    spec = ChartSpec('bars', (4, 3), [Layer('bar', ['A', 'B'], [1.0, 2.0])], title='Bars')
+    pool = FigurePool()
+
+    def chart():
+        time.sleep(0.05)  # transform
+        render_spec(spec, str(tmp_path), pool=pool)
+
+    record = bench.measure(chart)
+    assert record['transform'] >= 0.05
+    assert record['render'] > 0
+    assert (tmp_path / 'bars.png').exists()
+    assert FigurePool.axes is original
+
+
+def test_pyplot_charts_are_timed_from_their_first_figure():
+    def chart():
+        time.sleep(0.05)
+        plt.subplots()
+        time.sleep(0.02)
+        plt.close('all')
+
+    record = bench.measure(chart)
+    assert record['transform'] >= 0.05 and record['render'] >= 0.02
+
+
+def test_skipped_scripts_are_reported_as_skipped(tmp_path):
+    module = types.ModuleType('optional_charts')
+    module.__file__ = str(tmp_path / 'Article' / 'optional_charts.py')
+
+    def load_data():
+        raise SkipArticle("optional_chart needs a universe file")
+
+    module.load_data = load_data
+    module.CHARTS = {'optional_chart': lambda data: None, 'static_chart': lambda: None}
+    entries = bench._bench_module(module)
+    script = bench._script(module)
+    assert entries[f"{script}::load_data"] == {'skipped': "optional_chart needs a universe file"}
+    assert f"{script}::optional_chart" not in entries and f"{script}::static_chart" in entries
+
+    text = bench.report({'entries': entries})
+    assert "skipped: optional_chart needs a universe file" in text and 'FAILED' not in text
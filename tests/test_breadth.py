@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from macrokit.breadth import Breadth, read_universe
+
+MA = 20
+
+
+def universe(names=300, seed=4):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2023-01-02', periods=160)
+    drift = rng.normal(0, 0.004, names)
+    prices = pd.DataFrame(50 * np.exp(np.cumsum(rng.normal(drift, 0.02, (len(index), names)), axis=0)),
+                          index=index, columns=[f"T{i}" for i in range(names)])
+    # Staggered listings and a few gaps
+    for i, start in enumerate(rng.integers(0, 120, names // 5)):
+        prices.iloc[:start, i] = np.nan
+    values = prices.to_numpy(copy=True)
+    values[rng.integers(0, len(index), 200), rng.integers(0, names, 200)] = np.nan
+    return pd.DataFrame(values, index=index, columns=prices.columns)
+
+
+def run(prices, chunk):
+    engine = Breadth(prices.index[MA:], ma_window=MA)
+    for i in range(0, prices.shape[1], chunk):
+        engine.update(prices.iloc[:, i:i + chunk])
+    return engine.result()
+
+
+def test_matches_naive_cross_sections():
+    prices = universe()
+    result = run(prices, chunk=64)
+    window = prices.iloc[MA:]
+    growth = window / window.bfill().iloc[0]
+    average = prices.rolling(MA, min_periods=MA).mean().iloc[MA:]
+    daily = np.log(window).diff()
+
+    for date in window.index[::15]:
+        row = growth.loc[date].dropna().to_numpy()
+        got = result.loc[date]
+        assert got['names'] == len(row)
+        ranked = np.sort(row)
+        for q in (10, 25, 50, 75, 90):
+            # In the histogram bin (1% of log growth) of the name ranked at q%
+            exact = ranked[int(np.ceil(q / 100 * len(row))) - 1]
+            assert abs(np.log(got[f'p{q}'] / 100) - np.log(exact)) < 0.01
+        decile = len(row) / 10
+        assert got['top_decile'] == pytest.approx(100 * ranked[-int(decile):].mean(), rel=0.01)
+        assert got['bottom_decile'] == pytest.approx(100 * ranked[:int(decile)].mean(), rel=0.01)
+        assert got['effective_names'] == pytest.approx(row.sum() ** 2 / (row ** 2).sum(), rel=1e-9)
+
+        has_ma = average.loc[date].notna() & window.loc[date].notna()
+        above = (window.loc[date] > average.loc[date])[has_ma]
+        assert got['above_ma'] == pytest.approx(100 * above.mean(), rel=1e-9)
+        if date != window.index[0]:
+            assert got['dispersion'] == pytest.approx(100 * daily.loc[date].dropna().std(ddof=0), rel=1e-6)
+
+
+def test_chunking_does_not_change_the_result():
+    prices = universe()
+    pd.testing.assert_frame_equal(run(prices, chunk=7), run(prices, chunk=prices.shape[1]), rtol=1e-12)
+
+
+def test_read_universe(tmp_path):
+    path = tmp_path / 'universe.csv'
+    path.write_text("Symbol,Name\nAAPL,Apple  # the big one\n\nMSFT,Microsoft\nAAPL,dup\n# comment\n")
+    assert read_universe(path) == ['AAPL', 'MSFT']
@@ -0,0 +1,98 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from macrokit import cache
+from macrokit.providers import Provider, SyntheticProvider
+
+NOW = pd.Timestamp('2026-10-18 12:00')
+T = pd.Timestamp
+
+
+class RecordingProvider(Provider):
+    """Synthetic bars, remembering every request."""
+
+    def __init__(self):
+        self.synthetic = SyntheticProvider()
+        self.requests = []
+
+    def fetch(self, tickers, start, end, interval='1d'):
+        self.requests.append((list(tickers), pd.Timestamp(start), pd.Timestamp(end)))
+        return self.synthetic.fetch(tickers, start, end, interval)
+
+
+def bars(start, end):
+    return SyntheticProvider().fetch(['SPY'], T(start), T(end))['SPY']
+
+
+def test_disjoint_downloads_leave_the_gap_missing(price_cache, provider):
+    recorder = provider(RecordingProvider())
+    with cache.override(now=NOW):
+        cache.download('SPY', start='2016-01-01', end='2017-01-01')
+        cache.download('SPY', start='2025-01-01', end='2026-01-01')
+
+        assert cache.missing_ranges('SPY', T('2020-01-01'), T('2021-01-01')) == [(T('2020-01-01'), T('2021-01-01'))]
+        assert cache.missing_ranges('SPY', T('2016-06-01'), T('2025-06-01')) == [(T('2017-01-01'), T('2025-01-01'))]
+
+        data = cache.download('SPY', start='2020-01-01', end='2021-01-01')
+    assert len(recorder.requests) == 3
+    assert len(data) > 250
+    assert data.index.min() >= T('2020-01-01') and data.index.max() < T('2021-01-01')
+
+
+def test_empty_download_records_no_coverage(price_cache):
+    cache._store('NVDA', '1d', pd.DataFrame(), T('2021-10-18'), T('2026-10-18'))
+    assert cache._read_meta('NVDA', '1d') is None
+
+    frame = bars('2024-01-01', '2024-02-01').assign(Close=np.nan, Open=np.nan, High=np.nan, Low=np.nan, Volume=np.nan)
+    cache._store('NVDA', '1d', frame, T('2024-01-01'), T('2024-02-01'))
+    assert cache.missing_ranges('NVDA', T('2024-01-01'), T('2024-02-01')) == [(T('2024-01-01'), T('2024-02-01'))]
+
+
+def test_all_nan_field_is_not_recorded(price_cache):
+    frame = bars('2024-01-01', '2024-02-01').assign(Volume=np.nan)
+    cache._store('SPY', '1d', frame, T('2024-01-01'), T('2024-02-01'))
+    assert 'Volume' not in cache.cached_fields('SPY')
+    assert 'Close' in cache.cached_fields('SPY')
+
+
+def test_tail_is_refetched_from_the_last_bar_once_stale(price_cache):
+    frame = bars('2024-01-01', '2024-03-01')
+    cache._store('SPY', '1d', frame, T('2024-01-01'), T('2024-03-01 10:00'))
+    last_bar = frame.index[-1]
+
+    assert cache.missing_ranges('SPY', T('2024-01-01'), T('2024-03-01 12:00')) == []
+    assert cache.missing_ranges('SPY', T('2024-01-01'), T('2024-04-01')) == [(last_bar, T('2024-04-01'))]
+    # A request entirely past the cached end starts where it asks to
+    assert cache.missing_ranges('SPY', T('2024-06-01'), T('2024-07-01')) == [(T('2024-06-01'), T('2024-07-01'))]
+
+
+def test_legacy_single_span_meta_is_read(price_cache):
+    folder = price_cache / '1d' / 'SPY'
+    folder.mkdir(parents=True)
+    (folder / 'meta.json').write_text(json.dumps(
+        {'start': '2020-01-01T00:00:00', 'end': '2021-01-01T00:00:00', 'fields': ['Close']}))
+    assert cache.missing_ranges('SPY', T('2019-01-01'), T('2020-06-01')) == [(T('2019-01-01'), T('2020-01-01'))]
+
+
+def test_missing_ranges_match_a_day_by_day_reference(price_cache):
+    rng = np.random.default_rng(1)
+    days = pd.date_range('2020-01-01', '2023-01-01', freq='D')
+    covered = np.zeros(len(days), dtype=bool)
+    for _ in range(6):
+        lo, hi = np.sort(rng.choice(len(days), 2, replace=False))
+        cache._store('SPY', '1d', bars(days[lo], days[hi]), days[lo], days[hi])
+        covered[lo:hi] = True
+    last = max(hi for _, hi in cache._read_meta('SPY', '1d')['ranges'])
+
+    for _ in range(200):
+        lo, hi = np.sort(rng.choice(len(days), 2, replace=False))
+        if days[hi] > last:
+            continue
+        missing = np.zeros(len(days), dtype=bool)
+        for start, end in cache.missing_ranges('SPY', days[lo], days[hi]):
+            missing[(days >= start) & (days < end)] = True
+        expected = np.zeros(len(days), dtype=bool)
+        expected[lo:hi] = ~covered[lo:hi]
+        assert (missing == expected).all()
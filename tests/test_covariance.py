@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from macrokit.covariance import EWMCovariance, RollingCovariance, rolling_correlation, rolling_volatility
+
+
+def returns(n=300, assets=4, seed=6):
+    rng = np.random.default_rng(seed)
+    mix = rng.normal(0, 1, (assets, assets))
+    values = rng.normal(0, 0.01, (n, assets)) @ mix
+    values[rng.integers(0, n, 60), rng.integers(0, assets, 60)] = np.nan
+    values[:40, 0] = np.nan  # one asset lists late
+    return pd.DataFrame(values, index=pd.date_range('2024-01-01', periods=n, freq='D'),
+                        columns=['BTC', 'SPY', 'GLD', 'TLT'])
+
+
+def naive(window_rows, min_periods):
+    """Pairwise-complete covariance and correlation of one window."""
+    n = window_rows.shape[1]
+    cov, corr = np.full((n, n), np.nan), np.full((n, n), np.nan)
+    for i in range(n):
+        for j in range(n):
+            both = ~np.isnan(window_rows[:, i]) & ~np.isnan(window_rows[:, j])
+            if both.sum() >= max(min_periods, 2):
+                x, y = window_rows[both, i], window_rows[both, j]
+                cov[i, j] = np.cov(x, y)[0, 1]
+                corr[i, j] = np.corrcoef(x, y)[0, 1]
+    return cov, corr
+
+
+@pytest.mark.parametrize('window,min_periods', [(20, None), (30, 10), (7, 3)])
+def test_rolling_matches_window_by_window(window, min_periods):
+    frame = returns()
+    values = frame.to_numpy()
+    stats = RollingCovariance(values.shape[1], window, min_periods)
+    for t, row in enumerate(values):
+        stats.update(row)
+        cov, corr = naive(values[max(0, t - window + 1):t + 1], window if min_periods is None else min_periods)
+        np.testing.assert_allclose(stats.covariance(), cov, rtol=1e-7, atol=1e-14)
+        np.testing.assert_allclose(stats.correlation(), corr, rtol=1e-7, atol=1e-9)
+
+
+def test_volatility_and_average_correlation_match_pandas():
+    frame = returns()
+    expected = frame.rolling(30, min_periods=10).std() * np.sqrt(252)
+    pd.testing.assert_frame_equal(rolling_volatility(frame, 30, min_periods=10), expected, rtol=1e-7)
+
+    average, last = rolling_correlation(frame, 30, min_periods=10)
+    pairs = frame.rolling(30, min_periods=10).corr()
+    off = ~np.eye(4, dtype=bool)
+    expected_average = pairs.groupby(level=0).apply(lambda m: np.nanmean(m.to_numpy()[off])
+                                                    if np.isfinite(m.to_numpy()[off]).any() else np.nan)
+    np.testing.assert_allclose(average.to_numpy(), expected_average.to_numpy(), rtol=1e-7)
+    np.testing.assert_allclose(last.to_numpy(), pairs.loc[frame.index[-1]].to_numpy(), rtol=1e-7)
+
+
+def test_ewm_matches_pandas_without_gaps():
+    frame = returns().dropna()
+    stats = EWMCovariance(frame.shape[1], halflife=10)
+    for row in frame.to_numpy():
+        stats.update(row)
+    expected = frame.ewm(halflife=10, adjust=False).cov(bias=True).loc[frame.index[-1]]
+    np.testing.assert_allclose(stats.covariance(), expected.to_numpy(), rtol=1e-9)
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from macrokit.crossrates import CrossRates
+
+
+def panel(rows=300, seed=8):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=rows, freq='D')
+    prices = pd.DataFrame(np.exp(np.cumsum(rng.normal(0, 0.02, (rows, 4)), axis=0)) * [60_000, 2_000, 500, 30],
+                          index=index, columns=['BTC-USD', 'GC=F', 'SPY', 'SI=F'])
+    # Weekday assets have no weekend bars, and a few gaps
+    prices.loc[prices.index.dayofweek >= 5, ['GC=F', 'SPY', 'SI=F']] = np.nan
+    prices.iloc[rng.integers(0, rows, 15), 0] = np.nan
+    return prices
+
+
+def test_ratios_match_direct_division():
+    prices = panel()
+    rates = CrossRates(prices)
+    for a in prices:
+        for b in prices:
+            direct = prices[a] / prices[b]
+            got = rates[a, b]
+            np.testing.assert_allclose(got.to_numpy(), direct.to_numpy(), rtol=1e-12)
+            # A bar where either side is missing stays missing
+            assert (got.isna() == direct.isna()).all()
+            pd.testing.assert_index_equal(got.index, prices.index)
+
+
+def test_inverse_and_triangular_consistency():
+    rates = CrossRates(panel())
+    btc_gold, gold_btc = rates['BTC-USD', 'GC=F'], rates['GC=F', 'BTC-USD']
+    np.testing.assert_allclose((btc_gold * gold_btc).dropna(), 1.0, rtol=1e-12)
+    triangle = rates['BTC-USD', 'SPY'] * rates['SPY', 'GC=F']
+    np.testing.assert_allclose(triangle.dropna(), btc_gold[triangle.notna()], rtol=1e-12)
+    np.testing.assert_allclose(rates['SPY', 'SPY'].dropna(), 1.0)
+
+
+def test_ffill_prices_weekday_assets_on_weekends():
+    prices = panel()
+    rates = CrossRates(prices, ffill=True)
+    direct = prices['BTC-USD'].ffill() / prices['GC=F'].ffill()
+    np.testing.assert_allclose(rates['BTC-USD', 'GC=F'], direct, rtol=1e-12)
+    assert rates['BTC-USD', 'GC=F'].iloc[1:].notna().all()
+
+
+def test_unsorted_panels_are_sorted_and_unknown_assets_raise():
+    prices = panel()
+    rates = CrossRates(prices.iloc[::-1])
+    np.testing.assert_allclose(rates['SPY', 'SI=F'], prices['SPY'] / prices['SI=F'], rtol=1e-12)
+    with pytest.raises(KeyError, match='ETH-USD'):
+        rates['ETH-USD', 'SPY']
+
+
+def test_priced_in_matches_direct_division():
+    prices = panel()
+    frame = CrossRates(prices).priced_in('GC=F')
+    assert list(frame.columns) == ['BTC-USD', 'SPY', 'SI=F']
+    expected = prices[['BTC-USD', 'SPY', 'SI=F']].div(prices['GC=F'], axis=0)
+    pd.testing.assert_frame_equal(frame, expected, rtol=1e-12, check_freq=False)
+
+
+def test_lru_evicts_the_least_recently_used_pair_and_reuses_cached_ones():
+    prices = panel()
+    rates = CrossRates(prices, max_pairs=2)
+    first = rates.log_ratio('BTC-USD', 'GC=F')
+    assert rates.log_ratio('BTC-USD', 'GC=F') is first
+    assert not first.flags.writeable
+
+    rates.log_ratio('SPY', 'GC=F')
+    rates.log_ratio('BTC-USD', 'GC=F')  # refreshed: SPY/GC=F is now the oldest
+    rates.log_ratio('SI=F', 'GC=F')
+    assert rates.cached_pairs() == 2
+    assert rates.log_ratio('BTC-USD', 'GC=F') is first
+    assert set(rates._pairs) == {('BTC-USD', 'GC=F'), ('SI=F', 'GC=F')}
+
+    # An evicted pair is rebuilt with the same values, evicting the oldest one
+    again = rates.log_ratio('SPY', 'GC=F')
+    np.testing.assert_allclose(np.exp(again), prices['SPY'] / prices['GC=F'], rtol=1e-12)
+    assert set(rates._pairs) == {('BTC-USD', 'GC=F'), ('SPY', 'GC=F')}
+
+
+def test_inverse_is_served_from_the_cached_pair():
+    rates = CrossRates(panel())
+    forward = rates.log_ratio('BTC-USD', 'SPY')
+    # Rebuilding from the panel would fail: the inverse must come from the cache
+    rates.log = None
+    inverse = rates.log_ratio('SPY', 'BTC-USD')
+    np.testing.assert_array_equal(inverse, -forward)
+    assert rates.cached_pairs() == 2
@@ -0,0 +1,62 @@
+import importlib.util
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from macrokit import REPO_ROOT
+from macrokit.futures import continuous
+
+INDEX = pd.bdate_range('2025-12-01', '2026-02-13')
+
+
+@pytest.fixture
+def deep(monkeypatch):
+    """BitcoinCrash/generate_charts_deep.py with load_prices served from `deep.prices`."""
+    path = os.path.join(REPO_ROOT, 'BitcoinCrash', 'generate_charts_deep.py')
+    spec = importlib.util.spec_from_file_location('generate_charts_deep', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    def load_prices(tickers, start=None, end=None, field=None):
+        return module.prices[[t for t in tickers if t in module.prices]]
+
+    monkeypatch.setattr(module, 'load_prices', load_prices)
+    return module
+
+
+def market(contracts):
+    rng = np.random.default_rng(3)
+    columns = ['BTC-USD', 'IBIT'] + contracts
+    prices = pd.DataFrame(90_000 + np.cumsum(rng.normal(0, 500, (len(INDEX), len(columns))), axis=0),
+                          index=INDEX, columns=columns)
+    prices.iloc[::7, 0] = np.nan  # spot gaps
+    return prices
+
+
+def test_rows_follow_spot_and_the_front_contract(deep):
+    deep.prices = market(['BTCF26.CME', 'BTCG26.CME', 'BTCH26.CME'])
+    deep.prices.iloc[5:9, 3] = np.nan
+    df = deep.load_data()
+    expected = deep.prices.dropna(subset=['BTC-USD', 'BTCG26.CME']).index
+    pd.testing.assert_index_equal(df.index, expected)
+    assert deep.front_continuous not in df
+
+
+def test_missing_front_contract_falls_back_to_the_continuous_chain(deep):
+    # BTCG26 has disappeared upstream: no column at all
+    deep.prices = market(['BTCF26.CME', 'BTCH26.CME'])
+    deep.prices.iloc[:20, 2] = np.nan
+    df = deep.load_data()
+
+    chain = continuous(deep.prices[['BTCF26.CME', 'BTCH26.CME']])['price']
+    expected = deep.prices.index[deep.prices['BTC-USD'].notna() & chain.notna()]
+    pd.testing.assert_index_equal(df.index, expected)
+    pd.testing.assert_series_equal(df[deep.front_continuous], chain[expected], check_names=False)
+
+
+def test_no_contracts_keeps_the_spot_days(deep):
+    deep.prices = market([])
+    df = deep.load_data()
+    pd.testing.assert_index_equal(df.index, deep.prices['BTC-USD'].dropna().index)
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from macrokit import cache, fetcher
+from macrokit.planner import Batch
+from macrokit.providers import Provider, SyntheticProvider
+
+START, END = pd.Timestamp('2024-01-01'), pd.Timestamp('2024-03-01')
+
+
+class FlakyProvider(Provider):
+    """Synthetic bars, except that `broken` tickers come back empty (or raise) for their first `failures` calls."""
+
+    def __init__(self, broken=(), failures=10 ** 6, empty=lambda frame: pd.DataFrame(), raises=False):
+        self.synthetic = SyntheticProvider()
+        self.broken, self.failures, self.empty, self.raises = set(broken), failures, empty, raises
+        self.requests = []
+
+    def fetch(self, tickers, start, end, interval='1d'):
+        self.requests.append(list(tickers))
+        failing = self.broken & set(tickers) if len(self.requests) <= self.failures else set()
+        if failing and self.raises:
+            raise ConnectionError(f"bad symbol {sorted(failing)}")
+        frames = self.synthetic.fetch(tickers, start, end, interval)
+        return {t: self.empty(frames[t]) if t in failing else frames[t] for t in tickers}
+
+
+def fetch(provider, tickers, retries=2):
+    batches = [Batch(list(tickers), START, END, '1d')]
+    return dict(next(iter(fetcher.fetch_all(batches, provider=provider, rate=1000, retries=retries, backoff=0)))[1])
+
+
+def test_empty_frames_are_retried_then_given_up():
+    provider = FlakyProvider(broken=['NVDA'])
+    frames = fetch(provider, ['NVDA'])
+    assert frames == {'NVDA': None}
+    assert provider.requests == [['NVDA']] * 3
+
+
+def test_all_nan_frames_count_as_failed():
+    provider = FlakyProvider(broken=['NVDA'], empty=lambda frame: frame * np.nan)
+    assert fetch(provider, ['NVDA'])['NVDA'] is None
+
+
+def test_only_the_missing_tickers_are_asked_for_again():
+    provider = FlakyProvider(broken=['NVDA'], failures=1)
+    frames = fetch(provider, ['SPY', 'NVDA'])
+    assert provider.requests == [['SPY', 'NVDA'], ['NVDA']]
+    assert not frames['SPY'].empty and not frames['NVDA'].empty
+
+
+def test_a_request_that_keeps_raising_is_split():
+    provider = FlakyProvider(broken=['BAD'], raises=True)
+    frames = fetch(provider, ['SPY', 'BAD'], retries=1)
+    assert frames['BAD'] is None and not frames['SPY'].empty
+    assert provider.requests == [['SPY', 'BAD'], ['SPY', 'BAD'], ['SPY'], ['BAD'], ['BAD']]
+
+
+def test_an_offline_build_leaves_the_cache_uncovered(price_cache, provider, monkeypatch):
+    monkeypatch.setattr(fetcher.time, 'sleep', lambda seconds: None)
+    provider(FlakyProvider(broken=['NVDA']))
+    with cache.override(now=END):
+        assert cache.download('NVDA', start=START).empty
+        assert cache.missing_ranges('NVDA', START, END) == [(START, END)]
+
+    provider(FlakyProvider())
+    with cache.override(now=END):
+        assert len(cache.download('NVDA', start=START)) > 30
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from macrokit.futures import active_contract, chain, continuous, last_friday, parse_symbol
+
+
+def curve():
+    rng = np.random.default_rng(5)
+    symbols = chain('BTC', '2026-01', '2026-04')
+    index = pd.date_range('2025-12-01', '2026-04-30', freq='D')
+    spot = 90_000 * np.exp(np.cumsum(rng.normal(0, 0.02, len(index))))
+    premium = 1 + 0.01 * np.arange(1, len(symbols) + 1)
+    return pd.DataFrame(spot[:, None] * premium, index=index, columns=symbols)
+
+
+def reference(futures, roll_days, method):
+    """Walk back from the live contract, adjusting at every roll on the last prices before it."""
+    active = active_contract(futures, roll_days)
+    last = futures.ffill()
+    adjusted, shift = [], 0.0 if method == 'difference' else 1.0
+    for row in range(len(futures) - 1, -1, -1):
+        if row < len(futures) - 1 and active[row] != active[row + 1]:
+            new, old = last.iloc[row + 1, active[row + 1]], last.iloc[row + 1, active[row]]
+            if not (np.isnan(new) or np.isnan(old)):
+                shift = shift + (new - old) if method == 'difference' else shift * new / old
+        price = futures.iloc[row, active[row]]
+        adjusted.append(price + shift if method == 'difference' else price * shift)
+    return np.array(adjusted[::-1])
+
+
+def test_symbols_and_expiries():
+    assert parse_symbol('BTCG26.CME') == ('BTC', 2026, 2, '.CME')
+    assert last_friday(2026, 2) == pd.Timestamp('2026-02-27')
+    assert last_friday(2026, 7) == pd.Timestamp('2026-07-31')
+    with pytest.raises(ValueError):
+        parse_symbol('BTC-USD')
+
+
+@pytest.mark.parametrize('method', ['difference', 'ratio'])
+def test_continuous_matches_a_walk_back_reference(method):
+    futures = curve()
+    result = continuous(futures, roll_days=5, method=method)
+    np.testing.assert_allclose(result['price'].to_numpy(), reference(futures, 5, method), rtol=1e-12)
+    # No roll jumps, and the series ends at the live contract's price
+    assert result['price'].iloc[-1] == futures.iloc[-1][result['contract'].iloc[-1]]
+
+
+@pytest.mark.parametrize('method', ['difference', 'ratio'])
+def test_a_gap_on_the_roll_date_does_not_spread(method):
+    futures = curve()
+    active = active_contract(futures, 5)
+    rolls = np.flatnonzero(np.diff(active)) + 1
+    futures.iloc[rolls[0], active[rolls[0]]] = np.nan
+    futures.iloc[rolls[1], active[rolls[1] - 1]] = np.nan
+
+    result = continuous(futures, roll_days=5, method=method)['price'].to_numpy()
+    assert np.isnan(result).sum() == 1
+    np.testing.assert_allclose(result, reference(futures, 5, method), rtol=1e-12)
+
+
+def test_volume_rolls_never_go_back():
+    futures = curve()
+    volume = pd.DataFrame(np.random.default_rng(1).uniform(0, 1, futures.shape), index=futures.index, columns=futures.columns)
+    active = active_contract(futures, 5, volume)
+    assert (np.diff(active) >= 0).all()
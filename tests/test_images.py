@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from macrokit import images
+from macrokit.prerender import _responsive_images
+
+WIDTHS = (100, 200, 400)
+
+
+def chart(path, width=300, height=150, seed=0):
+    rng = np.random.default_rng(seed)
+    pixels = np.full((height, width, 3), 255, dtype=np.uint8)
+    pixels[:, rng.integers(0, width, 20)] = [26, 42, 108]
+    Image.fromarray(pixels).save(path)
+
+
+def manifest(assets):
+    with open(assets / images.RESPONSIVE_DIR / images.MANIFEST_NAME) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def assets(tmp_path):
+    chart(tmp_path / 'wide.png', width=500, height=250)
+    chart(tmp_path / 'narrow.png', width=150, height=90, seed=1)
+    return tmp_path
+
+
+def test_manifest_lists_every_variant_preferred_format_first(assets):
+    assert images.update(str(assets), WIDTHS) == ['narrow.png', 'wide.png']
+    entries = manifest(assets)
+    kinds = images.formats()
+    assert kinds[-1] == 'webp' and kinds == [f for f in ('avif', 'webp') if f in kinds]
+
+    wide = entries['wide.png']
+    assert (wide['width'], wide['height']) == (500, 250)
+    with open(assets / 'wide.png', 'rb') as f:
+        assert wide['source'] == hashlib.sha256(f.read()).hexdigest()
+    for fmt in kinds:
+        # Never upscaled: the 500 px chart stops at 400, the 150 px one keeps its own width
+        assert wide[fmt] == [[f"responsive/wide-{w}.{fmt}", w] for w in WIDTHS]
+        assert entries['narrow.png'][fmt] == [[f"responsive/narrow-100.{fmt}", 100],
+                                              [f"responsive/narrow-150.{fmt}", 150]]
+        for path, width in wide[fmt]:
+            with Image.open(assets / path) as variant:
+                assert variant.format == fmt.upper()
+                assert variant.size == (width, width // 2)
+
+
+def test_up_to_date_images_are_skipped(assets):
+    images.update(str(assets), WIDTHS)
+    variant = assets / 'responsive' / 'wide-100.webp'
+    stamp = os.stat(variant).st_mtime_ns
+    before = manifest(assets)
+
+    assert images.update(str(assets), WIDTHS) == []
+    assert os.stat(variant).st_mtime_ns == stamp
+    assert manifest(assets) == before
+
+    # A changed chart is regenerated, alone
+    chart(assets / 'wide.png', width=500, height=250, seed=9)
+    assert images.update(str(assets), WIDTHS) == ['wide.png']
+    assert manifest(assets)['narrow.png'] == before['narrow.png']
+    assert manifest(assets)['wide.png']['source'] != before['wide.png']['source']
+
+
+def test_entries_missing_a_format_are_regenerated(assets, monkeypatch):
+    if 'avif' not in images.formats():
+        pytest.skip("Pillow without AVIF")
+    monkeypatch.setattr(images, 'formats', lambda: ['webp'])
+    images.update(str(assets), WIDTHS)
+    assert 'avif' not in manifest(assets)['wide.png']
+    monkeypatch.undo()
+
+    assert images.update(str(assets), WIDTHS) == ['narrow.png', 'wide.png']
+    assert (assets / 'responsive' / 'wide-100.avif').exists()
+
+
+def test_removed_charts_lose_all_their_variants(assets):
+    images.update(str(assets), WIDTHS)
+    os.remove(assets / 'wide.png')
+    assert images.update(str(assets), WIDTHS) == ['wide.png']
+    assert list(manifest(assets)) == ['narrow.png']
+    assert not [p for p in os.listdir(assets / 'responsive') if p.startswith('wide-')]
+
+
+def test_prerendered_pictures_offer_avif_then_webp_then_the_png():
+    entry = {'width': 500, 'height': 250,
+             'avif': [['responsive/c-100.avif', 100]], 'webp': [['responsive/c-100.webp', 100]]}
+    html = _responsive_images('<img alt="C" src="assets/c.png">', {'c.png': entry})
+    assert html.index('image/avif') < html.index('image/webp') < html.index('src="assets/c.png"')
+    assert 'srcset="assets/responsive/c-100.avif 100w"' in html
+
+    del entry['avif']
+    assert 'image/avif' not in _responsive_images('<img src="assets/c.png">', {'c.png': entry})
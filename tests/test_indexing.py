@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from macrokit.indexing import IndexedPanel
+
+
+def panel():
+    rng = np.random.default_rng(3)
+    index = pd.date_range('2024-01-01', periods=60, freq='D')
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.02, (60, 4)), axis=0)),
+                          index=index, columns=['BTC-USD', 'SPY', 'GLD', 'IBIT'])
+    prices.iloc[::7, 1:3] = np.nan   # weekends for the ETFs
+    prices.iloc[:20, 3] = np.nan     # IBIT starts late
+    return prices
+
+
+def reference(prices, at, columns, start, end, base=100.0, missing='keep'):
+    """Row-by-row rebasing: the last price on or before `at`, else the first price."""
+    window = prices.loc[start:end, columns]
+    filled = prices[columns].ffill()
+    if missing == 'drop':
+        window = window.dropna()
+    elif missing == 'ffill':
+        window = filled.loc[window.index][window.notna().any(axis=1) & filled.loc[window.index].notna().all(axis=1)]
+    at = window.index[0] if at is None else pd.Timestamp(at)
+    out = {}
+    for column in columns:
+        before = filled[column].loc[:at].dropna()
+        baseline = before.iloc[-1] if len(before) else prices[column].dropna().iloc[0]
+        out[column] = base * window[column] / baseline
+    return pd.DataFrame(out, index=window.index)
+
+
+@pytest.mark.parametrize('missing', ['keep', 'drop', 'ffill'])
+@pytest.mark.parametrize('columns', [None, ['SPY', 'GLD'], ['IBIT', 'BTC-USD'], ['GLD']])
+@pytest.mark.parametrize('at,start,end', [(None, None, None), ('2024-01-14', '2024-01-10', '2024-02-10'),
+                                          ('2023-12-01', None, '2024-01-31'), ('2024-02-20', '2024-01-25', None)])
+def test_rebase_matches_a_row_by_row_reference(missing, columns, at, start, end):
+    prices = panel()
+    columns = list(prices.columns) if columns is None else columns
+    result = IndexedPanel(prices).rebase(at=at, columns=columns, start=start, end=end, missing=missing)
+    expected = reference(prices, at, columns, start, end, missing=missing)
+    pd.testing.assert_frame_equal(result, expected, check_freq=False, rtol=1e-12)
+
+
+def test_unknown_columns_raise():
+    with pytest.raises(KeyError, match='SPX'):
+        IndexedPanel(panel()).rebase(columns=['SPY', 'SPX'])
+    with pytest.raises(KeyError, match='QQQ'):
+        IndexedPanel(panel()).level('2024-01-10', columns=['QQQ'])
+
+
+def test_out_holds_the_result():
+    prices = panel()
+    indexed = IndexedPanel(prices)
+    out = np.empty((len(prices), 2))
+    result = indexed.rebase(columns=['SPY', 'GLD'], out=out)
+    assert np.shares_memory(result.to_numpy(), out)
+    pd.testing.assert_frame_equal(result, indexed.rebase(columns=['SPY', 'GLD']))
+
+
+def test_level_is_the_last_price_on_or_before():
+    prices = panel()
+    level = IndexedPanel(prices).level('2024-01-08')
+    assert level['SPY'] == pytest.approx(prices['SPY'].loc[:'2024-01-08'].dropna().iloc[-1], rel=1e-12)
+    assert level['IBIT'] == pytest.approx(prices['IBIT'].dropna().iloc[0], rel=1e-12)
@@ -0,0 +1,73 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from macrokit import intraday
+
+pytest.importorskip('pyarrow')
+
+
+def minute_bars(start, days, seed=0):
+    rng = np.random.default_rng(seed)
+    time = pd.date_range(start, periods=days * 1440, freq='min')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, len(time))))
+    return pd.DataFrame({'Timestamp': time, 'Open': close, 'High': close * 1.001, 'Low': close * 0.999,
+                         'Close': close, 'Volume': rng.uniform(1, 10, len(time))})
+
+
+def ticks(start, minutes, seed=1):
+    rng = np.random.default_rng(seed)
+    offsets = np.sort(rng.uniform(0, minutes * 60, minutes * 5))
+    time = pd.Timestamp(start) + pd.to_timedelta(offsets, 's')
+    # Unix milliseconds, as many exports have them
+    return pd.DataFrame({'ts': time.as_unit('ms').asi8, 'last': 100 + np.cumsum(rng.normal(0, 0.1, len(time))),
+                         'qty': rng.uniform(0.1, 2, len(time))})
+
+
+def test_chunked_ingest_partitions_by_day_and_merges(tmp_path):
+    bars = minute_bars('2026-02-09 00:00', 3)
+    bars.iloc[:2000].to_csv(tmp_path / 'a.csv', index=False)
+    bars.iloc[1500:].to_csv(tmp_path / 'b.csv', index=False)
+    root = str(tmp_path / 'store')
+    intraday.ingest(str(tmp_path / 'a.csv'), 'BTC-USD', chunk_rows=700, root=root)
+    intraday.ingest(str(tmp_path / 'b.csv'), 'BTC-USD', chunk_rows=700, root=root)
+
+    assert intraday.partitions('BTC-USD', root=root) == [datetime.date(2026, 2, 9) + datetime.timedelta(days=d)
+                                                         for d in range(3)]
+    close = intraday.load_series('BTC-USD', '2026-02-09', '2026-02-12', root=root)
+    pd.testing.assert_series_equal(close, bars.set_index('Timestamp')['Close'].rename('close'),
+                                   check_index_type=False, check_names=False, check_freq=False)
+
+    window = intraday.load_series('BTC-USD', '2026-02-10 12:00', '2026-02-10 13:00', root=root)
+    assert len(window) == 60 and window.index[0] == pd.Timestamp('2026-02-10 12:00')
+
+
+def test_bars_or_ticks_are_chosen_per_day(tmp_path):
+    root = str(tmp_path / 'store')
+    minute_bars('2026-01-05 00:00', 1).to_csv(tmp_path / 'bars.csv', index=False)
+    raw = ticks('2026-02-10 14:00', 90)
+    raw.to_csv(tmp_path / 'ticks.csv', index=False)
+    intraday.ingest(str(tmp_path / 'bars.csv'), '^GSPC', root=root)
+    intraday.ingest(str(tmp_path / 'ticks.csv'), '^GSPC', interval='tick', root=root)
+
+    # Bars exist only outside the window; the window's ticks are resampled
+    assert intraday.available(['^GSPC', 'GC=F'], '2026-02-09', '2026-02-14', root=root) == ['^GSPC']
+    close = intraday.load_series('^GSPC', '2026-02-09', '2026-02-14', root=root)
+    time = pd.to_datetime(raw['ts'], unit='ms')
+    expected = raw.set_index(time)['last'].resample('1min').last().dropna()
+    np.testing.assert_allclose(close.to_numpy(), expected.to_numpy())
+    assert (close.index == expected.index).all()
+
+    volume = intraday.load_series('^GSPC', '2026-02-09', '2026-02-14', field='volume', root=root)
+    assert volume.sum() == pytest.approx(raw['qty'].sum())
+
+
+def test_load_window_keeps_ticker_order_and_drops_missing(tmp_path):
+    root = str(tmp_path / 'store')
+    for seed, ticker in enumerate(['GC=F', 'BTC-USD']):
+        minute_bars('2026-02-09 00:00', 1, seed).to_csv(tmp_path / f'{seed}.csv', index=False)
+        intraday.ingest(str(tmp_path / f'{seed}.csv'), ticker, root=root)
+    data = intraday.load_window(['BTC-USD', 'SI=F', 'GC=F'], '2026-02-09', '2026-02-10', root=root)
+    assert list(data.columns) == ['BTC-USD', 'GC=F'] and len(data) == 1440
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+from macrokit import montecarlo
+
+MU = np.array([0.0008, 0.0003, -0.0002])
+COV = np.array([[4.0, 1.2, 0.3],
+                [1.2, 1.0, -0.2],
+                [0.3, -0.2, 0.5]]) * 1e-4
+
+
+def history(rows=1500, seed=5):
+    rng = np.random.default_rng(seed)
+    returns = rng.multivariate_normal(MU, COV, rows)
+    index = pd.bdate_range('2020-01-01', periods=rows + 1)
+    prices = 100 * np.exp(np.vstack([np.zeros(3), np.cumsum(returns, axis=0)]))
+    return pd.DataFrame(prices, index=index, columns=['Bitcoin', 'S&P 500', 'Gold'])
+
+
+def naive(prices, steps, paths, seed):
+    """Path by path, step by step, from the same normal draws."""
+    returns = np.log(prices).diff().dropna()
+    mu, cov = returns.mean().to_numpy(), returns.cov().to_numpy()
+    chol = np.linalg.cholesky(cov + np.eye(len(mu)) * 1e-12)
+    z = np.random.default_rng(seed).standard_normal((steps, paths, len(mu)), dtype=np.float32)
+    out = np.empty((steps, paths, len(mu)))
+    for p in range(paths):
+        price = prices.iloc[-1].to_numpy(dtype='float64')
+        for t in range(steps):
+            price = price * np.exp(chol @ z[t, p].astype('float64') + mu)
+            out[t, p] = price
+    return out
+
+
+def test_matches_a_per_path_loop_with_the_same_seed():
+    prices = history()
+    sim = montecarlo.simulate(prices, steps=30, paths=50, seed=11)
+    np.testing.assert_allclose(sim.paths, naive(prices, 30, 50, 11), rtol=1e-4)
+    assert sim.paths.dtype == np.float32
+    assert sim.columns == list(prices.columns)
+    assert len(sim.index) == 30 and sim.index[0] > prices.index[-1]
+
+    again = montecarlo.simulate(prices, steps=30, paths=50, seed=11)
+    np.testing.assert_array_equal(again.paths, sim.paths)
+    assert not np.array_equal(montecarlo.simulate(prices, steps=30, paths=50, seed=12).paths, sim.paths)
+
+
+def test_simulated_returns_keep_the_input_drift_and_correlation():
+    prices = history()
+    mu, cov = montecarlo.estimate(prices)
+    sim = montecarlo.simulate(prices, steps=20, paths=20_000, seed=3)
+
+    start = prices.iloc[-1].to_numpy(dtype=np.float32)
+    logs = np.log(np.concatenate([np.broadcast_to(start, (1,) + sim.paths.shape[1:]), sim.paths]))
+    returns = np.diff(logs, axis=0).reshape(-1, len(mu)).astype('float64')
+    # Within four standard errors of the sample mean
+    assert (np.abs(returns.mean(axis=0) - mu) < 4 * np.sqrt(np.diag(cov) / len(returns))).all()
+    np.testing.assert_allclose(np.corrcoef(returns, rowvar=False),
+                               cov / np.sqrt(np.outer(np.diag(cov), np.diag(cov))), atol=0.01)
+    np.testing.assert_allclose(np.cov(returns, rowvar=False), cov, rtol=0.02, atol=1e-7)
+
+
+def test_lookback_estimates_from_the_last_rows_only():
+    prices = history()
+    mu, cov = montecarlo.estimate(prices, lookback=250)
+    returns = np.log(prices.iloc[-251:]).diff().dropna()
+    np.testing.assert_allclose(mu, returns.mean().to_numpy())
+    np.testing.assert_allclose(cov, returns.cov().to_numpy())
+
+
+def test_bands_are_monotone_in_the_percentile():
+    sim = montecarlo.simulate(history(), steps=40, paths=2000, seed=1)
+    fan = montecarlo.bands(sim)
+    assert list(fan.columns.get_level_values(0).unique()) == list(montecarlo.PERCENTILES)
+    for asset in sim.columns:
+        levels = np.stack([fan[p][asset].to_numpy() for p in montecarlo.PERCENTILES])
+        assert (np.diff(levels, axis=0) >= 0).all()
+    np.testing.assert_allclose(fan[50]['Gold'].to_numpy(), np.median(sim.paths[:, :, 2], axis=1), rtol=1e-6)
+
+
+def test_probability_is_the_share_of_paths():
+    sim = montecarlo.simulate(history(), steps=40, paths=3000, seed=2)
+    chance = montecarlo.probability(sim, lambda p: p['Bitcoin'] > p['S&P 500'])
+    assert ((chance >= 0) & (chance <= 1)).all()
+    pd.testing.assert_index_equal(chance.index, sim.index)
+
+    for t in (0, 17, 39):
+        count = sum(sim.paths[t, i, 0] > sim.paths[t, i, 1] for i in range(sim.paths.shape[1]))
+        assert chance.iloc[t] == count / sim.paths.shape[1]
+    assert (montecarlo.probability(sim, lambda p: p['Gold'] > 0) == 1).all()
+    assert (montecarlo.probability(sim, lambda p: p['Gold'] < 0) == 0).all()
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from macrokit import cache, planner
+from macrokit.planner import MERGE_GAP, Need
+
+NOW = pd.Timestamp('2026-10-18 12:00')
+T = pd.Timestamp
+
+
+def test_declared_needs_resolve_earlier_literals(tmp_path):
+    script = tmp_path / 'generate_charts.py'
+    script.write_text(
+        "import os\n"
+        "tickers = {'BTC-USD': 'Bitcoin', 'GLD': 'Gold'}\n"
+        "start_date = '2025-07-01'\n"
+        "os.makedirs('assets', exist_ok=True)\n"
+        "DATA_NEEDS = [{'tickers': tickers, 'start': start_date, 'end': '2026-02-14'},\n"
+        "              {'tickers': ['SPY'], 'period': '10y', 'interval': '1wk'}]\n")
+    with cache.override(now=NOW):
+        needs = planner.collect_needs([str(script)])
+    assert needs == [Need('BTC-USD', T('2025-07-01'), T('2026-02-14'), '1d'),
+                     Need('GLD', T('2025-07-01'), T('2026-02-14'), '1d'),
+                     Need('SPY', NOW - pd.DateOffset(years=10), NOW, '1wk')]
+
+
+def test_merge_needs_matches_a_day_by_day_union():
+    rng = np.random.default_rng(0)
+    days = pd.date_range('2024-01-01', periods=400, freq='D')
+    needs = []
+    for _ in range(40):
+        lo, hi = np.sort(rng.choice(len(days), 2, replace=False))
+        needs.append(Need(rng.choice(['SPY', 'GLD']), days[lo], days[hi], '1d'))
+
+    merged = planner.merge_needs(needs)
+    for ticker in ('SPY', 'GLD'):
+        wanted = np.zeros(len(days), dtype=bool)
+        for need in needs:
+            if need.ticker == ticker:
+                wanted |= (days >= need.start) & (days < need.end)
+        ranges = sorted((n.start, n.end) for n in merged if n.ticker == ticker)
+        covered = np.zeros(len(days), dtype=bool)
+        for start, end in ranges:
+            covered |= (days >= start) & (days < end)
+        # Every wanted day is fetched, extra days only fill gaps shorter than MERGE_GAP
+        assert (covered >= wanted).all()
+        assert all(b[0] - a[1] > MERGE_GAP for a, b in zip(ranges, ranges[1:]))
+        assert all(wanted[(days >= start) & (days < end)].any() for start, end in ranges)
+
+
+def test_batches_cover_only_what_is_missing(price_cache):
+    with cache.override(now=NOW):
+        bars = pd.DataFrame({'Close': [1.0, 2.0]}, index=[T('2025-01-02'), T('2025-12-30')])
+        cache._store('SPY', '1d', bars, T('2025-01-01'), NOW)
+        batches = planner.plan_batches([Need(t, T('2024-01-01'), NOW, '1d') for t in ('SPY', 'GLD', 'QQQ')])
+
+    assert sorted(map(tuple, (b.tickers for b in batches))) == [('GLD', 'QQQ'), ('SPY',)]
+    spy = next(b for b in batches if b.tickers == ['SPY'])
+    assert (spy.start, spy.end) == (T('2024-01-01'), T('2025-01-01'))
+
+
+def test_batches_respect_the_size_limit(monkeypatch):
+    monkeypatch.setattr(planner, 'MAX_BATCH_SIZE', 3)
+    monkeypatch.setattr(cache, 'missing_ranges', lambda ticker, start, end, interval: [(start, end)])
+    needs = [Need(f"T{i}", T('2025-01-01'), T('2026-01-01'), '1d') for i in range(7)]
+    batches = planner.plan_batches(needs)
+    assert [len(b.tickers) for b in batches] == [3, 3, 1]
+    assert sorted(t for b in batches for t in b.tickers) == sorted(n.ticker for n in needs)
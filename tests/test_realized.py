@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from macrokit import cache, realized as realized_module
+from macrokit.realized import GENESIS, RealizedCap, realized
+
+NOW = pd.Timestamp('2025-06-30')
+
+
+def dump(rows=400, seed=2):
+    rng = np.random.default_rng(seed)
+    created = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 300, rows), 'D')
+    spent = created + pd.to_timedelta(rng.integers(1, 200, rows), 'D')
+    spent = pd.Series(spent).where(rng.uniform(size=rows) < 0.6)
+    return pd.DataFrame({'created': created, 'spent': spent, 'value': rng.uniform(0.01, 5, rows)})
+
+
+def prices(end='2024-12-31'):
+    index = pd.date_range('2023-06-01', end, freq='D')
+    return pd.Series(30_000 * np.exp(np.arange(len(index)) / 500), index=index)
+
+
+def reference(outputs, close):
+    """Realized price day by day: every output alive that day at its creation-day close."""
+    days = pd.date_range(outputs['created'].min(), outputs['spent'].max(), freq='D')
+    out = []
+    for day in days:
+        alive = (outputs['created'] <= day) & ~(outputs['spent'] <= day)
+        value = outputs['value'][alive]
+        out.append((value * close.reindex(outputs['created'][alive]).to_numpy()).sum() / value.sum())
+    return pd.Series(out, index=days)
+
+
+def test_matches_an_output_by_output_reference():
+    outputs, close = dump(), prices()
+    engine = RealizedCap(close, until=NOW)
+    engine.update_frame(outputs)
+    result = engine.result()['realized_price']
+    expected = reference(outputs, close)
+    np.testing.assert_allclose(result.reindex(expected.index).to_numpy(), expected.to_numpy(), rtol=1e-12)
+
+
+def test_the_default_horizon_is_the_build_clock():
+    with cache.override(now=NOW):
+        engine = RealizedCap()
+    assert len(engine.cap_delta) == (NOW - pd.Timestamp(GENESIS)).days + 1
+
+
+def test_cached_result_survives_new_market_data(tmp_path, monkeypatch):
+    monkeypatch.setattr(realized_module, 'RESULT_DIR', str(tmp_path / 'realized'))
+    path = tmp_path / 'utxo.csv'
+    dump().to_csv(path, index=False)
+    passes = []
+    chunks = realized_module.iter_chunks
+    monkeypatch.setattr(realized_module, 'iter_chunks', lambda *a: passes.append(1) or chunks(*a))
+
+    with cache.override(now=NOW):
+        first = realized(str(path), prices())
+        # A day of prices after the last creation day does not change any output's value
+        assert realized(str(path), prices('2025-01-01')) is not None
+        assert len(passes) == 1
+
+        revised = prices('2025-01-01')
+        revised.loc['2024-03-01'] *= 2
+        second = realized(str(path), revised)
+    assert len(passes) == 2
+    assert not np.allclose(first['realized_price'], second['realized_price'])
+
+
+def test_a_dump_without_prices_needs_them(tmp_path):
+    path = tmp_path / 'utxo.csv'
+    dump().to_csv(path, index=False)
+    with pytest.raises(ValueError, match='price'):
+        realized(str(path), use_cache=False)
+
+
+def test_coins_created_before_the_first_price_are_left_out():
+    outputs, close = dump(), prices()
+    early = pd.DataFrame({'created': pd.to_datetime(['2023-01-10', '2023-03-01']),
+                          'spent': pd.to_datetime(['2024-02-01', None]), 'value': [7.0, 11.0]})
+    engine = RealizedCap(close, until=NOW)
+    engine.update_frame(pd.concat([early, outputs], ignore_index=True))
+    assert engine.unpriced == 18.0
+
+    # Exactly the priced outputs, not the early coins at the first close
+    result = engine.result()
+    expected = reference(outputs, close)
+    np.testing.assert_allclose(result['realized_price'].reindex(expected.index).to_numpy(), expected.to_numpy(),
+                               rtol=1e-12)
+    np.testing.assert_allclose(result['supply'].iloc[-1], outputs['value'][outputs['spent'].isna()].sum())
+
+
+def test_days_without_a_close_use_the_last_one_before():
+    close = prices().drop(pd.date_range('2024-03-02', '2024-03-05'))
+    outputs = pd.DataFrame({'created': pd.to_datetime(['2024-03-04']), 'spent': [None], 'value': [2.0]})
+    engine = RealizedCap(close, until=NOW)
+    engine.update_frame(outputs)
+    assert engine.result()['realized_price'].iloc[0] == close['2024-03-01']
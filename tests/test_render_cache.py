@@ -0,0 +1,107 @@
+import importlib.util
+
+import matplotlib
+import pandas as pd
+import pytest
+
+from macrokit import render_cache
+from macrokit.render_cache import RenderCache, chart_key
+
+CHART = '''
+from scale import scale
+
+WIDTH = 4
+
+
+def chart(data):
+    return scale(data) * WIDTH
+'''
+
+HELPER = '''
+def scale(data):
+    return data * 2.0
+'''
+
+
+def _load(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def article(tmp_path, monkeypatch):
+    """A chart module in tmp_path whose helper lives in a stand-in for the macrokit package."""
+    library = tmp_path / 'library'
+    library.mkdir()
+    (library / 'scale.py').write_text(HELPER)
+    monkeypatch.setattr(render_cache, 'LIBRARY_DIR', str(library))
+    monkeypatch.syspath_prepend(str(library))
+    versions = iter(range(100))
+
+    def load(source=CHART):
+        # A fresh module name per version, so inspect never serves stale source
+        path = tmp_path / f"article_{next(versions)}.py"
+        path.write_text(source)
+        return _load(path, path.stem).chart
+
+    return load, library
+
+
+DATA = pd.DataFrame({'BTC-USD': [1.0, 2.0, 3.0]}, index=pd.date_range('2025-01-01', periods=3))
+
+
+def test_unchanged_chart_hits(article, tmp_path):
+    load, _ = article
+    key = chart_key(load(), (DATA,))
+    assert chart_key(load(), (DATA.copy(),)) == key
+
+    cache = RenderCache(str(tmp_path), enabled=True)
+    (tmp_path / 'chart.png').write_bytes(b'png')
+    cache.record('chart', key)
+    assert RenderCache(str(tmp_path), enabled=True).is_fresh('chart', key)
+    assert not RenderCache(str(tmp_path), enabled=False).is_fresh('chart', key)
+
+
+def test_changed_data_misses(article):
+    load, _ = article
+    changed = DATA.copy()
+    changed.iloc[1, 0] = 2.5
+    assert chart_key(load(), (changed,)) != chart_key(load(), (DATA,))
+
+
+def test_changed_chart_code_misses(article):
+    load, _ = article
+    key = chart_key(load(), (DATA,))
+    assert chart_key(load(CHART.replace('* WIDTH', '+ WIDTH')), (DATA,)) != key
+    assert chart_key(load(CHART.replace('WIDTH = 4', 'WIDTH = 5')), (DATA,)) != key
+
+
+def test_changed_style_misses(article):
+    load, _ = article
+    chart = load()
+    key = chart_key(chart, (DATA,))
+    with matplotlib.rc_context({'lines.linewidth': matplotlib.rcParams['lines.linewidth'] + 1}):
+        assert chart_key(chart, (DATA,)) != key
+    assert chart_key(chart, (DATA,)) == key
+
+
+def test_changed_library_helper_misses(article):
+    load, library = article
+    chart = load()
+    key = chart_key(chart, (DATA,))
+    (library / 'scale.py').write_text(HELPER.replace('2.0', '20.0'))
+    assert chart_key(chart, (DATA,)) != key
+    (library / 'scale.py').write_text(HELPER)
+    assert chart_key(chart, (DATA,)) == key
+
+
+def test_library_digest_covers_the_macrokit_package(tmp_path):
+    (tmp_path / 'a.py').write_text('x = 1\n')
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'sub' / 'b.py').write_text('y = 1\n')
+    digest = render_cache._library_digest(str(tmp_path))
+    (tmp_path / 'sub' / 'b.py').write_text('y = 22\n')
+    assert render_cache._library_digest(str(tmp_path)) != digest
+    assert len(render_cache._library_digest()) == 64
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from macrokit import smc
+
+
+def ohlc(n, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = np.concatenate(([100.0], close[:-1])) * np.exp(rng.normal(0, 0.004, n))
+    wick = np.abs(rng.normal(0, 0.004, (2, n)))
+    return pd.DataFrame({'Open': open_, 'High': np.maximum(open_, close) * np.exp(wick[0]),
+                         'Low': np.minimum(open_, close) * np.exp(-wick[1]), 'Close': close},
+                        index=pd.date_range('2026-01-01', periods=n, freq='h'))
+
+
+def first_mitigation(df, start, direction, top, bottom):
+    for j in range(start, len(df)):
+        if (direction > 0 and df['Low'].iloc[j] <= top) or (direction < 0 and df['High'].iloc[j] >= bottom):
+            return j
+    return -1
+
+
+def naive(df):
+    """Bar-by-bar FVGs and order blocks as (bar, direction, top, bottom, mitigated bar)."""
+    o, h, l, c = (df[f].to_numpy() for f in ('Open', 'High', 'Low', 'Close'))
+    fvgs, blocks = [], []
+    for i in range(1, len(df) - 1):
+        if c[i] > o[i] and l[i + 1] > h[i - 1]:
+            fvgs.append((i, 1, l[i + 1], h[i - 1]))
+        elif c[i] < o[i] and h[i + 1] < l[i - 1]:
+            fvgs.append((i, -1, l[i - 1], h[i + 1]))
+    for i in range(len(df) - 2):
+        if c[i] < o[i] and c[i + 1] > o[i + 1] and c[i + 2] > o[i + 1]:
+            blocks.append((i, 1, h[i], l[i]))
+        elif c[i] > o[i] and c[i + 1] < o[i + 1] and c[i + 2] < o[i + 1]:
+            blocks.append((i, -1, h[i], l[i]))
+    fvgs = [z + (first_mitigation(df, z[0] + 2, *z[1:]),) for z in fvgs]
+    blocks = [z + (first_mitigation(df, z[0] + 3, *z[1:]),) for z in blocks]
+    return fvgs, blocks
+
+
+def as_tuples(table, df):
+    positions = df.index.get_indexer(table['mitigated_time'].where(table['mitigated']))
+    return [(int(r.bar), int(r.direction), r.top, r.bottom, int(p) if m else -1)
+            for r, p, m in zip(table.itertuples(), positions, table['mitigated'])]
+
+
+def test_first_at_or_below_matches_a_scan():
+    rng = np.random.default_rng(0)
+    values = rng.normal(0, 1, 1000)
+    values[rng.integers(0, 1000, 50)] = np.nan
+    starts = rng.integers(0, 1100, 3000)
+    levels = rng.normal(-2, 1, 3000)
+    expected = []
+    for start, level in zip(starts, levels):
+        hits = [j for j in range(start, len(values)) if values[j] <= level]
+        expected.append(hits[0] if hits else len(values))
+    assert (smc.first_at_or_below(values, starts, levels) == expected).all()
+
+
+def test_detect_matches_a_bar_by_bar_reference():
+    bars = {'BTC-USD': ohlc(700, 1), 'GLD': ohlc(300, 2)}
+    zones = smc.detect(bars)
+    for symbol, df in bars.items():
+        fvgs, blocks = naive(df)
+        assert as_tuples(zones.fvgs[zones.fvgs['symbol'] == symbol], df) == fvgs
+        assert as_tuples(zones.order_blocks[zones.order_blocks['symbol'] == symbol], df) == blocks
+
+
+def test_zones_never_cross_series():
+    # Two two-bar series cannot form a three-bar pattern together
+    a, b = ohlc(2, 3), ohlc(2, 4)
+    zones = smc.detect({'A': a, 'B': b})
+    assert zones.fvgs.empty and zones.order_blocks.empty
@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from macrokit import cache, intraday, snapshot
+
+pytest.importorskip('pyarrow')
+
+FROZEN_AT = pd.Timestamp('2026-02-20 09:30')
+T = pd.Timestamp
+
+
+@pytest.fixture
+def stored(price_cache):
+    """Two tickers on different calendars, one with a NaN bar."""
+    btc = pd.DataFrame({'Close': np.arange(10.0)}, index=pd.date_range('2026-02-01', periods=10))
+    btc.iloc[3, 0] = np.nan  # a NaN in the data, not a missing bar
+    spy = pd.DataFrame({'Close': [1.0, 2.0, 3.0]}, index=pd.DatetimeIndex(['2026-02-02', '2026-02-03', '2026-02-06']))
+    # _store drops all-NaN rows, so write BTC's pickle as is
+    cache._store('SPY', '1d', spy, T('2026-02-01'), T('2026-02-11'))
+    cache._store('BTC-USD', '1d', btc.dropna(), T('2026-02-01'), T('2026-02-11'))
+    btc['Close'].to_pickle(price_cache / '1d' / 'BTC-USD' / 'Close.pkl')
+    return btc['Close'], spy['Close']
+
+
+def record(reads):
+    recorder = snapshot.Recorder()
+    with cache.override(recorder=recorder, now=FROZEN_AT):
+        for ticker, start, end in reads:
+            cache.read_field(ticker, 'Close', T(start), T(end))
+    return recorder
+
+
+def test_freeze_round_trip_keeps_nans_and_absent_bars(stored, tmp_path):
+    btc, spy = stored
+    recorder = record([('BTC-USD', '2026-02-01', '2026-02-11'), ('SPY', '2026-02-01', '2026-02-11')])
+    directory = snapshot.freeze(str(tmp_path / 'Article'), recorder, FROZEN_AT)
+    frozen = snapshot.Snapshot(directory)
+
+    got = frozen.read_field('BTC-USD', 'Close', T('2026-02-01'), T('2026-02-11'))
+    pd.testing.assert_series_equal(got, btc, check_freq=False, check_index_type=False, check_names=False)
+    assert np.isnan(got['2026-02-04'])
+    # SPY has no bars on BTC's other days: they stay absent instead of becoming NaN
+    got = frozen.read_field('SPY', 'Close', T('2026-02-01'), T('2026-02-11'))
+    pd.testing.assert_series_equal(got, spy, check_freq=False, check_index_type=False, check_names=False)
+    # Slices, unknown series and fields
+    assert list(frozen.read_field('SPY', 'Close', T('2026-02-03'), T('2026-02-06'))) == [2.0]
+    assert frozen.read_field('QQQ', 'Close', T('2026-02-01'), T('2026-02-11')) is None
+    assert frozen.fields('SPY') == ['Close']
+
+
+def test_identical_freezes_are_deduplicated(stored, tmp_path):
+    article = str(tmp_path / 'Article')
+    reads = [('BTC-USD', '2026-02-01', '2026-02-11')]
+    first = snapshot.freeze(article, record(reads), FROZEN_AT)
+    assert snapshot.freeze(article, record(reads), FROZEN_AT + pd.Timedelta(days=1)) == first
+    assert snapshot.versions(article) == ['v001']
+
+    second = snapshot.freeze(article, record(reads + [('SPY', '2026-02-01', '2026-02-11')]), FROZEN_AT)
+    assert snapshot.versions(article) == ['v001', 'v002']
+    assert snapshot.resolve(article) == second
+
+
+def test_verify_detects_a_modified_file(stored, tmp_path):
+    directory = snapshot.freeze(str(tmp_path / 'Article'), record([('SPY', '2026-02-01', '2026-02-11')]), FROZEN_AT)
+    assert snapshot.verify(directory) == []
+    path = f"{directory}/1d.arrow"
+    with open(path, 'r+b') as f:
+        data = bytearray(f.read())
+        data[len(data) // 2] ^= 0xFF
+        f.seek(0)
+        f.write(data)
+    assert snapshot.verify(directory) == ['1d.arrow']
+
+
+@pytest.fixture
+def selected():
+    yield snapshot.select
+    snapshot.select(None)
+
+
+def test_snapshot_builds_pin_the_clock_and_stay_offline(stored, tmp_path, selected):
+    article = str(tmp_path / 'Article')
+    snapshot.freeze(article, record([('SPY', '2026-02-01', '2026-02-11')]), FROZEN_AT)
+
+    selected('latest')
+    with snapshot.session(article):
+        assert cache.frozen()
+        assert cache.now() == FROZEN_AT
+        # 'period' windows resolve against the freeze time
+        assert cache.resolve_range(period='5d') == (FROZEN_AT - pd.DateOffset(days=5), FROZEN_AT)
+        cache.update(['SPY'], T('2026-01-01'), FROZEN_AT)  # no provider call
+        assert list(cache.download('SPY', start='2026-02-01')[('Close', 'SPY')]) == [1.0, 2.0, 3.0]
+    assert not cache.frozen() and cache.now() != FROZEN_AT
+
+
+def test_freeze_session_records_local_inputs(tmp_path, selected, price_cache):
+    """Intraday bars (and other read_local inputs) are frozen and served without their files."""
+    root = tmp_path / 'intraday'
+    bars = pd.DataFrame({'time': pd.date_range('2026-02-10', periods=1440 * 2, freq='min')})
+    bars['close'] = np.linspace(100, 110, len(bars))
+    bars.to_csv(tmp_path / 'btc.csv', index=False)
+    intraday.ingest(str(tmp_path / 'btc.csv'), 'BTC-USD', root=str(root))
+    live = intraday.load_series('BTC-USD', '2026-02-10 12:00', '2026-02-11 12:00', root=str(root))
+
+    article = str(tmp_path / 'Article')
+    selected(None, freeze=True)
+    with snapshot.session(article):
+        intraday.load_series('BTC-USD', '2026-02-10 12:00', '2026-02-11 12:00', root=str(root))
+    assert snapshot.versions(article) == ['v001']
+
+    selected('latest')
+    with snapshot.session(article):
+        frozen = intraday.load_series('BTC-USD', '2026-02-10 12:00', '2026-02-11 12:00', root='/nonexistent')
+        assert intraday.load_series('ETH-USD', '2026-02-10', '2026-02-11', root=str(root)) is None
+    pd.testing.assert_series_equal(frozen, live, check_freq=False, check_index_type=False, check_names=False)
+    assert frozen.name == 'close'
+
+
+def test_freeze_session_records_the_realized_price(tmp_path, selected, price_cache):
+    from macrokit.realized import realized
+
+    outputs = pd.DataFrame({'created': pd.to_datetime(['2024-01-01', '2024-01-03']),
+                            'spent': pd.to_datetime(['2024-01-05', None]),
+                            'value': [1.0, 3.0], 'price': [40_000.0, 44_000.0]})
+    outputs.to_csv(tmp_path / 'utxo.csv', index=False)
+
+    article = str(tmp_path / 'Article')
+    selected(None, freeze=True)
+    with snapshot.session(article):
+        live = realized(str(tmp_path / 'utxo.csv'), use_cache=False)
+
+    selected('latest')
+    with snapshot.session(article):
+        frozen = realized(str(tmp_path / 'missing'), use_cache=False)
+    pd.testing.assert_frame_equal(frozen[live.columns], live, check_freq=False, check_index_type=False)